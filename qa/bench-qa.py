@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+PartPulse QA System - Benchmark Harness
+Measures how the QA engine scales on synthetic project trees
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from qa_engine import QASystem
+
+PHASES = [
+    "init",
+    "load_architecture_requirements",
+    "run_checks",
+    "generate_markdown_report",
+    "save_reports",
+]
+
+
+class SyntheticRepository:
+    """Generates a throwaway project tree plus a matching requirement set"""
+    
+    def __init__(self, root: Path, files: int, file_size: int, requirements: int,
+                 content_ratio: float, missing_ratio: float, seed: int):
+        self.root = root
+        self.files = files
+        self.file_size = file_size
+        self.requirements = requirements
+        self.content_ratio = content_ratio
+        self.missing_ratio = missing_ratio
+        self.rng = random.Random(seed)
+        self.paths: List[str] = []
+        self.rules: List[Dict] = []
+    
+    def generate(self):
+        """Write the files and derive the requirement rules"""
+        for i in range(self.files):
+            rel_path = f"src/module_{i % 50:02d}/part_{i // 50:03d}/file_{i:05d}.ts"
+            full_path = self.root / rel_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(self._content(i), encoding="utf-8")
+            self.paths.append(rel_path)
+        
+        for i in range(self.requirements):
+            index = self.rng.randrange(self.files)
+            missing = self.rng.random() < self.missing_ratio
+            category = f"Synthetic {i % 16:02d}"
+            if self.rng.random() < self.content_ratio:
+                symbol = f"symbol_{index}_{self.rng.randrange(1000) if missing else 0}"
+                self.rules.append({
+                    "kind": "contains",
+                    "category": category,
+                    "name": f"rule-{i:06d}",
+                    "path": self.paths[index],
+                    "pattern": rf"export\s+const\s+{symbol}\b",
+                })
+            else:
+                path = self.paths[index] + (".missing" if missing else "")
+                self.rules.append({
+                    "kind": "exists",
+                    "category": category,
+                    "name": f"rule-{i:06d}",
+                    "path": path,
+                })
+    
+    def _content(self, index: int) -> str:
+        """Return roughly file_size bytes of TypeScript-like text"""
+        lines = [f"export const symbol_{index}_0 = 0;"]
+        size = len(lines[0])
+        line_no = 1
+        while size < self.file_size:
+            line = f"export const filler_{index}_{line_no} = \"{self.rng.getrandbits(64):016x}\";"
+            lines.append(line)
+            size += len(line) + 1
+            line_no += 1
+        return "\n".join(lines) + "\n"
+
+
+class SyntheticQASystem(QASystem):
+    """QASystem whose requirements come from a synthetic repository"""
+    
+    def __init__(self, repo: SyntheticRepository, **kwargs):
+        self.repo = repo
+        super().__init__(root=repo.root, **kwargs)
+    
+    def load_architecture_requirements(self):
+        """Load the synthetic requirement set"""
+        for rule in self.repo.rules:
+            if rule["kind"] == "exists":
+                self.add_requirement(rule["category"], rule["name"], "Synthetic file", file_path=rule["path"])
+            else:
+                self.add_requirement(
+                    rule["category"],
+                    rule["name"],
+                    "Synthetic content rule",
+                    component_check=self._content_check(rule["path"], rule["pattern"]),
+                    patterns=[(rule["path"], rule["pattern"])]
+                )
+    
+    def _content_check(self, path: str, pattern: str):
+        """Build a component check for one content rule"""
+        def check():
+            if self.check_file_contains(path, pattern):
+                return True, f"Pattern found in {path}"
+            return False, f"Pattern not found in {path}"
+        return check
+
+
+def run_once(repo: SyntheticRepository, jobs: int) -> Dict[str, float]:
+    """Time every phase of one full QA run on the synthetic tree"""
+    timings = {}
+    
+    started = time.perf_counter()
+    qa = SyntheticQASystem(repo)
+    timings["init"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    qa.load_architecture_requirements()
+    timings["load_architecture_requirements"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    qa.run_checks(jobs=jobs)
+    timings["run_checks"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    qa.generate_markdown_report()
+    timings["generate_markdown_report"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    qa.save_reports(quiet=True)
+    timings["save_reports"] = time.perf_counter() - started
+    
+    return timings
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta: float) -> List[str]:
+    """Return a message for every phase slower than ``threshold`` x its baseline"""
+    regressions = []
+    for phase in PHASES:
+        current = results["phases"].get(phase)
+        previous = baseline.get("phases", {}).get(phase)
+        if current is None or previous is None:
+            continue
+        if current > previous * threshold and current - previous > min_delta:
+            regressions.append(
+                f"{phase}: {current * 1000:.1f} ms vs baseline {previous * 1000:.1f} ms "
+                f"({current / previous:.2f}x > {threshold:.2f}x)"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the QA engine on a synthetic repository")
+    parser.add_argument("--files", type=int, default=2000, help="Number of generated files (default: 2000)")
+    parser.add_argument("--file-size", type=int, default=4096, help="Approximate bytes per file (default: 4096)")
+    parser.add_argument("--requirements", type=int, default=10000, help="Number of requirements (default: 10000)")
+    parser.add_argument("--content-ratio", type=float, default=0.5, help="Share of content-pattern requirements (default: 0.5)")
+    parser.add_argument("--missing-ratio", type=float, default=0.1, help="Share of requirements that fail (default: 0.1)")
+    parser.add_argument("--jobs", type=int, default=1, help="Checker threads passed to run_checks (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the median is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the generator (default: 1)")
+    parser.add_argument("--keep", type=Path, default=None, help="Generate the tree here and keep it")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results JSON to this file")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="Write the results as a new baseline file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against this baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown factor per phase (default: 1.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this (default: 5 ms)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point"""
+    args = parse_args(argv)
+    
+    root = args.keep or Path(tempfile.mkdtemp(prefix="qa-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        print(f"\n🏗️  Generating {args.files} files and {args.requirements} requirements in {root}...")
+        repo = SyntheticRepository(
+            root, args.files, args.file_size, args.requirements,
+            args.content_ratio, args.missing_ratio, args.seed
+        )
+        repo.generate()
+        
+        print(f"⏱️  Running {args.repeat} timed run(s) with {args.jobs} job(s)...\n")
+        runs = [run_once(repo, args.jobs) for _ in range(args.repeat)]
+    finally:
+        if args.keep is None:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scenario": {
+            "files": args.files,
+            "file_size": args.file_size,
+            "requirements": args.requirements,
+            "content_ratio": args.content_ratio,
+            "missing_ratio": args.missing_ratio,
+            "jobs": args.jobs,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "phases": {phase: statistics.median(run[phase] for run in runs) for phase in PHASES},
+    }
+    
+    print(f"{'Phase':<34} {'Median':>12}")
+    print("-" * 47)
+    for phase in PHASES:
+        print(f"{phase:<34} {results['phases'][phase] * 1000:>9.1f} ms")
+    print()
+    
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print(f"✅ Saved benchmark results to {path}")
+    
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("scenario") != results["scenario"]:
+            print("⚠️  Baseline was recorded with a different scenario; comparison may be meaningless")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print("\n❌ Performance regression detected:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print(f"\n✅ No phase slower than {args.threshold:.2f}x baseline")
+
+
+if __name__ == "__main__":
+    main()
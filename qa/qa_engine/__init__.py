@@ -0,0 +1,41 @@
+"""
+PartPulse QA System - Engine
+The checker behind run-qa.py, split into one module per concern
+"""
+
+from .storage import (
+    ContentUnavailable, FileIndex, FileSnapshotCache, GitTreeStorage, ResultCache, WorkingTreeStorage,
+)
+from .indexes import ImportGraph, MarkdownLinkIndex, SymbolIndex
+from .prisma import PrismaSchema
+from .plan import Requirement, RequirementPlan
+from .probes import HTTPProber, ProbeStubServer, RouteProbe
+from .patterns import PatternEngine
+from .system import QASystem
+from .workers import CheckWorkerPool
+from .history import RunHistory
+from .watch import EventWatcher, PollingWatcher
+
+__all__ = [
+    "CheckWorkerPool",
+    "ContentUnavailable",
+    "EventWatcher",
+    "FileIndex",
+    "FileSnapshotCache",
+    "GitTreeStorage",
+    "HTTPProber",
+    "ImportGraph",
+    "MarkdownLinkIndex",
+    "PatternEngine",
+    "PollingWatcher",
+    "PrismaSchema",
+    "ProbeStubServer",
+    "QASystem",
+    "Requirement",
+    "RequirementPlan",
+    "ResultCache",
+    "RouteProbe",
+    "RunHistory",
+    "SymbolIndex",
+    "WorkingTreeStorage",
+]
@@ -0,0 +1,60 @@
+"""
+PartPulse QA System - Settings
+Paths, limits and version stamps shared by the engine modules
+"""
+
+from pathlib import Path
+
+# Define the project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Persistent result cache shared across runs
+CACHE_DIR = ".qa-cache"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Categories evaluated first, and whose failures stop a --fail-fast run
+CRITICAL_CATEGORIES = ("Database Schema", "Authentication")
+
+STATUS_ICONS = {"GREEN": "✅", "RED": "❌", "SKIPPED": "⏭️", "WARN": "⚠️", "UNREADABLE": "🚫", "TOO_LARGE": "📦", "TIMEOUT": "⏱️"}
+
+# Content rules refuse files above this size (--max-file-mb)
+CONTENT_MAX_BYTES = 16 * 1024 * 1024
+# Files at least this large are memory-mapped and matched as bytes, never decoded
+MMAP_MIN_BYTES = 256 * 1024
+
+# Per-requirement time budget of isolated checks (--isolate / --check-timeout)
+CHECK_TIMEOUT = 30.0
+
+# Route probes (--probe-url / --probe-stub)
+PROBE_CONCURRENCY = 8
+PROBE_TIMEOUT = 5.0
+PROBE_REPEAT = 5
+HTTP_METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+
+# Bump when shared check plumbing changes in a way that invalidates cached results
+CHECKER_VERSION = 1
+
+PRISMA_SCHEMA = "prisma/schema.prisma"
+
+# Declarative requirement manifest, compiled into a plan cached by its hash
+MANIFEST_FILE = "qa/requirements.json"
+# Bump when the manifest compiler changes so cached plans are rebuilt
+PLAN_VERSION = 4
+
+# Source trees covered by the TypeScript symbol index
+SYMBOL_ROOTS = ("lib", "app", "components")
+SYMBOL_SUFFIXES = (".ts", ".tsx")
+# Bump when the tokenizer changes so persisted symbol tables are rebuilt
+SYMBOL_INDEX_VERSION = 1
+
+# Source trees covered by the import graph, and how specifiers resolve to files
+IMPORT_ROOTS = ("app", "lib", "components", "types")
+IMPORT_RESOLVE_SUFFIXES = (".ts", ".tsx", ".d.ts", ".js", ".jsx")
+TSCONFIG = "tsconfig.json"
+# Bump when the import parser changes so persisted import tables are rebuilt
+IMPORT_GRAPH_VERSION = 1
+# Bump when the markdown parser changes so persisted heading/link tables are rebuilt
+MARKDOWN_INDEX_VERSION = 1
+
+# Directories never descended into when indexing the tree
+PRUNED_DIRS = {".git", "node_modules", ".next", ".vercel", ".qa-cache", "__pycache__", ".pytest_cache", "coverage"}
@@ -0,0 +1,173 @@
+"""
+PartPulse QA System - Run History
+SQLite history of previous runs
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class RunHistory:
+    """Append-only SQLite store of QA runs for trend, regression and diff queries"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ref TEXT,
+            commit_sha TEXT,
+            total INTEGER NOT NULL,
+            passed INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            pass_rate REAL NOT NULL,
+            phases TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS run_categories (
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            category TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            passed INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            pass_rate REAL NOT NULL,
+            PRIMARY KEY (run_id, category)
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            category TEXT NOT NULL,
+            name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            details TEXT NOT NULL,
+            wall_ms REAL NOT NULL,
+            bytes_read INTEGER NOT NULL,
+            files_touched INTEGER NOT NULL,
+            PRIMARY KEY (run_id, category, name)
+        );
+        CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+        CREATE INDEX IF NOT EXISTS run_categories_category ON run_categories (category, run_id);
+        CREATE INDEX IF NOT EXISTS results_name ON results (name, category, run_id);
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+    
+    def close(self):
+        """Close the database"""
+        self.conn.close()
+    
+    def record(self, qa: "QASystem") -> int:
+        """Append one run with all its requirement results in a single transaction"""
+        source = qa.results.get("source") or {}
+        timings = qa.timings()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (timestamp, ref, commit_sha, total, passed, failed, pass_rate, phases) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    qa.results["timestamp"], source.get("ref"), source.get("commit"),
+                    qa.results["total_requirements"], qa.results["passed"], qa.results["failed"],
+                    qa.results["pass_rate"], json.dumps(timings["phases"]),
+                )
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_categories VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, name, cat["total"], cat["passed"], cat["failed"], cat["pass_rate"])
+                    for name, cat in qa.results["categories"].items()
+                ]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, req.category, req.name, req.status, req.details,
+                     round(req.wall_time * 1000, 3), req.bytes_read, req.files_touched)
+                    for req in qa.requirements
+                ]
+            )
+        return run_id
+    
+    def _rows(self, sql: str, params: Tuple = ()) -> List[Dict]:
+        """Run a query and return its rows as dictionaries"""
+        cursor = self.conn.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+    
+    def resolve_run(self, run: Optional[str], offset: int = 0) -> Optional[int]:
+        """Resolve a run id, or the run ``offset`` runs before the latest when ``run`` is None"""
+        if run is not None:
+            row = self.conn.execute("SELECT id FROM runs WHERE id = ?", (int(run),)).fetchone()
+        else:
+            row = self.conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?", (offset,)).fetchone()
+        return row[0] if row else None
+    
+    def runs(self, limit: int = 20) -> List[Dict]:
+        """Return the most recent runs, oldest first"""
+        return self._rows(
+            "SELECT * FROM (SELECT id, timestamp, ref, commit_sha, total, passed, failed, pass_rate "
+            "FROM runs ORDER BY id DESC LIMIT ?) ORDER BY id",
+            (limit,)
+        )
+    
+    def trend(self, category: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Return per-category pass rates of the last ``limit`` runs, oldest first"""
+        return self._rows(
+            "SELECT c.run_id, r.timestamp, c.category, c.total, c.passed, c.failed, c.pass_rate "
+            "FROM run_categories c JOIN runs r ON r.id = c.run_id "
+            "WHERE c.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?) "
+            "AND (? IS NULL OR c.category = ?) "
+            "ORDER BY c.category, c.run_id",
+            (limit, category, category)
+        )
+    
+    def first_red(self, name: str, category: Optional[str] = None) -> List[Dict]:
+        """Return, per matching requirement, the run that started its latest RED streak
+        
+        Requirements whose latest run is not RED report their most recent
+        earlier streak (with ``current`` false), or nothing if never RED.
+        """
+        rows = []
+        for (req_category,) in self.conn.execute(
+            "SELECT DISTINCT category FROM results WHERE name = ? AND (? IS NULL OR category = ?) ORDER BY category",
+            (name, category, category)
+        ):
+            latest = self.conn.execute(
+                "SELECT status FROM results WHERE name = ? AND category = ? ORDER BY run_id DESC LIMIT 1",
+                (name, req_category)
+            ).fetchone()[0]
+            found = self._rows(
+                "SELECT res.run_id, r.timestamp, r.ref, r.commit_sha, res.category, res.name, res.details "
+                "FROM results res JOIN runs r ON r.id = res.run_id "
+                "WHERE res.name = ? AND res.category = ? AND res.status = 'RED' AND res.run_id > COALESCE(("
+                "  SELECT MAX(run_id) FROM results WHERE name = ? AND category = ? AND status != 'RED' "
+                "  AND run_id < (SELECT MAX(run_id) FROM results WHERE name = ? AND category = ? AND status = 'RED')"
+                "), 0) ORDER BY res.run_id LIMIT 1",
+                (name, req_category, name, req_category, name, req_category)
+            )
+            for row in found:
+                row["current"] = latest == "RED"
+                rows.append(row)
+        return rows
+    
+    def diff(self, old_run: int, new_run: int) -> List[Dict]:
+        """Return requirements whose status differs between two runs (None = absent)"""
+        return self._rows(
+            "SELECT category, name, old_status, new_status, details FROM ("
+            "  SELECT o.category, o.name, o.status AS old_status, n.status AS new_status, "
+            "         COALESCE(n.details, o.details) AS details "
+            "  FROM results o LEFT JOIN results n "
+            "    ON n.run_id = ? AND n.category = o.category AND n.name = o.name "
+            "  WHERE o.run_id = ? AND (n.status IS NULL OR n.status != o.status) "
+            "  UNION ALL "
+            "  SELECT n.category, n.name, NULL, n.status, n.details "
+            "  FROM results n LEFT JOIN results o "
+            "    ON o.run_id = ? AND o.category = n.category AND o.name = n.name "
+            "  WHERE n.run_id = ? AND o.status IS NULL"
+            ") ORDER BY category, name",
+            (new_run, old_run, old_run, new_run)
+        )
@@ -0,0 +1,783 @@
+"""
+PartPulse QA System - Source Indexes
+TypeScript symbol index, import graph and markdown link index
+"""
+
+import posixpath
+import json
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .constants import (
+    IMPORT_GRAPH_VERSION, IMPORT_RESOLVE_SUFFIXES, IMPORT_ROOTS, MARKDOWN_INDEX_VERSION,
+    SYMBOL_INDEX_VERSION, SYMBOL_ROOTS, SYMBOL_SUFFIXES, TSCONFIG,
+)
+from .storage import FileIndex, FileSnapshotCache, atomic_writer
+
+
+class SymbolIndex:
+    """Index of top-level TypeScript declarations and exports across source trees
+    
+    Each file is tokenized once per content hash. Symbol tables are persisted
+    in the cache directory keyed by that hash, so later runs only tokenize
+    files that changed. Queries are dictionary lookups by symbol name.
+    """
+    
+    _TOKEN = re.compile(r"""
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+        |(?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+        |(?P<ident>[A-Za-z_$][\w$]*)
+        |(?P<punct>[{}()\[\],;:=*])
+    """, re.DOTALL | re.VERBOSE)
+    _IDENT = re.compile(r"[A-Za-z_$][\w$]*$")
+    _MODIFIERS = {"declare", "async", "abstract"}
+    _DECLARATIONS = {
+        "interface": "interface",
+        "type": "type",
+        "function": "function",
+        "class": "class",
+        "enum": "enum",
+        "namespace": "namespace",
+        "const": "const",
+        "let": "variable",
+        "var": "variable",
+    }
+    
+    def __init__(self, index: FileIndex, snapshot: FileSnapshotCache, roots: Iterable[str] = SYMBOL_ROOTS, cache_dir: Optional[Path] = None):
+        self.index = index
+        self.snapshot = snapshot
+        self.roots = tuple(roots)
+        self.cache_path = cache_dir / "symbols.json" if cache_dir else None
+        self.parsed = 0
+        self.reused = 0
+        # Relative path -> content digest, for the files currently indexed
+        self._files: Dict[str, str] = {}
+        # Content digest -> [(name, kind, exported), ...]
+        self._tables: Dict[str, List[Tuple[str, str, bool]]] = self._load_tables()
+        # Symbol name -> [(path, kind, exported), ...]
+        self._by_name: Dict[str, List[Tuple[str, str, bool]]] = {}
+    
+    def _load_tables(self) -> Dict[str, List[Tuple[str, str, bool]]]:
+        """Read persisted symbol tables; a missing or stale file starts empty"""
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != SYMBOL_INDEX_VERSION:
+            return {}
+        return {digest: [tuple(symbol) for symbol in table] for digest, table in data.get("tables", {}).items()}
+    
+    def _save_tables(self):
+        """Persist the tables of the current files; failures to write are not fatal"""
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_writer(self.cache_path) as f:
+                json.dump({
+                    "version": SYMBOL_INDEX_VERSION,
+                    "tables": {digest: self._tables[digest] for digest in sorted(set(self._files.values()))},
+                }, f)
+        except OSError:
+            pass
+    
+    def update(self):
+        """Bring the index up to date, tokenizing only files whose content changed"""
+        paths = [path for root in self.roots for path in self.index.files(root, SYMBOL_SUFFIXES)]
+        files = {}
+        dirty = False
+        for path in paths:
+            digest = self.snapshot.digest(path)
+            if digest not in self._tables:
+                text = self.snapshot.read_text(path)
+                if text is None:
+                    continue
+                self._tables[digest] = self.extract(text)
+                self.parsed += 1
+                dirty = True
+            else:
+                self.reused += 1
+            files[path] = digest
+        
+        dirty = dirty or set(files.values()) != set(self._files.values())
+        self._files = files
+        self._tables = {digest: self._tables[digest] for digest in set(files.values())}
+        self._by_name = {}
+        for path, digest in files.items():
+            for name, kind, exported in self._tables[digest]:
+                self._by_name.setdefault(name, []).append((path, kind, exported))
+        if dirty:
+            self._save_tables()
+    
+    @classmethod
+    def extract(cls, text: str) -> List[Tuple[str, str, bool]]:
+        """Return (name, kind, exported) for every top-level declaration and export"""
+        tokens = [m.group() for m in cls._TOKEN.finditer(text) if m.lastgroup in ("ident", "punct")]
+        symbols: List[Tuple[str, str, bool]] = []
+        depth = 0
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token == "{":
+                depth += 1
+            elif token == "}":
+                depth = max(0, depth - 1)
+            elif depth == 0 and token == "export":
+                i = cls._export(tokens, i + 1, symbols)
+                continue
+            elif depth == 0 and (token in cls._DECLARATIONS or token in cls._MODIFIERS):
+                i = cls._declaration(tokens, i, False, symbols)
+                continue
+            i += 1
+        return symbols
+    
+    @classmethod
+    def _token(cls, tokens: List[str], i: int) -> str:
+        """Return the token at ``i`` or an empty string past the end"""
+        return tokens[i] if i < len(tokens) else ""
+    
+    @classmethod
+    def _export(cls, tokens: List[str], i: int, symbols: List[Tuple[str, str, bool]]) -> int:
+        """Record the symbols of an export statement starting after "export" """
+        token = cls._token(tokens, i)
+        if token == "default":
+            i += 1
+            while cls._token(tokens, i) in cls._MODIFIERS:
+                i += 1
+            kind = cls._DECLARATIONS.get(cls._token(tokens, i))
+            if kind in ("function", "class", "interface"):
+                i += 1
+                if cls._token(tokens, i) == "*":
+                    i += 1
+                name = cls._token(tokens, i)
+                if cls._IDENT.match(name) and name not in ("extends", "implements"):
+                    symbols.append((name, kind, True))
+                symbols.append(("default", kind, True))
+            else:
+                symbols.append(("default", "value", True))
+            return i
+        if token == "type" and cls._token(tokens, i + 1) == "{":
+            i += 1
+            token = "{"
+        if token == "{":
+            # export { a, b as c } [from "..."]
+            i += 1
+            while i < len(tokens) and tokens[i] != "}":
+                if tokens[i] != "," and cls._token(tokens, i + 1) in (",", "}"):
+                    symbols.append((tokens[i], "reexport", True))
+                i += 1
+            return i + 1
+        if token == "*":
+            if cls._token(tokens, i + 1) == "as":
+                symbols.append((cls._token(tokens, i + 2), "namespace", True))
+            return i + 1
+        return cls._declaration(tokens, i, True, symbols)
+    
+    @classmethod
+    def _declaration(cls, tokens: List[str], i: int, exported: bool, symbols: List[Tuple[str, str, bool]]) -> int:
+        """Record a declaration starting at ``i`` and return the index after its name"""
+        while cls._token(tokens, i) in cls._MODIFIERS:
+            i += 1
+        if cls._token(tokens, i) == "const" and cls._token(tokens, i + 1) == "enum":
+            i += 1
+        kind = cls._DECLARATIONS.get(cls._token(tokens, i))
+        if kind is None:
+            return i
+        i += 1
+        if cls._token(tokens, i) == "*":
+            i += 1
+        token = cls._token(tokens, i)
+        if token in ("{", "[") and kind in ("const", "variable"):
+            # Destructuring: const { a, b: c } = ...
+            close = "}" if token == "{" else "]"
+            nesting = 0
+            while i < len(tokens):
+                token = tokens[i]
+                if token in ("{", "["):
+                    nesting += 1
+                elif token in ("}", "]"):
+                    nesting -= 1
+                    if nesting == 0:
+                        return i + 1
+                elif cls._IDENT.match(token) and cls._token(tokens, i + 1) in (",", close, "=", "}", "]"):
+                    symbols.append((token, kind, exported))
+                i += 1
+            return i
+        if cls._IDENT.match(token):
+            symbols.append((token, kind, exported))
+            return i + 1
+        return i
+    
+    def declarations(self, path: str) -> List[Tuple[str, str, bool]]:
+        """Return (name, kind, exported) for every top-level declaration of one file"""
+        return self._tables.get(self._files.get(path), [])
+    
+    def find(self, name: str, kind: Optional[str] = None, path: Optional[str] = None, exported: Optional[bool] = None) -> List[Tuple[str, str, bool]]:
+        """Return (path, kind, exported) for every declaration of ``name`` matching the filters"""
+        return [
+            entry for entry in self._by_name.get(name, [])
+            if (kind is None or entry[1] == kind)
+            and (path is None or entry[0] == path or entry[0].startswith(path.rstrip("/") + "/"))
+            and (exported is None or entry[2] == exported)
+        ]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return index counters for the results file"""
+        return {
+            "files": len(self._files),
+            "symbols": sum(len(entries) for entries in self._by_name.values()),
+            "parsed": self.parsed,
+            "reused": self.reused,
+        }
+
+
+def module_matches(path: str, module: str) -> bool:
+    """Check if a file is ``module`` or lies below it
+    
+    ``module`` is a path as written in an import, without a suffix:
+    "lib/prisma" matches lib/prisma.ts, lib/prisma/index.ts and everything
+    under lib/prisma/.
+    """
+    module = module.rstrip("/")
+    if not module or path == module or path.startswith(module + "/"):
+        return True
+    stem = path
+    for suffix in IMPORT_RESOLVE_SUFFIXES:
+        if path.endswith(suffix):
+            stem = path[:-len(suffix)]
+            break
+    return stem == module
+
+
+class ImportGraph:
+    """Module dependency graph of the TypeScript sources
+    
+    All files are hashed and parsed in one concurrent pass. Each file's
+    imports are parsed once per content hash and persisted in the cache
+    directory, so later runs only re-parse files that changed. Specifiers
+    are resolved on every update, since resolution depends on which files
+    exist: relative paths against the importing file, and aliases through
+    ``compilerOptions.paths`` in tsconfig.json (e.g. "@/*" -> "./*").
+    Package imports are counted but not part of the graph.
+    """
+    
+    _COMMENT_OR_STRING = re.compile(r"""//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`""", re.DOTALL)
+    _IMPORT = re.compile(r"""
+        ^[ \t]*(?P<keyword>import|export)\s+(?P<type>type\s+)?(?P<clause>[\w$\s{},*]*?)\s*from\s*(?P<q1>['"])(?P<from>[^'"\n]+)(?P=q1)
+        |^[ \t]*import\s*(?P<q2>['"])(?P<bare>[^'"\n]+)(?P=q2)
+        |\b(?:import|require)\s*\(\s*(?P<q3>['"])(?P<call>[^'"\n]+)(?P=q3)\s*\)
+    """, re.MULTILINE | re.VERBOSE)
+    
+    def __init__(self, index: FileIndex, snapshot: FileSnapshotCache, roots: Iterable[str] = IMPORT_ROOTS, cache_dir: Optional[Path] = None, jobs: int = 8):
+        self.index = index
+        self.snapshot = snapshot
+        self.roots = tuple(roots)
+        self.jobs = jobs
+        self.cache_path = cache_dir / "imports.json" if cache_dir else None
+        self.parsed = 0
+        self.reused = 0
+        self.external = 0
+        # Specifiers that look local (relative or aliased) but resolve to no file
+        self.unresolved: List[Tuple[str, int, str]] = []
+        # Alias pattern -> target patterns, relative to the project root
+        self.aliases: List[Tuple[str, List[str]]] = []
+        # Relative path -> content digest, for the files currently indexed
+        self._files: Dict[str, str] = {}
+        # Content digest -> [(specifier, imported names, type only, line), ...]
+        self._tables: Dict[str, List[Tuple[str, Tuple[str, ...], bool, int]]] = self._load_tables()
+        # Importing file -> [(imported file, imported names, type only, line), ...]
+        self.edges: Dict[str, List[Tuple[str, Tuple[str, ...], bool, int]]] = {}
+    
+    def _load_tables(self) -> Dict[str, List[Tuple[str, Tuple[str, ...], bool, int]]]:
+        """Read persisted import tables; a missing or stale file starts empty"""
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != IMPORT_GRAPH_VERSION:
+            return {}
+        return {
+            digest: [(spec, tuple(names), type_only, line) for spec, names, type_only, line in table]
+            for digest, table in data.get("tables", {}).items()
+        }
+    
+    def _save_tables(self):
+        """Persist the tables of the current files; failures to write are not fatal"""
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_writer(self.cache_path) as f:
+                json.dump({
+                    "version": IMPORT_GRAPH_VERSION,
+                    "tables": {digest: self._tables[digest] for digest in sorted(set(self._files.values()))},
+                }, f)
+        except OSError:
+            pass
+    
+    def _load_aliases(self) -> List[Tuple[str, List[str]]]:
+        """Read ``compilerOptions.paths`` from tsconfig.json (none if unreadable)"""
+        text = self.snapshot.read_text(TSCONFIG)
+        try:
+            options = json.loads(text or "{}").get("compilerOptions", {})
+        except ValueError:
+            return []
+        base = options.get("baseUrl", ".")
+        return [
+            (pattern, [posixpath.normpath(posixpath.join(base, target)) for target in targets])
+            for pattern, targets in (options.get("paths") or {}).items()
+        ]
+    
+    def _parse_file(self, path: str) -> Tuple[str, str, Optional[List]]:
+        """Hash a file and parse it unless its table is already known"""
+        digest = self.snapshot.digest(path)
+        if digest in self._tables:
+            return path, digest, None
+        text = self.snapshot.read_text(path)
+        return path, digest, self.extract(text) if text is not None else None
+    
+    def update(self):
+        """Bring the graph up to date, parsing only files whose content changed"""
+        paths = [path for root in self.roots for path in self.index.files(root, SYMBOL_SUFFIXES)]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            scanned = list(pool.map(self._parse_file, paths))
+        
+        files = {}
+        dirty = False
+        for path, digest, table in scanned:
+            if table is not None:
+                self._tables[digest] = table
+                self.parsed += 1
+                dirty = True
+            elif digest in self._tables:
+                self.reused += 1
+            else:
+                continue
+            files[path] = digest
+        
+        dirty = dirty or set(files.values()) != set(self._files.values())
+        self._files = files
+        self._tables = {digest: self._tables[digest] for digest in set(files.values())}
+        self.aliases = self._load_aliases()
+        self.external = 0
+        self.unresolved = []
+        self.edges = {}
+        for path, digest in files.items():
+            edges = self.edges.setdefault(path, [])
+            for specifier, names, type_only, line in self._tables[digest]:
+                candidates = self._candidates(path, specifier)
+                if candidates is None:
+                    self.external += 1
+                    continue
+                target = self._resolve(candidates)
+                if target is None:
+                    self.unresolved.append((path, line, specifier))
+                else:
+                    edges.append((target, names, type_only, line))
+        if dirty:
+            self._save_tables()
+    
+    def _candidates(self, source: str, specifier: str) -> Optional[List[str]]:
+        """Return the base paths a specifier may refer to, or None for a package"""
+        if specifier.startswith("."):
+            return [posixpath.normpath(posixpath.join(posixpath.dirname(source), specifier))]
+        candidates = []
+        for pattern, targets in self.aliases:
+            if pattern.endswith("*") and specifier.startswith(pattern[:-1]):
+                rest = specifier[len(pattern) - 1:]
+                candidates.extend(posixpath.normpath(target.replace("*", rest, 1)) for target in targets)
+            elif pattern == specifier:
+                candidates.extend(targets)
+        return candidates or None
+    
+    def _resolve(self, candidates: List[str]) -> Optional[str]:
+        """Return the first existing file for the candidate base paths"""
+        for base in candidates:
+            for path in [base] + [base + s for s in IMPORT_RESOLVE_SUFFIXES] + [f"{base}/index{s}" for s in IMPORT_RESOLVE_SUFFIXES]:
+                if self.snapshot.kind(path) == "file":
+                    return path
+        return None
+    
+    @classmethod
+    def extract(cls, text: str) -> List[Tuple[str, Tuple[str, ...], bool, int]]:
+        """Return (specifier, imported names, type only, line) for every import of a module
+        
+        Covers static imports, re-exports, bare side-effect imports, dynamic
+        ``import()`` and ``require()``. Names are as exported by the target
+        ("default" for a default import, "*" for a namespace or ``export *``).
+        """
+        # Blank out comments (keeping newlines) so commented-out imports are ignored
+        code = cls._COMMENT_OR_STRING.sub(
+            lambda m: m.group() if m.group()[0] in "\"'`" else re.sub(r"[^\n]", " ", m.group()), text
+        )
+        imports = []
+        line, position = 1, 0
+        for match in cls._IMPORT.finditer(code):
+            line += code.count("\n", position, match.start())
+            position = match.start()
+            if match.group("from"):
+                names, type_only = cls._clause(match.group("clause"))
+                imports.append((match.group("from"), names, type_only or bool(match.group("type")), line))
+            else:
+                imports.append((match.group("bare") or match.group("call"), ("*",) if match.group("call") else (), False, line))
+        return imports
+    
+    @staticmethod
+    def _clause(clause: str) -> Tuple[Tuple[str, ...], bool]:
+        """Return (imported names, every name is type only) for an import clause"""
+        names = []
+        types = []
+        braced = re.search(r"\{([^}]*)\}", clause)
+        outside = re.sub(r"\{[^}]*\}", "", clause)
+        if "*" in outside:
+            names.append("*")
+            types.append(False)
+        default = re.match(r"\s*([A-Za-z_$][\w$]*)\s*(?:,|$)", outside)
+        if default and default.group(1) != "type":
+            names.append("default")
+            types.append(False)
+        for item in (braced.group(1).split(",") if braced else []):
+            words = item.split()
+            if not words:
+                continue
+            type_only = words[0] == "type" and len(words) > 1 and words[1] != "as"
+            names.append(words[1] if type_only else words[0])
+            types.append(type_only)
+        return tuple(names), bool(types) and all(types)
+    
+    def edges_of(self, path: str) -> List[Tuple[str, Tuple[str, ...], bool, int]]:
+        """Return a file's resolved imports, parsing files outside the roots (e.g. tests) on demand"""
+        if path in self.edges:
+            return self.edges[path]
+        table = self._tables.get(self.snapshot.digest(path))
+        if table is None:
+            text = self.snapshot.read_text(path)
+            table = self.extract(text) if text is not None else []
+        edges = []
+        for specifier, names, type_only, line in table:
+            candidates = self._candidates(path, specifier)
+            target = self._resolve(candidates) if candidates else None
+            if target is not None:
+                edges.append((target, names, type_only, line))
+        return edges
+    
+    def forbidden(self, sources: List[str], targets: List[str], exclude: Iterable[str] = (), include_types: bool = False) -> Tuple[int, List[Tuple[str, int, str, Tuple[str, ...]]]]:
+        """Return (edges checked, [(file, line, imported file, names), ...]) for
+        imports from ``sources`` into ``targets`` (module paths, see module_matches)
+        """
+        exclude = list(exclude)
+        checked = 0
+        found = []
+        for path in sorted(self.edges):
+            if not any(module_matches(path, s) for s in sources) or any(module_matches(path, x) for x in exclude):
+                continue
+            for target, names, type_only, line in self.edges[path]:
+                if type_only and not include_types:
+                    continue
+                checked += 1
+                if any(module_matches(target, t) for t in targets):
+                    found.append((path, line, target, names))
+        return checked, found
+    
+    def cycles(self, prefix: str = "", include_types: bool = False) -> Tuple[int, List[List[str]]]:
+        """Return (files considered, cycles) among the files below ``prefix``
+        
+        Each cycle is one path (first file repeated at the end) through a
+        strongly connected component, found with an iterative Tarjan walk.
+        """
+        nodes = sorted(path for path in self.edges if module_matches(path, prefix))
+        members = set(nodes)
+        graph = {
+            node: sorted({t for t, _, type_only, _ in self.edges[node] if t in members and (include_types or not type_only)})
+            for node in nodes
+        }
+        
+        order: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components = []
+        for root in nodes:
+            if root in order:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    order[node] = low[node] = len(order)
+                    stack.append(node)
+                    on_stack.add(node)
+                if child < len(graph[node]):
+                    work.append((node, child + 1))
+                    target = graph[node][child]
+                    if target not in order:
+                        work.append((target, 0))
+                    elif target in on_stack:
+                        low[node] = min(low[node], order[target])
+                    continue
+                for target in graph[node]:
+                    if target in on_stack:
+                        low[node] = min(low[node], low[target])
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph[node]:
+                        components.append(sorted(component))
+        return len(nodes), [self._cycle_path(graph, component) for component in sorted(components)]
+    
+    @staticmethod
+    def _cycle_path(graph: Dict[str, List[str]], component: List[str]) -> List[str]:
+        """Return the shortest cycle through the first file of a component"""
+        start = component[0]
+        members = set(component)
+        previous: Dict[str, str] = {}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target in graph[node]:
+                if target == start:
+                    path = [node]
+                    while path[-1] != start:
+                        path.append(previous[path[-1]])
+                    return path[::-1] + [start]
+                if target in members and target not in previous:
+                    previous[target] = node
+                    queue.append(target)
+        return component + [start]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return graph counters for the results file"""
+        return {
+            "files": len(self._files),
+            "edges": sum(len(edges) for edges in self.edges.values()),
+            "external": self.external,
+            "unresolved": len(self.unresolved),
+            "parsed": self.parsed,
+            "reused": self.reused,
+        }
+
+
+class MarkdownLinkIndex:
+    """Heading anchors and relative links of every markdown file in the tree
+    
+    All files are hashed and parsed in one concurrent pass. Each file is
+    parsed once per content hash, and the tables are persisted in the cache
+    directory, so later runs only re-parse files that changed. Links are then
+    resolved against the in-memory anchor index, so no target is read twice.
+    Anchors follow GitHub's heading slugs, including -1, -2 suffixes for
+    duplicates, plus explicit ``id``/``name`` HTML anchors.
+    """
+    
+    _FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+    _ATX = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+    _SETEXT = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+    _HTML_ANCHOR = re.compile(r"<a\s[^>]*?(?:name|id)\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+    _INLINE_CODE = re.compile(r"(`+)(?:(?!\1).)+\1")
+    _INLINE_LINK = re.compile(r"!?\[(?:[^\[\]]|\[[^\]]*\])*\]\(\s*<?([^)\s>]*)>?(?:\s+[\"'(][^)]*)?\)")
+    _REFERENCE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(?:\s|$)")
+    _SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:|^//")
+    _SLUG_DROP = re.compile(r"[^\w\- ]", re.UNICODE)
+    _SLUG_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+    _SLUG_TAG = re.compile(r"<[^>]+>")
+    
+    def __init__(self, index: FileIndex, snapshot: FileSnapshotCache, jobs: int = 8, cache_dir: Optional[Path] = None):
+        self.index = index
+        self.snapshot = snapshot
+        self.jobs = jobs
+        self.cache_path = cache_dir / "markdown.json" if cache_dir else None
+        self.parsed = 0
+        self.reused = 0
+        self.files: List[str] = []
+        # Markdown path -> lower-cased anchors
+        self.anchors: Dict[str, Set[str]] = {}
+        # Markdown path -> [(line, target), ...]
+        self.links: Dict[str, List[Tuple[int, str]]] = {}
+        # Content digest -> (anchors, links)
+        self._tables: Dict[str, Tuple[Set[str], List[Tuple[int, str]]]] = self._load_tables()
+    
+    def _load_tables(self) -> Dict[str, Tuple[Set[str], List[Tuple[int, str]]]]:
+        """Read persisted heading/link tables; a missing or stale file starts empty"""
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MARKDOWN_INDEX_VERSION:
+            return {}
+        return {
+            digest: (set(anchors), [(line, target) for line, target in links])
+            for digest, (anchors, links) in data.get("tables", {}).items()
+        }
+    
+    def _save_tables(self, digests: Set[str]):
+        """Persist the tables of the current files; failures to write are not fatal"""
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_writer(self.cache_path) as f:
+                json.dump({
+                    "version": MARKDOWN_INDEX_VERSION,
+                    "tables": {digest: [sorted(self._tables[digest][0]), self._tables[digest][1]] for digest in sorted(digests)},
+                }, f)
+        except OSError:
+            pass
+    
+    def update(self):
+        """Bring the index up to date, parsing only files whose content changed"""
+        paths = self.index.files(suffixes=(".md",))
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            scanned = list(pool.map(self._parse_file, paths))
+        
+        dirty = False
+        digests = {}
+        for path, digest, table in scanned:
+            if table is not None:
+                self._tables[digest] = table
+                self.parsed += 1
+                dirty = True
+            else:
+                self.reused += 1
+            digests[path] = digest
+        
+        dirty = dirty or set(digests.values()) != set(self._tables)
+        self._tables = {digest: self._tables[digest] for digest in set(digests.values())}
+        self.files = paths
+        self.anchors = {path: self._tables[digest][0] for path, digest in digests.items()}
+        self.links = {path: self._tables[digest][1] for path, digest in digests.items()}
+        if dirty:
+            self._save_tables(set(digests.values()))
+    
+    def _parse_file(self, path: str) -> Tuple[str, str, Optional[Tuple[Set[str], List[Tuple[int, str]]]]]:
+        """Hash a file and parse it unless its table is already known"""
+        digest = self.snapshot.digest(path)
+        if digest in self._tables:
+            return path, digest, None
+        text = self.snapshot.read_text(path)
+        return path, digest, self.parse(text) if text is not None else (set(), [])
+        
+    @classmethod
+    def slug(cls, heading: str) -> str:
+        """Return GitHub's anchor for a heading's text"""
+        text = cls._SLUG_LINK.sub(r"\1", heading)
+        text = cls._SLUG_TAG.sub("", text).replace("`", "").replace("*", "")
+        return cls._SLUG_DROP.sub("", text.strip().lower()).replace(" ", "-")
+    
+    @classmethod
+    def parse(cls, text: str) -> Tuple[Set[str], List[Tuple[int, str]]]:
+        """Return (anchors, [(line, link target), ...]) for markdown source"""
+        anchors: Set[str] = set()
+        seen: Dict[str, int] = {}
+        links: List[Tuple[int, str]] = []
+        fence = None
+        previous = ""
+        
+        def add_heading(heading: str):
+            slug = cls.slug(heading)
+            if slug in seen:
+                seen[slug] += 1
+                anchors.add(f"{slug}-{seen[slug]}")
+            else:
+                seen[slug] = 0
+                anchors.add(slug)
+        
+        # Most lines are plain prose, so each regex runs only when the
+        # character it needs is present
+        for number, line in enumerate(text.splitlines(), 1):
+            first = line.lstrip()[:1]
+            match = cls._FENCE.match(line) if first in ("`", "~") else None
+            if fence:
+                if match and match.group(1) == fence:
+                    fence = None
+                continue
+            if match:
+                fence = match.group(1)
+                previous = ""
+                continue
+            
+            heading = cls._ATX.match(line) if first == "#" else None
+            if heading:
+                add_heading(heading.group(1))
+            elif first in ("=", "-") and previous.strip() and cls._SETEXT.match(line) and not previous.lstrip().startswith(("-", "*", ">", "|")):
+                add_heading(previous.strip())
+            previous = line
+            
+            if "<" in line:
+                anchors.update(anchor.lower() for anchor in cls._HTML_ANCHOR.findall(line))
+            if "[" not in line:
+                continue
+            code_free = cls._INLINE_CODE.sub("", line) if "`" in line else line
+            for target in cls._INLINE_LINK.findall(code_free):
+                links.append((number, target))
+            reference = cls._REFERENCE.match(code_free)
+            if reference:
+                links.append((number, reference.group(1)))
+        return anchors, links
+    
+    def resolve(self, source: str, target: str) -> Optional[str]:
+        """Return why a link from ``source`` is broken, or None if it resolves"""
+        if not target or self._SCHEME.match(target) or "{{" in target:
+            return None
+        path, _, anchor = target.partition("#")
+        path = unquote(path.split("?", 1)[0])
+        if path:
+            base = "" if path.startswith("/") else posixpath.dirname(source)
+            resolved = posixpath.normpath(posixpath.join(base, path.lstrip("/")))
+            if resolved == ".." or resolved.startswith("../"):
+                return "outside the repository"
+            kind = self.snapshot.kind(resolved) if resolved != "." else "dir"
+            if kind is None:
+                return "missing file"
+        else:
+            resolved, kind = source, "file"
+        
+        if anchor and kind == "file" and resolved.lower().endswith(".md"):
+            anchors = self.anchors.get(resolved)
+            if anchors is None:
+                # Linked markdown outside the indexed tree (e.g. under a pruned directory)
+                return None
+            if unquote(anchor).lower() not in anchors:
+                return f"missing anchor #{anchor}"
+        return None
+    
+    def broken(self, prefix: str = "") -> Tuple[int, List[Dict]]:
+        """Return (links checked, broken links) for markdown files below ``prefix``"""
+        start = prefix.rstrip("/") + "/" if prefix else ""
+        checked = 0
+        broken = []
+        for source in self.files:
+            if not source.startswith(start):
+                continue
+            for line, target in self.links[source]:
+                checked += 1
+                reason = self.resolve(source, target)
+                if reason:
+                    broken.append({"source": source, "line": line, "target": target, "reason": reason})
+        return checked, broken
+    
+    def stats(self) -> Dict[str, int]:
+        """Return index counters for the results file"""
+        return {
+            "files": len(self.files),
+            "anchors": sum(len(anchors) for anchors in self.anchors.values()),
+            "links": sum(len(links) for links in self.links.values()),
+            "parsed": self.parsed,
+            "reused": self.reused,
+        }
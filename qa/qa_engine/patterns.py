@@ -0,0 +1,185 @@
+"""
+PartPulse QA System - Pattern Engine
+Batches content patterns into one scan per file
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+
+def backtracking_risk(pattern: str) -> Optional[str]:
+    """Return why a pattern is prone to catastrophic backtracking, or None
+    
+    Flags a repeat (``*``, ``+``, ``{n,}``) whose body itself contains a
+    repeat, as in ``(a+)+`` or ``(\\w+\\s*)*``: a failing match then tries
+    exponentially many ways to split the input between the two.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return None
+    repeats = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+    
+    def children(value) -> Iterator:
+        """Yield the subpatterns nested in an opcode's argument"""
+        if isinstance(value, sre_parse.SubPattern):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield from children(item)
+    
+    def find(subpattern, inside: Optional[str]) -> Optional[str]:
+        for op, value in subpattern:
+            if op in repeats and value[1] > 1:
+                if inside is not None:
+                    return f"nested quantifier inside {inside}"
+                found = find(value[2], "a repeated group")
+            else:
+                found = None
+                for child in children(value):
+                    found = found or find(child, inside)
+            if found:
+                return found
+        return None
+    
+    return find(parsed, None)
+
+
+class PatternEngine:
+    """Answers every content pattern registered against a file in one scan
+    
+    Patterns are grouped by file and compiled once into a single alternation
+    of named groups. A scan that leaves patterns unmatched after other
+    patterns matched is repeated for the remainder only, since an earlier
+    alternative can shadow a later one at the same position.
+    """
+    
+    FLAGS = re.MULTILINE | re.IGNORECASE
+    
+    # Patterns that cannot be safely embedded in a combined alternation
+    _STANDALONE = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?[aiLmsux]+\)")
+    
+    def __init__(self):
+        self._patterns: Dict[str, List[str]] = {}
+        self._results: Dict[str, Dict[str, bool]] = {}
+        self._matchers: Dict[Tuple[Tuple[str, ...], bool], Optional[re.Pattern]] = {}
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        # Pattern -> why it may backtrack catastrophically
+        self.risky: Dict[str, str] = {}
+        self._vetted: Set[str] = set()
+        self.scans = 0
+    
+    def register(self, file_path: str, pattern: str) -> Optional[str]:
+        """Register a content pattern against a file
+        
+        Returns the backtracking risk of a pattern the first time it is seen.
+        """
+        with self._lock:
+            patterns = self._patterns.setdefault(file_path, [])
+            if pattern not in patterns:
+                patterns.append(pattern)
+            self._file_locks.setdefault(file_path, threading.Lock())
+            if pattern in self._vetted:
+                return None
+            self._vetted.add(pattern)
+        risk = backtracking_risk(pattern)
+        if risk:
+            with self._lock:
+                self.risky[pattern] = risk
+        return risk
+    
+    def invalidate(self, paths: Iterable[str]):
+        """Forget computed results for the given files"""
+        for path in paths:
+            self._results.pop(path, None)
+    
+    def search(self, file_path: str, pattern: str, content) -> bool:
+        """Return whether the pattern occurs in the file's content
+        
+        ``content`` is either decoded text or a bytes-like buffer (such as an
+        mmap), which is matched with the patterns compiled as bytes.
+        """
+        self.register(file_path, pattern)
+        with self._file_locks[file_path]:
+            results = self._results.setdefault(file_path, {})
+            if pattern not in results:
+                with self._lock:
+                    pending = [p for p in self._patterns[file_path] if p not in results]
+                results.update(self._scan(content, pending))
+            return results[pattern]
+    
+    def _scan(self, content, patterns: List[str]) -> Dict[str, bool]:
+        """Evaluate all patterns against the content (caller holds the file lock)"""
+        binary = not isinstance(content, str)
+        found: Dict[str, bool] = {}
+        remaining = []
+        for pattern in patterns:
+            if self._STANDALONE.search(pattern):
+                self._count_scan()
+                found[pattern] = self._search_one(pattern, content, binary)
+            else:
+                remaining.append(pattern)
+        
+        while remaining:
+            matcher = self._matcher(tuple(remaining), binary)
+            if matcher is None:
+                for pattern in remaining:
+                    self._count_scan()
+                    found[pattern] = self._search_one(pattern, content, binary)
+                break
+            
+            self._count_scan()
+            hit = set()
+            for match in matcher.finditer(content):
+                hit.add(int(match.lastgroup[1:]))
+                if len(hit) == len(remaining):
+                    break
+            
+            if not hit:
+                # Nothing matched at all, so none of the remaining can match
+                for pattern in remaining:
+                    found[pattern] = False
+                break
+            for index in hit:
+                found[remaining[index]] = True
+            remaining = [p for i, p in enumerate(remaining) if i not in hit]
+        
+        return found
+    
+    def _search_one(self, pattern: str, content, binary: bool) -> bool:
+        """Search for one pattern, stopping at its first match"""
+        if binary:
+            return bool(re.search(pattern.encode("utf-8"), content, self.FLAGS))
+        return bool(re.search(pattern, content, self.FLAGS))
+    
+    def _count_scan(self):
+        """Increment the scan counter"""
+        with self._lock:
+            self.scans += 1
+    
+    def _matcher(self, patterns: Tuple[str, ...], binary: bool = False) -> Optional[re.Pattern]:
+        """Compile (once) the combined alternation for a pattern group, as str or bytes"""
+        key = (patterns, binary)
+        with self._lock:
+            if key not in self._matchers:
+                combined = "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns))
+                try:
+                    self._matchers[key] = re.compile(combined.encode("utf-8") if binary else combined, self.FLAGS)
+                except re.error:
+                    self._matchers[key] = None
+            return self._matchers[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return engine counters for the results file"""
+        return {
+            "files": len(self._patterns),
+            "patterns": sum(len(p) for p in self._patterns.values()),
+            "scans": self.scans,
+        }
@@ -0,0 +1,274 @@
+"""
+PartPulse QA System - Requirements
+The requirement manifest compiler and the Requirement record
+"""
+
+import json
+import re
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .constants import PLAN_VERSION
+from .storage import atomic_writer
+
+
+class RequirementPlan:
+    """A requirement manifest compiled into a deduplicated check plan
+    
+    The manifest lists ``exists``, ``contains``, ``symbol``, ``model``,
+    ``links``, ``imports``, ``cycles`` and ``correspondence`` rules. Compiling validates every rule (including its regexes)
+    and interns paths and patterns into shared tables that rules reference by
+    index. ``files`` groups the patterns and rules of each input file, so a
+    file's patterns are all registered before any of them is scanned. Plans
+    are cached as ``<cache_dir>/plans/<hash>.json``, keyed by the manifest's
+    bytes, so an unchanged manifest is never recompiled.
+    """
+    
+    COMMON_FIELDS = {"type", "category", "name", "description", "version", "level"}
+    # Rule type -> (required fields, optional fields)
+    RULE_FIELDS = {
+        "exists": (("path",), ()),
+        "contains": (("patterns",), ("path", "paths", "match", "messages")),
+        "symbol": (("symbol",), ("kind", "path", "exported", "messages")),
+        "model": (("model",), ("field", "relates_to", "index", "unique")),
+        "links": ((), ("prefix",)),
+        "imports": (("from", "forbid"), ("except", "include_types")),
+        "cycles": ((), ("prefix", "include_types")),
+        "correspondence": (("left", "right"), ()),
+    }
+    # Keys a correspondence side can be joined on, and the fields each side may set
+    JOIN_KEYS = ("path", "imports", "exports", "imported_names")
+    SIDE_FIELDS = {"files", "key", "module", "kind", "pattern"}
+    
+    def __init__(self, data: Dict, cached: bool = False):
+        self.digest: str = data["digest"]
+        self.paths: List[str] = data["paths"]
+        self.patterns: List[str] = data["patterns"]
+        # {"type", "category", "name", "description", "version", "level", "paths", "patterns", "args", "digest"}
+        self.rules: List[Dict] = data["rules"]
+        # [path index, [pattern indexes], [rule indexes]] per input file
+        self.files: List[List] = data["files"]
+        self.cached = cached
+    
+    @classmethod
+    def compile(cls, manifest: Dict, digest: str) -> "RequirementPlan":
+        """Validate a parsed manifest and compile it (raises ValueError)"""
+        entries = manifest.get("requirements") if isinstance(manifest, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("the manifest must be an object with a \"requirements\" list")
+        if manifest.get("version", 1) != 1:
+            raise ValueError(f"unsupported manifest version {manifest['version']!r}")
+        
+        paths: Dict[str, int] = {}
+        patterns: Dict[str, int] = {}
+        files: Dict[int, Tuple[List[int], List[int]]] = {}
+        rules = []
+        names: Set[Tuple[str, str]] = set()
+        for position, entry in enumerate(entries, 1):
+            if not isinstance(entry, dict):
+                raise ValueError(f"requirement {position} is not an object")
+            kind = entry.get("type")
+            if kind not in cls.RULE_FIELDS:
+                raise ValueError(f"requirement {position}: unknown type {kind!r}")
+            required, optional = cls.RULE_FIELDS[kind]
+            unknown = set(entry) - cls.COMMON_FIELDS - set(required) - set(optional)
+            if unknown:
+                raise ValueError(f"requirement {position}: unexpected field(s) {', '.join(sorted(unknown))}")
+            name = entry.get("name", entry.get("path") if kind == "exists" else None)
+            missing = [field for field in ("category", "description") + required if field not in entry]
+            if name is None:
+                missing.append("name")
+            if missing:
+                raise ValueError(f"requirement {position}: missing field(s) {', '.join(missing)}")
+            if (entry["category"], name) in names:
+                raise ValueError(f"requirement {position}: duplicate name {entry['category']} / {name}")
+            names.add((entry["category"], name))
+            
+            rule_paths = entry.get("paths") or ([entry["path"]] if entry.get("path") else [])
+            rule_patterns = entry.get("patterns", [])
+            if kind == "contains" and (not rule_paths or not rule_patterns):
+                raise ValueError(f"requirement {position}: a contains rule needs a path and at least one pattern")
+            for field in ("from", "forbid", "except"):
+                if isinstance(entry.get(field), str):
+                    entry = {**entry, field: [entry[field]]}
+            for side in ("left", "right"):
+                if side in entry:
+                    cls._check_side(entry[side], f"requirement {position}: {side}")
+            if entry.get("match", "all") not in ("all", "any"):
+                raise ValueError(f"requirement {position}: match must be \"all\" or \"any\"")
+            if entry.get("level", "gate") not in ("gate", "warn"):
+                raise ValueError(f"requirement {position}: level must be \"gate\" or \"warn\"")
+            for pattern in rule_patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"requirement {position}: invalid pattern {pattern!r}: {e}")
+            
+            index = len(rules)
+            path_ids = [paths.setdefault(path, len(paths)) for path in rule_paths]
+            pattern_ids = [patterns.setdefault(pattern, len(patterns)) for pattern in rule_patterns]
+            for path_id in path_ids:
+                file_patterns, file_rules = files.setdefault(path_id, ([], []))
+                file_patterns.extend(p for p in pattern_ids if p not in file_patterns)
+                file_rules.append(index)
+            args = {k: v for k, v in entry.items() if k not in cls.COMMON_FIELDS and k not in ("path", "paths", "patterns")}
+            rules.append({
+                "type": kind,
+                "category": entry["category"],
+                "name": name,
+                "description": entry["description"],
+                "version": entry.get("version", 1),
+                "level": entry.get("level", "gate"),
+                "paths": path_ids,
+                "patterns": pattern_ids,
+                "args": args,
+                "digest": cls.rule_digest(kind, rule_paths, rule_patterns, args),
+            })
+        
+        return cls({
+            "digest": digest,
+            "paths": list(paths),
+            "patterns": list(patterns),
+            "rules": rules,
+            "files": [[path_id, file_patterns, file_rules] for path_id, (file_patterns, file_rules) in files.items()],
+        })
+    
+    @staticmethod
+    def rule_digest(kind: str, paths: List[str], patterns: List[str], args: Dict) -> str:
+        """Return a hash of everything in a rule that can change its outcome
+        
+        Paths and patterns are hashed by value, not by their table index, so
+        adding an unrelated rule does not change the digest.
+        """
+        canonical = json.dumps([kind, paths, patterns, args], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def _check_side(cls, side, where: str):
+        """Validate one side of a correspondence rule (raises ValueError)"""
+        if not isinstance(side, dict) or "files" not in side:
+            raise ValueError(f"{where} must be an object with \"files\"")
+        unknown = set(side) - cls.SIDE_FIELDS
+        if unknown:
+            raise ValueError(f"{where}: unexpected field(s) {', '.join(sorted(unknown))}")
+        if side.get("key", "path") not in cls.JOIN_KEYS:
+            raise ValueError(f"{where}: key must be one of {', '.join(cls.JOIN_KEYS)}")
+        if side.get("key") == "imported_names" and "module" not in side:
+            raise ValueError(f"{where}: an imported_names key needs a module")
+        try:
+            re.compile(side.get("pattern", ""))
+        except re.error as e:
+            raise ValueError(f"{where}: invalid pattern {side['pattern']!r}: {e}")
+    
+    @classmethod
+    def load(cls, manifest_path: Path, cache_dir: Optional[Path] = None) -> "RequirementPlan":
+        """Return the plan for a manifest file, compiling it only on a cache miss
+        
+        Raises OSError if the manifest cannot be read and ValueError if it is
+        invalid. Failures to read or write the plan cache are not fatal.
+        """
+        raw = manifest_path.read_bytes()
+        digest = hashlib.sha256(f"{PLAN_VERSION}\0".encode("ascii") + raw).hexdigest()
+        plan_path = cache_dir / "plans" / f"{digest}.json" if cache_dir else None
+        if plan_path is not None:
+            try:
+                with open(plan_path, encoding="utf-8") as f:
+                    return cls(json.load(f), cached=True)
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        try:
+            manifest = json.loads(raw.decode("utf-8"))
+        except UnicodeDecodeError as e:
+            raise ValueError(f"not UTF-8: {e}")
+        plan = cls.compile(manifest, digest)
+        if plan_path is not None:
+            try:
+                plan_path.parent.mkdir(parents=True, exist_ok=True)
+                with atomic_writer(plan_path) as f:
+                    json.dump(plan.to_json(), f)
+            except OSError:
+                pass
+        return plan
+    
+    def to_json(self) -> Dict:
+        """Return the plan as stored in the cache"""
+        return {"digest": self.digest, "paths": self.paths, "patterns": self.patterns, "rules": self.rules, "files": self.files}
+    
+    def stats(self) -> Dict:
+        """Return plan counters for the results file"""
+        return {
+            "digest": self.digest[:12],
+            "rules": len(self.rules),
+            "paths": len(self.paths),
+            "patterns": len(self.patterns),
+            "plan_cache": "hit" if self.cached else "miss",
+        }
+
+
+class Requirement:
+    """Represents a single architecture requirement
+    
+    Slotted, since generated rule sets can hold 100k of them.
+    """
+    
+    __slots__ = (
+        "category", "name", "description", "file_path", "component_check", "version", "cacheable", "tree_wide", "rule_digest", "gating", "indexes",
+        "status", "found", "details", "started", "wall_time", "bytes_read", "files_touched", "thread", "inputs", "payload",
+    )
+    
+    def __init__(self, category: str, name: str, description: str, file_path: str = None, component_check: callable = None, inputs: Iterable[str] = (), version: int = 1, cacheable: bool = True, tree_wide: bool = False):
+        self.category = category
+        self.name = name
+        self.description = description
+        self.file_path = file_path
+        self.component_check = component_check
+        # Bump when the check's logic changes so cached outcomes are discarded
+        self.version = version
+        # False when the outcome depends on more than the input files (e.g. a live server)
+        self.cacheable = cacheable
+        # True when any added, deleted or edited path can change the outcome (e.g. link targets)
+        self.tree_wide = tree_wide
+        # Hash of the manifest rule the requirement was compiled from ("" for code-defined ones)
+        self.rule_digest = ""
+        # False for warn-level requirements, whose failures are reported as WARN and never fail the run
+        self.gating = True
+        # Names of the QASystem indexes the check reads (e.g. "symbols")
+        self.indexes: Tuple[str, ...] = ()
+        self.status = "RED"
+        self.found = False
+        self.details = ""
+        # Cost of the last evaluation (seconds since QASystem start, seconds, bytes, files)
+        self.started = 0.0
+        self.wall_time = 0.0
+        self.bytes_read = 0
+        self.files_touched = 0
+        self.thread = 0
+        # Every path (file or directory) the requirement's outcome depends on
+        self.inputs: List[str] = []
+        for path in ([file_path] if file_path else []) + list(inputs):
+            if path not in self.inputs:
+                self.inputs.append(path)
+        # Results sections the last evaluation recorded (e.g. {"broken_links": [...]}),
+        # gathered into the results in declaration order by aggregate_results
+        self.payload: Dict[str, object] = {}
+    
+    def settle(self, status: str) -> str:
+        """Map a check outcome to the reported status (WARN for a failed warn-level requirement)"""
+        if not self.gating and status not in ("GREEN", "SKIPPED"):
+            return "WARN"
+        return status
+    
+    def touches(self, changed_paths: Set[str]) -> bool:
+        """Check if any changed path is one of this requirement's inputs
+        
+        A ``tree_wide`` requirement is touched by every change.
+        """
+        if self.tree_wide and changed_paths:
+            return True
+        for path in changed_paths:
+            for input_path in self.inputs:
+                if path == input_path or path.startswith(input_path.rstrip("/") + "/"):
+                    return True
+        return False
@@ -0,0 +1,185 @@
+"""
+PartPulse QA System - Prisma Schema
+Parses prisma/schema.prisma into models and fields
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PrismaField:
+    """A single field of a Prisma model"""
+    
+    def __init__(self, name: str, type_name: str, optional: bool, is_list: bool, attributes: Dict[str, str]):
+        self.name = name
+        self.type = type_name
+        self.optional = optional
+        self.is_list = is_list
+        # Attribute name (without "@") -> raw argument text
+        self.attributes = attributes
+        # Model this scalar field points at through an @relation(fields: [...])
+        self.relates_to: Optional[str] = None
+
+
+class PrismaModel:
+    """A Prisma model with its fields and block attributes"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.fields: Dict[str, PrismaField] = {}
+        self.indexes: Set[Tuple[str, ...]] = set()
+        self.unique: Set[Tuple[str, ...]] = set()
+        self.primary_key: Optional[Tuple[str, ...]] = None
+        self.map: Optional[str] = None
+
+
+class PrismaSchema:
+    """In-memory index of models, fields, attributes, indexes and relations
+    
+    Parsed once from the schema text; every query afterwards is a dictionary
+    or set lookup.
+    """
+    
+    _BLOCK = re.compile(r"^\s*(model|enum|view|type)\s+(\w+)\s*\{(.*?)^\s*\}", re.MULTILINE | re.DOTALL)
+    _FIELD = re.compile(r"^(\w+)\s+(\w+)(\[\])?(\?)?\s*(.*)$")
+    _ATTRIBUTE = re.compile(r"@(\w+(?:\.\w+)?)")
+    _FIELD_LIST = re.compile(r"\[([^\]]*)\]")
+    
+    def __init__(self):
+        self.models: Dict[str, PrismaModel] = {}
+        self.enums: Dict[str, List[str]] = {}
+    
+    @classmethod
+    def parse(cls, text: str) -> "PrismaSchema":
+        """Parse schema source into an index"""
+        schema = cls()
+        text = "\n".join(cls._strip_comment(line) for line in text.splitlines())
+        for match in cls._BLOCK.finditer(text):
+            kind, name, body = match.groups()
+            lines = [line.strip() for line in body.splitlines() if line.strip()]
+            if kind == "enum":
+                schema.enums[name] = [line.split()[0] for line in lines if not line.startswith("@@")]
+            elif kind in ("model", "view"):
+                schema.models[name] = cls._parse_model(name, lines)
+        
+        # Resolve relation scalar fields to their target models
+        for model in schema.models.values():
+            for field in model.fields.values():
+                relation = field.attributes.get("relation")
+                if relation is None or field.type not in schema.models:
+                    continue
+                for scalar in cls._named_list(relation, "fields"):
+                    if scalar in model.fields:
+                        model.fields[scalar].relates_to = field.type
+        return schema
+    
+    @staticmethod
+    def _strip_comment(line: str) -> str:
+        """Remove a // comment that is not inside a string literal"""
+        in_string = False
+        for i, char in enumerate(line):
+            if char == '"' and (i == 0 or line[i - 1] != "\\"):
+                in_string = not in_string
+            elif char == "/" and not in_string and line[i:i + 2] == "//":
+                return line[:i]
+        return line
+    
+    @classmethod
+    def _parse_model(cls, name: str, lines: List[str]) -> PrismaModel:
+        """Parse the body lines of a model block"""
+        model = PrismaModel(name)
+        for line in lines:
+            if line.startswith("@@"):
+                attribute, args = cls._split_attributes(line[1:])[0]
+                fields = cls._first_list(args)
+                if attribute == "index":
+                    model.indexes.add(fields)
+                elif attribute == "unique":
+                    model.unique.add(fields)
+                elif attribute == "id":
+                    model.primary_key = fields
+                elif attribute == "map":
+                    model.map = args.strip().strip('"')
+                continue
+            
+            match = cls._FIELD.match(line)
+            if not match:
+                continue
+            field_name, type_name, is_list, optional, rest = match.groups()
+            attributes = dict(cls._split_attributes(rest))
+            field = PrismaField(field_name, type_name, bool(optional), bool(is_list), attributes)
+            model.fields[field_name] = field
+            if "id" in attributes:
+                model.primary_key = (field_name,)
+            if "unique" in attributes:
+                model.unique.add((field_name,))
+        return model
+    
+    @classmethod
+    def _split_attributes(cls, text: str) -> List[Tuple[str, str]]:
+        """Split "@a @b(x, (y))" into [("a", ""), ("b", "x, (y)")]"""
+        attributes = []
+        pos = 0
+        while True:
+            match = cls._ATTRIBUTE.search(text, pos)
+            if not match:
+                return attributes
+            name, pos, args = match.group(1), match.end(), ""
+            if text[pos:pos + 1] == "(":
+                depth, start = 0, pos
+                for pos in range(start, len(text)):
+                    if text[pos] == "(":
+                        depth += 1
+                    elif text[pos] == ")":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                args = text[start + 1:pos]
+                pos += 1
+            attributes.append((name, args))
+    
+    @classmethod
+    def _first_list(cls, args: str) -> Tuple[str, ...]:
+        """Return the field names of the first [..] list, without sort/length modifiers"""
+        match = cls._FIELD_LIST.search(args)
+        if not match:
+            return ()
+        return tuple(item.split("(")[0].strip() for item in match.group(1).split(",") if item.strip())
+    
+    @classmethod
+    def _named_list(cls, args: str, name: str) -> Tuple[str, ...]:
+        """Return the field names of a named list argument such as fields: [...]"""
+        match = re.search(rf"\b{name}\s*:\s*(\[[^\]]*\])", args)
+        return cls._first_list(match.group(1)) if match else ()
+    
+    def has_model(self, name: str) -> bool:
+        """Check if a model is defined"""
+        return name in self.models
+    
+    def field(self, model: str, name: str) -> Optional[PrismaField]:
+        """Return a model field, or None"""
+        return self.models[model].fields.get(name) if model in self.models else None
+    
+    def has_index(self, model: str, fields: Iterable[str]) -> bool:
+        """Check for an @@index (or unique/primary key) whose leading columns are ``fields``"""
+        if model not in self.models:
+            return False
+        fields = tuple(fields)
+        target = self.models[model]
+        keys = target.indexes | target.unique | ({target.primary_key} if target.primary_key else set())
+        return any(key[:len(fields)] == fields for key in keys)
+    
+    def is_unique(self, model: str, fields: Iterable[str]) -> bool:
+        """Check if exactly these fields carry a unique constraint or primary key"""
+        if model not in self.models:
+            return False
+        fields = tuple(fields)
+        target = self.models[model]
+        return fields in target.unique or fields == target.primary_key
+    
+    def relation_target(self, model: str, field: str) -> Optional[str]:
+        """Return the model a field relates to (relation or foreign-key field)"""
+        target = self.field(model, field)
+        if target is None:
+            return None
+        return target.relates_to or (target.type if target.type in self.models else None)
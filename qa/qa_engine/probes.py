@@ -0,0 +1,232 @@
+"""
+PartPulse QA System - Route Probes
+Asyncio HTTP probes of the API routes
+"""
+
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .constants import PROBE_CONCURRENCY, PROBE_REPEAT, PROBE_TIMEOUT
+
+
+class RouteProbe:
+    """One configured HTTP request against an API route"""
+    
+    def __init__(self, method: str, path: str, expect: Optional[Iterable[int]] = None, body: Optional[str] = None, headers: Optional[Dict[str, str]] = None, source: Optional[str] = None):
+        self.method = method.upper()
+        self.path = path
+        # Accepted status codes; None accepts anything below 500
+        self.expect = set(expect) if expect else None
+        self.body = body.encode("utf-8") if body is not None else b""
+        self.headers = headers or {}
+        # Route handler file, used as the requirement's input
+        self.source = source
+        self.statuses: List[int] = []
+        self.latencies: List[float] = []
+        self.errors: List[str] = []
+    
+    @property
+    def label(self) -> str:
+        """Return "METHOD /path" """
+        return f"{self.method} {self.path}"
+    
+    def accepts(self, status: int) -> bool:
+        """Check if a response status meets the expectation"""
+        return status in self.expect if self.expect else status < 500
+    
+    def percentile(self, fraction: float) -> float:
+        """Return a latency percentile in milliseconds (nearest rank)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * fraction // 1))
+        return ordered[int(rank) - 1] * 1000
+    
+    def summary(self) -> Dict:
+        """Return status counts and latency percentiles for the results file"""
+        codes: Dict[str, int] = {}
+        for status in self.statuses:
+            codes[str(status)] = codes.get(str(status), 0) + 1
+        return {
+            "status_codes": codes,
+            "errors": len(self.errors),
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+        }
+
+
+class HTTPProber:
+    """Sends route probes concurrently over a small pool of keep-alive connections
+    
+    At most ``concurrency`` requests are in flight, each on its own pooled
+    HTTP/1.1 connection, and every request is bounded by ``timeout``.
+    """
+    
+    def __init__(self, base_url: str, concurrency: int = PROBE_CONCURRENCY, timeout: float = PROBE_TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Unsupported probe URL: {base_url}")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.prefix = url.path.rstrip("/")
+        self.host_header = url.netloc
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.connections = 0
+        self.requests = 0
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    
+    async def run(self, probes: List[RouteProbe], repeat: int = PROBE_REPEAT):
+        """Send every probe ``repeat`` times, recording statuses, latencies and errors"""
+        limit = asyncio.Semaphore(self.concurrency)
+        
+        async def one(probe: RouteProbe):
+            async with limit:
+                await self._probe(probe)
+        
+        try:
+            await asyncio.gather(*(one(probe) for probe in probes for _ in range(repeat)))
+        finally:
+            for _, writer in self._idle:
+                writer.close()
+            self._idle.clear()
+    
+    async def _probe(self, probe: RouteProbe):
+        """Send one request on a pooled connection"""
+        started = time.perf_counter()
+        connection = None
+        try:
+            connection = self._idle.pop() if self._idle else await asyncio.wait_for(self._connect(), self.timeout)
+            status, reusable = await asyncio.wait_for(self._exchange(connection, probe), self.timeout)
+        except asyncio.TimeoutError:
+            probe.errors.append(f"timeout after {self.timeout:g}s")
+            reusable = False
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            probe.errors.append(str(e) or type(e).__name__)
+            reusable = False
+        else:
+            probe.statuses.append(status)
+            probe.latencies.append(time.perf_counter() - started)
+        finally:
+            self.requests += 1
+        if connection is not None:
+            if reusable:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+    
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new connection for the pool"""
+        connection = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.connections += 1
+        return connection
+    
+    async def _exchange(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter], probe: RouteProbe) -> Tuple[int, bool]:
+        """Write a request and read the full response; returns (status, keep-alive)"""
+        reader, writer = connection
+        headers = {
+            "Host": self.host_header,
+            "User-Agent": "partpulse-qa",
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+            "Content-Length": str(len(probe.body)),
+            **probe.headers,
+        }
+        head = f"{probe.method} {self.prefix}{probe.path} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + probe.body)
+        await writer.drain()
+        
+        status_line = (await reader.readline()).decode("latin-1").split()
+        if len(status_line) < 2 or not status_line[0].startswith("HTTP/"):
+            raise ValueError("malformed response")
+        status = int(status_line[1])
+        response_headers = await self._read_headers(reader)
+        
+        keep_alive = response_headers.get("connection", "").lower() != "close"
+        if probe.method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    await self._read_headers(reader)
+                    break
+                await reader.readexactly(size + 2)
+        elif "content-length" in response_headers:
+            await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            # Body delimited by connection close
+            await reader.read()
+            keep_alive = False
+        return status, keep_alive
+    
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        """Read header lines up to the blank line"""
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+            if not line:
+                return headers
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+
+class ProbeStubServer:
+    """Minimal keep-alive HTTP server on localhost standing in for the app
+    
+    Answers 200 with a small JSON body for every probed route and 404 for
+    anything else, so the prober can be exercised without starting Next.js.
+    """
+    
+    def __init__(self, routes: Iterable[str]):
+        self.routes = set(routes)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+    
+    async def start(self) -> str:
+        """Start listening on an ephemeral port and return the base URL"""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+    
+    async def stop(self):
+        """Stop the server once the open connections have been served"""
+        if self._server is not None:
+            self._server.close()
+            if self._handlers:
+                # Clients have closed their connections by now; let handlers see EOF
+                _, pending = await asyncio.wait(self._handlers, timeout=1.0)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            await self._server.wait_closed()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = (await reader.readline()).decode("latin-1").split()
+                if len(request_line) < 2:
+                    break
+                headers = await HTTPProber._read_headers(reader)
+                await reader.readexactly(int(headers.get("content-length", "0") or 0))
+                found = request_line[1].split("?")[0] in self.routes
+                body = b'{"status":"ok"}' if found else b'{"error":"not found"}'
+                writer.write(
+                    f"HTTP/1.1 {'200 OK' if found else '404 Not Found'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
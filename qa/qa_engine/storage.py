@@ -0,0 +1,636 @@
+"""
+PartPulse QA System - Storage
+Tree backends, the file index and the per-run and persistent caches
+"""
+
+import os
+import json
+import re
+import hashlib
+import itertools
+import mmap
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .constants import CACHE_MAX_BYTES, CHECKER_VERSION, MMAP_MIN_BYTES, PRUNED_DIRS
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[TextIO]:
+    """Open a temporary file next to ``path`` and rename it into place on success"""
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yield f
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class ContentUnavailable(Exception):
+    """A content check could not inspect its file; ``status`` is UNREADABLE or TOO_LARGE"""
+    
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class WorkingTreeStorage:
+    """Reads project files from the working tree below ``root``"""
+    
+    def __init__(self, root: Path):
+        self.root = root
+    
+    def describe(self) -> Optional[Dict[str, str]]:
+        """Return the source recorded in the results file (None for the working tree)"""
+        return None
+    
+    def entries(self) -> Optional[List[Tuple[str, str]]]:
+        """Return (path, kind) for the whole tree, or None to let the index walk it"""
+        return None
+    
+    def kind(self, rel_path: str) -> Optional[str]:
+        """Return "file", "dir" or None"""
+        full_path = self.root / rel_path
+        if full_path.is_file():
+            return "file"
+        if full_path.is_dir():
+            return "dir"
+        return None
+    
+    def read_bytes(self, rel_path: str) -> bytes:
+        """Return a file's contents (raises OSError)"""
+        return (self.root / rel_path).read_bytes()
+    
+    def size(self, rel_path: str) -> int:
+        """Return a file's size in bytes (raises OSError)"""
+        return (self.root / rel_path).stat().st_size
+    
+    @contextmanager
+    def open_buffer(self, rel_path: str) -> Iterator[bytes]:
+        """Memory-map a file read-only (raises OSError)"""
+        with open(self.root / rel_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+    
+    def close(self):
+        """Release storage resources"""
+
+
+class GitTreeStorage:
+    """Reads project files from a commit's tree without checking it out
+    
+    The path set comes from a single ``git ls-tree`` listing and file
+    contents are streamed through one long-lived ``git cat-file --batch``
+    process shared by all checker threads.
+    """
+    
+    def __init__(self, root: Path, ref: str):
+        self.root = root
+        self.ref = ref
+        self.commit = self._git("rev-parse", "--verify", "--end-of-options", f"{ref}^{{commit}}").strip()
+        self._kinds: Dict[str, str] = {}
+        self._blobs: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+        # Paths are listed relative to root, so a project in a subdirectory works too
+        for record in self._git("ls-tree", "-r", "-t", "-l", "-z", self.commit).split("\0"):
+            if not record:
+                continue
+            meta, path = record.split("\t", 1)
+            _, object_type, sha, size = meta.split()
+            if object_type == "blob":
+                self._kinds[path] = "file"
+                self._blobs[path] = sha
+                self._sizes[path] = int(size)
+            else:
+                # Trees, and submodules (which have no readable contents here)
+                self._kinds[path] = "dir"
+        self._process: Optional[subprocess.Popen] = None
+        self._owner = 0
+        self._lock = threading.Lock()
+    
+    def _git(self, *args: str) -> str:
+        """Run a git command in root and return its output (raises CalledProcessError)"""
+        result = subprocess.run(["git", *args], cwd=self.root, capture_output=True, check=True)
+        return result.stdout.decode("utf-8")
+    
+    def describe(self) -> Optional[Dict[str, str]]:
+        """Return the source recorded in the results file"""
+        return {"ref": self.ref, "commit": self.commit}
+    
+    def entries(self) -> Optional[List[Tuple[str, str]]]:
+        """Return (path, kind) for every entry of the commit's tree"""
+        return list(self._kinds.items())
+    
+    def kind(self, rel_path: str) -> Optional[str]:
+        """Return "file", "dir" or None"""
+        rel_path = rel_path.strip("/")
+        return "dir" if not rel_path else self._kinds.get(rel_path)
+    
+    def read_bytes(self, rel_path: str) -> bytes:
+        """Return a blob's contents through the batch process (raises OSError)"""
+        sha = self._blobs.get(rel_path)
+        if sha is None:
+            raise FileNotFoundError(f"{rel_path} not in {self.ref}")
+        with self._lock:
+            if self._process is None or self._owner != os.getpid():
+                # A forked check worker must not share its parent's pipes
+                self._process = subprocess.Popen(
+                    ["git", "cat-file", "--batch"], cwd=self.root,
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE
+                )
+                self._owner = os.getpid()
+            self._process.stdin.write(f"{sha}\n".encode("ascii"))
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().decode("ascii").split()
+            if len(header) != 3:
+                raise OSError(f"git cat-file failed for {rel_path}: {' '.join(header) or 'no output'}")
+            size = int(header[2])
+            data = self._process.stdout.read(size)
+            # Each object is followed by a newline
+            self._process.stdout.read(1)
+        return data
+    
+    def size(self, rel_path: str) -> int:
+        """Return a blob's size from the tree listing (raises OSError)"""
+        if rel_path not in self._sizes:
+            raise FileNotFoundError(f"{rel_path} not in {self.ref}")
+        return self._sizes[rel_path]
+    
+    @contextmanager
+    def open_buffer(self, rel_path: str) -> Iterator[bytes]:
+        """Yield a blob's contents (blobs cannot be mapped, so this reads them)"""
+        yield self.read_bytes(rel_path)
+    
+    def close(self):
+        """Stop the batch process"""
+        with self._lock:
+            if self._process is not None and self._owner == os.getpid():
+                self._process.stdin.close()
+                self._process.wait()
+                self._process = None
+
+
+class FileIndex:
+    """In-memory index of the project tree built by a single os.scandir walk
+    
+    Existence and type queries are dictionary lookups. In exact mode a path
+    only matches with its exact casing; in case-insensitive mode a path
+    resolves to the indexed spelling. Either way ``case_variants`` reports
+    paths that differ only by case so mismatches can be surfaced.
+    
+    When ``entries`` are given (e.g. a git tree listing), they are indexed
+    instead of walking ``root``.
+    """
+    
+    def __init__(self, root: Path, case_sensitive: bool = True, pruned: Iterable[str] = PRUNED_DIRS, entries: Optional[Iterable[Tuple[str, str]]] = None):
+        self.root = root
+        self.case_sensitive = case_sensitive
+        self.pruned = set(pruned)
+        self._kinds: Dict[str, str] = {}
+        self._folded: Dict[str, List[str]] = {}
+        self.pruned_dirs = 0
+        if entries is None:
+            self._walk()
+        else:
+            for rel_path, kind in entries:
+                if self.covers(rel_path):
+                    self._add(rel_path, kind)
+                elif kind == "dir" and rel_path.rsplit("/", 1)[-1] in self.pruned:
+                    self.pruned_dirs += 1
+    
+    def _walk(self, start: str = ""):
+        """Index every file and directory below ``start`` (the root by default)"""
+        stack = [start]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = list(os.scandir(self.root / rel_dir if rel_dir else self.root))
+            except OSError:
+                continue
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in self.pruned:
+                            self.pruned_dirs += 1
+                            continue
+                        self._add(rel_path, "dir")
+                        stack.append(rel_path)
+                    elif entry.is_file():
+                        self._add(rel_path, "file")
+                    elif entry.is_dir():
+                        # Symlinked directories are indexed but not descended into
+                        self._add(rel_path, "dir")
+                except OSError:
+                    continue
+    
+    def _add(self, rel_path: str, kind: str):
+        """Record a path"""
+        self._kinds[rel_path] = kind
+        self._folded.setdefault(rel_path.lower(), []).append(rel_path)
+    
+    def _discard(self, rel_path: str):
+        """Forget a path and everything below it"""
+        prefix = rel_path + "/"
+        for path in [p for p in self._kinds if p == rel_path or p.startswith(prefix)]:
+            del self._kinds[path]
+            variants = self._folded[path.lower()]
+            variants.remove(path)
+            if not variants:
+                del self._folded[path.lower()]
+    
+    def refresh(self, paths: Iterable[str]):
+        """Re-stat changed paths (and re-walk changed directories) in place"""
+        for rel_path in paths:
+            if not rel_path or not self.covers(rel_path):
+                continue
+            self._discard(rel_path)
+            full_path = self.root / rel_path
+            kind = "dir" if full_path.is_dir() else "file" if full_path.is_file() else None
+            if kind is None:
+                continue
+            parts = rel_path.split("/")
+            for depth in range(1, len(parts)):
+                parent = "/".join(parts[:depth])
+                if parent not in self._kinds:
+                    self._add(parent, "dir")
+            self._add(rel_path, kind)
+            if kind == "dir":
+                self._walk(rel_path)
+    
+    def covers(self, rel_path: str) -> bool:
+        """Check if the path lies in the indexed part of the tree"""
+        return not any(part in self.pruned for part in rel_path.split("/"))
+    
+    def resolve(self, rel_path: str) -> Optional[str]:
+        """Return the indexed spelling of a path, or None if it is not present"""
+        if rel_path in self._kinds:
+            return rel_path
+        if not self.case_sensitive:
+            variants = self._folded.get(rel_path.lower())
+            if variants:
+                return variants[0]
+        return None
+    
+    def kind(self, rel_path: str) -> Optional[str]:
+        """Return "file", "dir" or None"""
+        resolved = self.resolve(rel_path)
+        return self._kinds[resolved] if resolved else None
+    
+    def files(self, prefix: str = "", suffixes: Tuple[str, ...] = ()) -> List[str]:
+        """Return indexed files below ``prefix`` (ending in one of ``suffixes``), sorted"""
+        start = prefix.rstrip("/") + "/" if prefix else ""
+        return sorted(
+            path for path, kind in self._kinds.items()
+            if kind == "file" and path.startswith(start) and (not suffixes or path.endswith(suffixes))
+        )
+    
+    def glob(self, pattern: str) -> List[str]:
+        """Return indexed files matching a glob, sorted
+        
+        ``*`` and ``?`` stay within one path segment and ``**/`` spans any
+        number of directories. Brackets are literal, as in Next.js route
+        segments such as ``[id]``.
+        """
+        parts = pattern.split("/")
+        base = "/".join(itertools.takewhile(lambda part: "*" not in part and "?" not in part, parts))
+        if base == pattern:
+            return [pattern] if self.kind(pattern) == "file" else []
+        regex = re.compile("".join(
+            "(?:.*/)?" if token == "**/" else "[^/]*" if token == "*" else "[^/]" if token == "?" else re.escape(token)
+            for token in re.split(r"(\*\*/|\*|\?)", pattern) if token
+        ) + "$")
+        return [path for path in self.files(base) if regex.match(path)]
+    
+    def case_variants(self, rel_path: str) -> List[str]:
+        """Return indexed paths equal to ``rel_path`` ignoring case, other than itself"""
+        return [p for p in self._folded.get(rel_path.lower(), []) if p != rel_path]
+    
+    def stats(self) -> Dict:
+        """Return index counters for the results file"""
+        return {
+            "entries": len(self._kinds),
+            "files": sum(1 for kind in self._kinds.values() if kind == "file"),
+            "pruned_dirs": self.pruned_dirs,
+            "case_sensitive": self.case_sensitive,
+        }
+
+
+class FileSnapshotCache:
+    """Per-run snapshot of file metadata and contents
+    
+    Every path is stat'ed at most once and every file is read, hashed and
+    decoded at most once per run; all checks are then served from memory.
+    Lookups are safe to share between checker threads. When a ``FileIndex``
+    is given, existence queries it covers never touch the storage.
+    """
+    
+    def __init__(self, root: Path, index: Optional[FileIndex] = None, storage=None):
+        self.root = root
+        self.index = index
+        self.storage = storage or WorkingTreeStorage(root)
+        self.hits = 0
+        self.misses = 0
+        self.stat_hits = 0
+        self.stat_misses = 0
+        self._kinds: Dict[str, Optional[str]] = {}
+        self._texts: Dict[str, Optional[str]] = {}
+        self._digests: Dict[str, str] = {}
+        # Directory -> digest of every file below it
+        self._tree_digests: Dict[str, str] = {}
+        self._sizes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._trace = threading.local()
+    
+    def begin_trace(self):
+        """Start attributing I/O on the calling thread to one requirement"""
+        self._trace.paths = set()
+        self._trace.bytes_read = 0
+    
+    def end_trace(self) -> Tuple[int, int]:
+        """Stop attributing I/O and return (bytes read from disk, files touched)"""
+        paths = getattr(self._trace, "paths", None)
+        if paths is None:
+            return 0, 0
+        bytes_read = self._trace.bytes_read
+        self._trace.paths = None
+        return bytes_read, len(paths)
+    
+    def _note(self, rel_path: str, bytes_read: int = 0):
+        """Record an access for the requirement being traced on this thread"""
+        paths = getattr(self._trace, "paths", None)
+        if paths is not None:
+            paths.add(rel_path)
+            self._trace.bytes_read += bytes_read
+    
+    def _path_lock(self, rel_path: str) -> threading.Lock:
+        """Return the lock serialising loads of a single path"""
+        with self._lock:
+            return self._path_locks.setdefault(rel_path, threading.Lock())
+    
+    def kind(self, rel_path: str) -> Optional[str]:
+        """Return "file", "dir" or None for a path relative to the root"""
+        self._note(rel_path)
+        if self.index is not None and self.index.covers(rel_path):
+            return self.index.kind(rel_path)
+        with self._path_lock(rel_path):
+            with self._lock:
+                if rel_path in self._kinds:
+                    self.stat_hits += 1
+                    return self._kinds[rel_path]
+                self.stat_misses += 1
+            kind = self.storage.kind(rel_path)
+            with self._lock:
+                self._kinds[rel_path] = kind
+            return kind
+    
+    def invalidate(self, paths: Iterable[str]):
+        """Drop everything cached about the given paths and their descendants
+        
+        Directory digests are also dropped for every ancestor of a path.
+        """
+        exact = set(paths)
+        prefixes = tuple(path.rstrip("/") + "/" for path in exact)
+        with self._lock:
+            for cache in (self._kinds, self._texts, self._digests, self._sizes):
+                for path in [p for p in cache if p in exact or p.startswith(prefixes)]:
+                    del cache[path]
+            for tree in list(self._tree_digests):
+                below = tree.rstrip("/") + "/" if tree else ""
+                if tree in exact or tree.startswith(prefixes) or any(path.startswith(below) for path in exact):
+                    del self._tree_digests[tree]
+    
+    def is_file(self, rel_path: str) -> bool:
+        """Check if the path is a regular file"""
+        return self.kind(rel_path) == "file"
+    
+    def is_dir(self, rel_path: str) -> bool:
+        """Check if the path is a directory"""
+        return self.kind(rel_path) == "dir"
+    
+    def _disk_path(self, rel_path: str) -> str:
+        """Return the stored spelling of a path"""
+        if self.index is not None and self.index.covers(rel_path):
+            return self.index.resolve(rel_path) or rel_path
+        return rel_path
+    
+    def size(self, rel_path: str) -> Optional[int]:
+        """Return a file's size in bytes (stat'ed once), or None if unreadable"""
+        with self._lock:
+            if rel_path in self._sizes:
+                return self._sizes[rel_path]
+        try:
+            size = self.storage.size(self._disk_path(rel_path))
+        except OSError:
+            size = None
+        with self._lock:
+            self._sizes[rel_path] = size
+        return size
+    
+    @contextmanager
+    def buffer(self, rel_path: str) -> Iterator[bytes]:
+        """Yield a read-only view of a file without decoding it (raises OSError)"""
+        with self.storage.open_buffer(self._disk_path(rel_path)) as buffer:
+            self._note(rel_path, len(buffer))
+            yield buffer
+    
+    def _load(self, rel_path: str):
+        """Read, hash and decode a file once
+        
+        Files of at least MMAP_MIN_BYTES are hashed through a mapped buffer
+        and their text is not kept; ``read_text`` decodes them on demand.
+        """
+        with self._path_lock(rel_path):
+            with self._lock:
+                if rel_path in self._digests:
+                    self.hits += 1
+                    return
+                self.misses += 1
+            size = self.size(rel_path)
+            if size is not None and size >= MMAP_MIN_BYTES:
+                try:
+                    with self.buffer(rel_path) as buffer:
+                        digest = hashlib.sha256(buffer).hexdigest()
+                except (OSError, ValueError):
+                    digest = "unreadable"
+                with self._lock:
+                    self._digests[rel_path] = digest
+                return
+            try:
+                data = self.storage.read_bytes(self._disk_path(rel_path))
+            except OSError:
+                data = None
+            if data is None:
+                digest, text = "unreadable", None
+            else:
+                self._note(rel_path, len(data))
+                digest = hashlib.sha256(data).hexdigest()
+                try:
+                    text = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = None
+            with self._lock:
+                self._texts[rel_path] = text
+                self._digests[rel_path] = digest
+    
+    def read_text(self, rel_path: str) -> Optional[str]:
+        """Return the decoded file contents, or None if missing or unreadable"""
+        if self.kind(rel_path) != "file":
+            return None
+        self._load(rel_path)
+        if rel_path not in self._texts:
+            try:
+                with self.buffer(rel_path) as buffer:
+                    return bytes(buffer).decode("utf-8")
+            except (OSError, ValueError):
+                return None
+        return self._texts[rel_path]
+    
+    def digest(self, rel_path: str) -> str:
+        """Return the SHA-256 of a file, or a marker for directories and missing paths
+        
+        With a ``FileIndex``, a directory's digest covers the path and digest
+        of every file below it, so tree-wide inputs invalidate on any change.
+        It is computed once per snapshot, until ``invalidate`` drops it.
+        """
+        kind = self.kind(rel_path)
+        if kind == "dir" and self.index is not None and self.index.covers(rel_path):
+            with self._lock:
+                if rel_path in self._tree_digests:
+                    return self._tree_digests[rel_path]
+            tree = hashlib.sha256()
+            for path in self.index.files(rel_path):
+                tree.update(f"{path}\0{self.digest(path)}\n".encode("utf-8"))
+            digest = f"dir:{tree.hexdigest()}"
+            with self._lock:
+                self._tree_digests[rel_path] = digest
+            return digest
+        if kind != "file":
+            return kind or "missing"
+        self._load(rel_path)
+        return self._digests[rel_path]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the results file"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stat_hits": self.stat_hits,
+            "stat_misses": self.stat_misses,
+            "files_read": len(self._digests),
+        }
+
+
+class ResultCache:
+    """Content-addressed store of requirement outcomes shared across runs
+    
+    Entries are small JSON files keyed by a hash of the requirement identity,
+    its check version, the manifest rule it came from and the digests of all
+    its inputs, so the directory can be restored on any machine. Total size
+    is bounded by evicting the least recently used entries (by mtime,
+    refreshed on every hit).
+    """
+    
+    def __init__(self, cache_dir: Path, max_bytes: int = CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def key(self, req: "Requirement", snapshot: FileSnapshotCache) -> str:
+        """Return the cache key for a requirement given the current input contents"""
+        material = json.dumps([
+            CHECKER_VERSION,
+            req.category,
+            req.name,
+            req.version,
+            req.rule_digest,
+            [[path, snapshot.digest(path)] for path in req.inputs],
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        """Return the entry file for a key"""
+        return self.cache_dir / "results" / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Tuple[bool, str]]:
+        """Return a cached (found, details) outcome, or None on a miss"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry["found"], entry["details"]
+    
+    def put(self, key: str, found: bool, details: str):
+        """Store an outcome; failures to write are not fatal"""
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"found": found, "details": details}, f)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            return
+        with self._lock:
+            self.stores += 1
+    
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry_path in (self.cache_dir / "results").glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total += stat.st_size
+        
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters for the results file"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
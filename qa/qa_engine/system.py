@@ -0,0 +1,1344 @@
+"""
+PartPulse QA System - Engine
+Loads requirements, runs checks and writes the reports
+"""
+
+import io
+import json
+import re
+import hashlib
+import itertools
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from .constants import (
+    CHECK_TIMEOUT, CONTENT_MAX_BYTES, CRITICAL_CATEGORIES, IMPORT_ROOTS, MANIFEST_FILE,
+    MMAP_MIN_BYTES, PRISMA_SCHEMA, PROBE_CONCURRENCY, PROBE_REPEAT, PROBE_TIMEOUT, PROJECT_ROOT,
+    STATUS_ICONS, SYMBOL_ROOTS, TSCONFIG,
+)
+from .storage import (
+    ContentUnavailable, FileIndex, FileSnapshotCache, ResultCache, WorkingTreeStorage,
+    atomic_writer,
+)
+from .indexes import ImportGraph, MarkdownLinkIndex, SymbolIndex, module_matches
+from .prisma import PrismaSchema
+from .plan import Requirement, RequirementPlan
+from .probes import HTTPProber, ProbeStubServer, RouteProbe
+from .patterns import PatternEngine
+from .workers import CheckWorkerPool
+
+
+class QASystem:
+    """Main QA validation system"""
+    
+    # Results sections filled per requirement name from each requirement's
+    # payload; shards carry the payload with each requirement's record
+    CHECK_SECTIONS = ("broken_links", "unmatched")
+    # Run-wide sections every shard computes alike; merge keeps the first shard's
+    SHARED_SECTIONS = ("source", "manifest", "risky_patterns", "fail_fast", "run_timeout", "probes")
+    # Index counters describe the tree, so they come from any shard that built the index
+    INDEX_SECTIONS = ("file_index", "symbol_index", "import_graph", "markdown_links")
+    # Cost counters summed over the shards, by section; the other fields of
+    # these sections (e.g. registered patterns) are the same in every shard
+    COST_COUNTERS = {
+        "snapshot_cache": ("hits", "misses", "stat_hits", "stat_misses", "files_read"),
+        "pattern_engine": ("scans",),
+        "result_cache": ("hits", "misses", "stores", "evictions"),
+    }
+    # Status -> slot of the category tallies; any other status counts as failed (2)
+    TALLY_SLOTS = {"GREEN": 1, "SKIPPED": 3, "WARN": 4}
+    
+    def __init__(self, root: Path = PROJECT_ROOT, result_cache: Optional[ResultCache] = None, case_sensitive: bool = True, storage=None, output_dir: Optional[Path] = None, max_content_bytes: int = CONTENT_MAX_BYTES, manifest_path: Optional[Path] = None):
+        self.root = root
+        self.manifest_path = manifest_path or root / MANIFEST_FILE
+        self.max_content_bytes = max_content_bytes
+        self.storage = storage or WorkingTreeStorage(root)
+        self.output_dir = output_dir or root / "qa"
+        self.index = FileIndex(root, case_sensitive, entries=self.storage.entries())
+        self.snapshot = FileSnapshotCache(root, self.index, self.storage)
+        self.patterns = PatternEngine()
+        self.result_cache = result_cache
+        self.critical_categories = set(CRITICAL_CATEGORIES)
+        self._prisma: Optional[PrismaSchema] = None
+        self._prisma_lock = threading.Lock()
+        self._symbols: Optional[SymbolIndex] = None
+        self._symbols_stale = True
+        self._symbols_lock = threading.Lock()
+        self._imports: Optional[ImportGraph] = None
+        self._imports_stale = True
+        self._imports_lock = threading.Lock()
+        self._links: Optional[MarkdownLinkIndex] = None
+        self._links_lock = threading.Lock()
+        self.epoch = time.perf_counter()
+        self.spans: Dict[str, Tuple[float, float]] = {}
+        self.probes: List[RouteProbe] = []
+        self.requirements: List[Requirement] = []
+        # Category -> [total, passed, failed, skipped, warnings], in first-seen
+        # order, kept current as outcomes are stored (see set_status)
+        self.tallies: Dict[str, List[int]] = {}
+        # Requirements whose checks record a payload, in declaration order
+        self.recorders: List[Requirement] = []
+        self.results = {
+            "timestamp": datetime.now().isoformat(),
+            "total_requirements": 0,
+            "passed": 0,
+            "failed": 0,
+            "pass_rate": 0.0,
+            "categories": {},
+            # Streamed from the requirements when written (see write_json_results)
+            "details": [],
+            "snapshot_cache": {},
+            "pattern_engine": {}
+        }
+        if self.storage.describe():
+            self.results["source"] = self.storage.describe()
+        
+    @contextmanager
+    def span(self, phase: str):
+        """Record the wall time of a run phase (load, check, aggregate, report)"""
+        started = time.perf_counter() - self.epoch
+        try:
+            yield
+        finally:
+            self.spans[phase] = (started, time.perf_counter() - self.epoch)
+    
+    def add_requirement(self, category: str, name: str, description: str, file_path: str = None, component_check: callable = None, patterns: List[Tuple[str, str]] = None, inputs: List[str] = None, version: int = 1, cacheable: bool = True, tree_wide: bool = False, indexes: Tuple[str, ...] = ()):
+        """Add a requirement to check
+        
+        ``patterns`` lists the (file, pattern) pairs the component check probes
+        through ``check_file_contains`` so they can be batched per file.
+        ``inputs`` lists any other paths the component check reads; pattern
+        files are added automatically. ``version`` must be bumped whenever the
+        component check's logic changes. ``cacheable`` is False for checks
+        whose outcome does not follow from their input files alone.
+        ``tree_wide`` checks can be changed by any path in the tree, so
+        --changed-since and watch mode re-run them on every change.
+        ``indexes`` names the lazy indexes the check reads (see warm_indexes).
+        Returns the new requirement.
+        """
+        declared = list(inputs or []) + [pattern_file for pattern_file, _ in patterns or []]
+        req = Requirement(category, name, description, file_path, component_check, declared, version, cacheable, tree_wide)
+        req.indexes = indexes
+        self.track(req)
+        for pattern_file, pattern in patterns or []:
+            risk = self.patterns.register(pattern_file, pattern)
+            if risk:
+                print(f"⚠️  {category} / {name}: pattern {pattern!r} may backtrack catastrophically ({risk})")
+        return req
+    
+    def track(self, req: Requirement):
+        """Append a requirement and count it in its category's tally"""
+        self.requirements.append(req)
+        tally = self.tallies.setdefault(req.category, [0, 0, 0, 0, 0])
+        tally[0] += 1
+        tally[self.TALLY_SLOTS.get(req.status, 2)] += 1
+    
+    def set_status(self, req: Requirement, status: str, details: str):
+        """Store a requirement's outcome and move it to its new tally slot"""
+        tally = self.tallies[req.category]
+        tally[self.TALLY_SLOTS.get(req.status, 2)] -= 1
+        tally[self.TALLY_SLOTS.get(status, 2)] += 1
+        req.status, req.details = status, details
+        req.found = status == "GREEN"
+    
+    def check_file_exists(self, file_path: str) -> bool:
+        """Check if a file exists"""
+        return self.snapshot.is_file(file_path)
+    
+    def check_directory_exists(self, dir_path: str) -> bool:
+        """Check if a directory exists"""
+        return self.snapshot.is_dir(dir_path)
+    
+    def check_file_contains(self, file_path: str, pattern: str) -> bool:
+        """Check if a file contains a specific pattern"""
+        return self.match_file(file_path, pattern)
+    
+    def match_file(self, file_path: str, pattern: str) -> bool:
+        """Search a file for a pattern, reporting unusable files distinctly
+        
+        A missing file is a plain miss. Files above ``max_content_bytes``
+        raise ContentUnavailable("TOO_LARGE"), and files that cannot be read
+        (or decoded, below the mmap threshold) raise it as "UNREADABLE".
+        Large files are memory-mapped and matched as bytes with early exit,
+        so no decoded copy is made.
+        """
+        if not self.snapshot.is_file(file_path):
+            return False
+        size = self.snapshot.size(file_path)
+        if size is None:
+            raise ContentUnavailable("UNREADABLE", f"Cannot read {file_path}")
+        if size > self.max_content_bytes:
+            raise ContentUnavailable(
+                "TOO_LARGE",
+                f"{file_path} is {size} bytes, over the {self.max_content_bytes} byte content limit"
+            )
+        if size < MMAP_MIN_BYTES:
+            content = self.snapshot.read_text(file_path)
+            if content is None:
+                raise ContentUnavailable("UNREADABLE", f"Cannot read {file_path} as UTF-8 text")
+            return self.patterns.search(file_path, pattern, content)
+        try:
+            with self.snapshot.buffer(file_path) as buffer:
+                return self.patterns.search(file_path, pattern, buffer)
+        except (OSError, ValueError) as e:
+            raise ContentUnavailable("UNREADABLE", f"Cannot read {file_path}: {e}")
+    
+    def prisma_schema(self) -> Optional[PrismaSchema]:
+        """Return the parsed Prisma schema (parsed once per run), or None if missing"""
+        with self._prisma_lock:
+            if self._prisma is None:
+                text = self.snapshot.read_text(PRISMA_SCHEMA)
+                if text is None:
+                    return None
+                self._prisma = PrismaSchema.parse(text)
+            return self._prisma
+    
+    def symbols(self) -> SymbolIndex:
+        """Return the TypeScript symbol index, updated for the current tree"""
+        with self._symbols_lock:
+            if self._symbols is None:
+                cache_dir = self.result_cache.cache_dir if self.result_cache else None
+                self._symbols = SymbolIndex(self.index, self.snapshot, cache_dir=cache_dir)
+            if self._symbols_stale:
+                self._symbols.update()
+                self._symbols_stale = False
+            return self._symbols
+    
+    def import_graph(self) -> ImportGraph:
+        """Return the TypeScript import graph, updated for the current tree"""
+        with self._imports_lock:
+            if self._imports is None:
+                cache_dir = self.result_cache.cache_dir if self.result_cache else None
+                self._imports = ImportGraph(self.index, self.snapshot, cache_dir=cache_dir)
+            if self._imports_stale:
+                self._imports.update()
+                self._imports_stale = False
+            return self._imports
+    
+    def add_import_requirement(self, category: str, name: str, description: str, sources: List[str], forbid: List[str], exclude: Optional[List[str]] = None, include_types: bool = False, version: int = 1):
+        """Add a layering requirement: no file below ``sources`` (minus
+        ``exclude``) may import a module below ``forbid``
+        
+        All three take module paths (see module_matches). Type-only imports
+        are erased at compile time and only count with ``include_types``.
+        """
+        origin = ", ".join(f"{s}/" for s in sources)
+        if exclude:
+            origin += f" (except {', '.join(f'{x}/' for x in exclude)})"
+        target = ", ".join(forbid)
+        
+        def check() -> Tuple[bool, str]:
+            checked, found = self.import_graph().forbidden(sources, forbid, exclude or (), include_types)
+            if not found:
+                return True, f"None of {checked} imports from {origin} reach {target}"
+            shown = "; ".join(
+                f"{path}:{line} imports {', '.join(names) or 'the module'} from {imported}"
+                for path, line, imported, names in found[:3]
+            )
+            more = f"; and {len(found) - 3} more" if len(found) > 3 else ""
+            return False, f"{len(found)} forbidden import(s) from {origin} into {target}: {shown}{more}"
+        
+        self.add_requirement(category, name, description, component_check=check, inputs=list(IMPORT_ROOTS) + [TSCONFIG], version=version, indexes=("import_graph",))
+    
+    def add_cycle_requirement(self, category: str, name: str, description: str, prefix: str = "", include_types: bool = False, version: int = 1):
+        """Add a requirement that the files below ``prefix`` (all graph files
+        by default) import each other without cycles
+        """
+        where = f"{prefix.rstrip('/')}/" if prefix else ", ".join(f"{root}/" for root in IMPORT_ROOTS)
+        
+        def check() -> Tuple[bool, str]:
+            considered, cycles = self.import_graph().cycles(prefix, include_types)
+            if not cycles:
+                return True, f"No import cycles among {considered} files in {where}"
+            shown = "; ".join(" → ".join(cycle) for cycle in cycles[:3])
+            more = f"; and {len(cycles) - 3} more" if len(cycles) > 3 else ""
+            return False, f"{len(cycles)} import cycle(s) in {where}: {shown}{more}"
+        
+        self.add_requirement(category, name, description, component_check=check, inputs=list(IMPORT_ROOTS) + [TSCONFIG], version=version, indexes=("import_graph",))
+    
+    def join_keys(self, side: Dict) -> Dict[str, str]:
+        """Return key -> first contributing file for one side of a correspondence rule
+        
+        ``side["files"]`` is a glob (or list of globs). ``side["key"]`` picks
+        what each file contributes: "path" (the file itself), "imports" (the
+        files it imports), "exports" (its exported declarations, optionally of
+        one ``kind``; files outside the symbol roots have none) or
+        "imported_names" (the names it imports from ``module``). A
+        ``pattern`` keeps only matching keys, rewritten to its first group if
+        it has one.
+        """
+        globs = [side["files"]] if isinstance(side["files"], str) else side["files"]
+        files = list(dict.fromkeys(path for pattern in globs for path in self.index.glob(pattern)))
+        key = side.get("key", "path")
+        pairs: Iterable[Tuple[str, str]]
+        if key == "path":
+            pairs = ((path, path) for path in files)
+        elif key == "imports":
+            graph = self.import_graph()
+            pairs = ((target, path) for path in files for target, _, _, _ in graph.edges_of(path))
+        elif key == "exports":
+            symbols = self.symbols()
+            pairs = (
+                (name, path) for path in files for name, kind, exported in symbols.declarations(path)
+                if exported and side.get("kind") in (None, kind)
+            )
+        else:
+            graph = self.import_graph()
+            pairs = (
+                (name, path) for path in files for target, names, _, _ in graph.edges_of(path)
+                if module_matches(target, side["module"]) for name in names
+            )
+        
+        pattern = re.compile(side["pattern"]) if side.get("pattern") else None
+        keys: Dict[str, str] = {}
+        for value, path in pairs:
+            if pattern is not None:
+                match = pattern.search(value)
+                if match is None:
+                    continue
+                value = match.group(1) if pattern.groups else value
+            keys.setdefault(value, path)
+        return keys
+    
+    def add_correspondence_requirement(self, category: str, name: str, description: str, left: Dict, right: Dict, version: int = 1):
+        """Add a requirement that every key of the ``left`` file set has a
+        matching key in the ``right`` set (see join_keys)
+        
+        Each side is collected once into a dictionary, so the join is one
+        hash lookup per left key. Unmatched keys are listed in the details
+        and, in full, under ``unmatched`` in the results, so the check is
+        not cached; the indexes it reads are.
+        """
+        def label(side: Dict) -> str:
+            files = side["files"] if isinstance(side["files"], str) else ", ".join(side["files"])
+            key = side.get("key", "path")
+            if key == "imports":
+                return f"imports of {files}"
+            if key == "exports":
+                return f"{side.get('kind', '')} exports of {files}".lstrip()
+            if key == "imported_names":
+                return f"names {files} imports from {side['module']}"
+            return files
+        
+        wanted_label, available_label = label(left), label(right)
+        
+        def check() -> Tuple[bool, str]:
+            wanted = self.join_keys(left)
+            available = self.join_keys(right)
+            unmatched = [key for key in wanted if key not in available]
+            req.payload["unmatched"] = unmatched
+            if not unmatched:
+                return True, f"All {len(wanted)} {wanted_label} match {available_label}"
+            shown = ", ".join(unmatched[:10])
+            more = f" and {len(unmatched) - 10} more" if len(unmatched) > 10 else ""
+            return False, f"{len(unmatched)} of {len(wanted)} {wanted_label} have no match in {available_label}: {shown}{more}"
+        
+        inputs = []
+        indexes = set()
+        for side in (left, right):
+            for pattern in [side["files"]] if isinstance(side["files"], str) else side["files"]:
+                inputs.append("/".join(itertools.takewhile(lambda part: "*" not in part and "?" not in part, pattern.split("/"))))
+            if side.get("key") in ("imports", "imported_names"):
+                # Import targets resolve anywhere in the graph, through tsconfig aliases
+                inputs.extend(list(IMPORT_ROOTS) + [TSCONFIG])
+                indexes.add("import_graph")
+            elif side.get("key") == "exports":
+                indexes.add("symbols")
+        req = self.add_requirement(
+            category, name, description, component_check=check, inputs=list(dict.fromkeys(inputs)), version=version, cacheable=False,
+            indexes=tuple(sorted(indexes)),
+        )
+        self.recorders.append(req)
+    
+    def markdown_links(self) -> MarkdownLinkIndex:
+        """Return the markdown heading/link index, built in one pass on first use"""
+        with self._links_lock:
+            if self._links is None:
+                cache_dir = self.result_cache.cache_dir if self.result_cache else None
+                self._links = MarkdownLinkIndex(self.index, self.snapshot, cache_dir=cache_dir)
+                self._links.update()
+            return self._links
+    
+    def warm_indexes(self, requirements: Iterable[Requirement]):
+        """Build the lazy indexes the given requirements read
+        
+        Called before forking check workers, so every worker inherits the
+        indexes instead of rebuilding them.
+        """
+        needed = {name for req in requirements for name in req.indexes}
+        for builder in (self.prisma_schema, self.symbols, self.import_graph, self.markdown_links):
+            if builder.__name__ in needed:
+                builder()
+    
+    def add_link_requirement(self, category: str, name: str, description: str, prefix: str = "", version: int = 1):
+        """Add a requirement that every relative link and anchor in the markdown
+        files below ``prefix`` (the whole tree by default) resolves
+        """
+        where = f"{prefix.rstrip('/')}/" if prefix else "the repository"
+        
+        def check() -> Tuple[bool, str]:
+            checked, broken = self.markdown_links().broken(prefix)
+            req.payload["broken_links"] = broken
+            if not broken:
+                return True, f"All {checked} relative links in {where} resolve"
+            shown = "; ".join(f"{b['source']}:{b['line']} → {b['target']} ({b['reason']})" for b in broken[:3])
+            more = f"; and {len(broken) - 3} more" if len(broken) > 3 else ""
+            return False, f"{len(broken)} of {checked} links in {where} are broken: {shown}{more}"
+        
+        # Anchors may point into any markdown file and links at any path, so
+        # the outcome is not a function of a fixed input set: deleting a
+        # target or adding a markdown file anywhere must re-run the check
+        start = prefix.rstrip("/") + "/" if prefix else ""
+        sources = [path for path in self.index.files(suffixes=(".md",)) if path.startswith(start)]
+        req = self.add_requirement(category, name, description, component_check=check, inputs=sources, version=version, cacheable=False, tree_wide=True, indexes=("markdown_links",))
+        self.recorders.append(req)
+    
+    def add_content_requirement(self, category: str, name: str, description: str, paths: List[str], patterns: List[str], match: str = "all", messages: Optional[Dict[str, str]] = None, version: int = 1):
+        """Add a requirement that content patterns are found in the given files
+        
+        With ``match="all"`` every pattern must be found in one of the
+        existing ``paths``; with ``"any"`` one pattern in the first matching
+        file suffices. ``messages`` overrides the "found", "not_found" and
+        "missing" (no file exists) details, which may use {path}, {paths} and
+        {missing}.
+        """
+        listed = ", ".join(paths)
+        messages = {
+            "found": "All patterns found in {path}" if match == "all" else "Pattern found in {path}",
+            "not_found": "Not found in {paths}: {missing}",
+            "missing": "File not found: {paths}",
+            **(messages or {}),
+        }
+        
+        def detail(key: str, path: str, missing: List[str]) -> str:
+            return messages[key].format_map({"path": path, "paths": listed, "missing": ", ".join(missing)})
+        
+        def check() -> Tuple[bool, str]:
+            existing = [path for path in paths if self.check_file_exists(path)]
+            if not existing:
+                return False, detail("missing", listed, patterns)
+            if match == "any":
+                for path in existing:
+                    if any(self.check_file_contains(path, pattern) for pattern in patterns):
+                        return True, detail("found", path, [])
+                return False, detail("not_found", existing[0], patterns)
+            missing = [p for p in patterns if not any(self.check_file_contains(path, p) for path in existing)]
+            if missing:
+                return False, detail("not_found", existing[0], missing)
+            return True, detail("found", existing[0], [])
+        
+        self.add_requirement(
+            category, name, description, component_check=check,
+            patterns=[(path, pattern) for path in paths for pattern in patterns], version=version
+        )
+    
+    def add_symbol_requirement(self, category: str, name: str, description: str, symbol: str, kind: str = None, path: str = None, exported: bool = True, messages: Optional[Dict[str, str]] = None, version: int = 1):
+        """Add a requirement that ``symbol`` is exported from ``path`` (a file or
+        directory) or, without ``path``, from anywhere in the symbol roots
+        
+        With ``exported=False`` any top-level declaration counts. ``messages``
+        overrides the "found", "not_found" and "missing" (``path`` does not
+        exist) details, which may use {label}, {where} and {files}.
+        """
+        where = path or ", ".join(f"{root}/" for root in SYMBOL_ROOTS)
+        label = f"{symbol} {kind}" if kind else symbol
+        messages = {
+            "found": "{label} exported from {files}" if exported else "{label} found in {files}",
+            "not_found": "{label} not exported from {where}" if exported else "{label} not found in {where}",
+            **(messages or {}),
+        }
+        
+        def detail(key: str, files: str = "") -> str:
+            return messages[key].format_map({"label": label, "where": where, "files": files})
+        
+        def check() -> Tuple[bool, str]:
+            if path and "missing" in messages and self.snapshot.kind(path) is None:
+                return False, detail("missing")
+            matches = self.symbols().find(symbol, kind=kind, path=path, exported=True if exported else None)
+            if matches:
+                return True, detail("found", ", ".join(sorted({m[0] for m in matches})))
+            return False, detail("not_found")
+        
+        self.add_requirement(category, name, description, component_check=check, inputs=[path] if path else list(SYMBOL_ROOTS), version=version, indexes=("symbols",))
+    
+    def add_model_requirement(self, category: str, name: str, description: str, model: str, field: str = None, relates_to: str = None, index: List[str] = None, unique: List[str] = None, version: int = 1):
+        """Add a declarative requirement answered from the parsed Prisma schema
+        
+        Checks that ``model`` exists and, when given, that ``field`` exists and
+        relates to the ``relates_to`` model, that ``index`` columns are covered
+        by an index, and that ``unique`` columns carry a unique constraint.
+        """
+        def check() -> Tuple[bool, str]:
+            schema = self.prisma_schema()
+            if schema is None:
+                return False, "Prisma schema file not found"
+            if not schema.has_model(model):
+                return False, f"{model} model not found"
+            if field and schema.field(model, field) is None:
+                return False, f"{model}.{field} field not found"
+            if relates_to:
+                target = schema.relation_target(model, field)
+                if target != relates_to:
+                    return False, f"{model}.{field} does not relate to {relates_to}"
+                return True, f"{model}.{field} relates to {relates_to}"
+            if index:
+                if not schema.has_index(model, index):
+                    return False, f"{model} has no index on ({', '.join(index)})"
+                return True, f"{model} has an index on ({', '.join(index)})"
+            if unique:
+                if not schema.is_unique(model, unique):
+                    return False, f"{model} has no unique constraint on ({', '.join(unique)})"
+                return True, f"{model} has a unique constraint on ({', '.join(unique)})"
+            if field:
+                return True, f"{model}.{field} field found"
+            return True, f"{model} model found"
+        
+        self.add_requirement(category, name, description, component_check=check, inputs=[PRISMA_SCHEMA], version=version, indexes=("prisma_schema",))
+    
+    def discover_route_probes(self) -> List[RouteProbe]:
+        """Derive a GET probe for every static app/api route that exports a GET handler"""
+        probes = []
+        for path in self.index.files("app/api", (".ts", ".js")):
+            if path.rsplit("/", 1)[-1] not in ("route.ts", "route.js"):
+                continue
+            segments = [s for s in path.split("/")[1:-1] if not (s.startswith("(") and s.endswith(")"))]
+            if any(s.startswith("[") for s in segments):
+                # Dynamic segments need configured sample values
+                continue
+            if self.symbols().find("GET", path=path, exported=True):
+                probes.append(RouteProbe("GET", "/" + "/".join(segments), source=path))
+        return probes
+    
+    def load_probe_requirements(self, config_path: Optional[Path] = None):
+        """Add a probe requirement per discovered GET route and per configured request
+        
+        The optional JSON config lists {"method", "path", "expect", "body",
+        "headers", "source"} objects; an entry replaces the discovered probe
+        with the same method and path.
+        """
+        probes = {probe.label: probe for probe in self.discover_route_probes()}
+        if config_path is not None:
+            with open(config_path, encoding="utf-8") as f:
+                for entry in json.load(f):
+                    body = entry.get("body")
+                    probe = RouteProbe(
+                        entry.get("method", "GET"), entry["path"], entry.get("expect"),
+                        json.dumps(body) if isinstance(body, (dict, list)) else body,
+                        entry.get("headers"), entry.get("source"),
+                    )
+                    probes[probe.label] = probe
+        
+        self.probes = list(probes.values())
+        for probe in self.probes:
+            self.add_requirement(
+                "API Probes",
+                probe.label,
+                f"{probe.label} responds with "
+                + (", ".join(str(s) for s in sorted(probe.expect)) if probe.expect else "a non-5xx status"),
+                component_check=self._probe_check(probe),
+                inputs=[probe.source] if probe.source else [],
+                cacheable=False
+            )
+    
+    def _probe_check(self, probe: RouteProbe):
+        """Build the component check reporting one probe's outcome"""
+        def check() -> Tuple[bool, str]:
+            if not probe.statuses and not probe.errors:
+                return False, "Not probed"
+            codes = ", ".join(f"{code}×{count}" for code, count in probe.summary()["status_codes"].items())
+            latency = f"p50 {probe.percentile(0.5):.1f} ms, p95 {probe.percentile(0.95):.1f} ms, p99 {probe.percentile(0.99):.1f} ms"
+            if probe.errors:
+                return False, f"{len(probe.errors)} failed request(s): {probe.errors[0]}" + (f"; {codes}" if codes else "")
+            if not all(probe.accepts(status) for status in probe.statuses):
+                return False, f"Unexpected status {codes} ({latency})"
+            return True, f"{codes} ({latency})"
+        return check
+    
+    def run_probes(self, base_url: Optional[str] = None, concurrency: int = PROBE_CONCURRENCY, timeout: float = PROBE_TIMEOUT, repeat: int = PROBE_REPEAT):
+        """Send every loaded probe, against ``base_url`` or a local stub server when None"""
+        async def probe_all():
+            stub = None
+            url = base_url
+            if url is None:
+                stub = ProbeStubServer(probe.path for probe in self.probes)
+                url = await stub.start()
+            try:
+                prober = HTTPProber(url, concurrency, timeout)
+                await prober.run(self.probes, repeat)
+            finally:
+                if stub is not None:
+                    await stub.stop()
+            return url, prober
+        
+        with self.span("probe"):
+            url, prober = asyncio.run(probe_all())
+        self.results["probes"] = {
+            "base_url": url,
+            "stub": base_url is None,
+            "requests": prober.requests,
+            "connections": prober.connections,
+            "routes": {probe.label: probe.summary() for probe in self.probes},
+        }
+    
+    def load_architecture_requirements(self):
+        """Load requirements from the manifest (qa/requirements.json) through its cached plan"""
+        cache_dir = self.result_cache.cache_dir if self.result_cache else None
+        self.load_plan(RequirementPlan.load(self.manifest_path, cache_dir))
+    
+    def load_plan(self, plan: RequirementPlan):
+        """Add the requirements of a compiled plan in manifest order"""
+        # Register each file's patterns together so its combined matcher covers them all
+        for path_id, pattern_ids, _ in plan.files:
+            for pattern_id in pattern_ids:
+                risk = self.patterns.register(plan.paths[path_id], plan.patterns[pattern_id])
+                if risk:
+                    print(f"⚠️  {plan.paths[path_id]}: pattern {plan.patterns[pattern_id]!r} may backtrack catastrophically ({risk})")
+        
+        for rule in plan.rules:
+            common = (rule["category"], rule["name"], rule["description"])
+            paths = [plan.paths[i] for i in rule["paths"]]
+            args = rule["args"]
+            if rule["type"] == "exists":
+                self.add_requirement(*common, file_path=paths[0], version=rule["version"])
+            elif rule["type"] == "contains":
+                patterns = [plan.patterns[i] for i in rule["patterns"]]
+                self.add_content_requirement(*common, paths=paths, patterns=patterns, version=rule["version"], **args)
+            elif rule["type"] == "symbol":
+                self.add_symbol_requirement(*common, path=paths[0] if paths else None, version=rule["version"], **args)
+            elif rule["type"] == "model":
+                self.add_model_requirement(*common, version=rule["version"], **args)
+            elif rule["type"] == "links":
+                self.add_link_requirement(*common, version=rule["version"], **args)
+            elif rule["type"] == "imports":
+                self.add_import_requirement(
+                    *common, sources=args["from"], forbid=args["forbid"], exclude=args.get("except"),
+                    include_types=args.get("include_types", False), version=rule["version"]
+                )
+            elif rule["type"] == "cycles":
+                self.add_cycle_requirement(*common, version=rule["version"], **args)
+            elif rule["type"] == "correspondence":
+                self.add_correspondence_requirement(*common, version=rule["version"], **args)
+            # Editing a rule must invalidate its cached outcome even without a version bump
+            self.requirements[-1].rule_digest = rule["digest"]
+            self.requirements[-1].gating = rule["level"] == "gate"
+        self.results["manifest"] = plan.stats()
+    
+    def evaluate_requirement(self, req: Requirement) -> Tuple[bool, str]:
+        """Evaluate a single requirement without touching its stored status"""
+        found, details = False, ""
+        if req.file_path:
+            # File existence check
+            found = self.check_file_exists(req.file_path)
+            details = f"File {'exists' if found else 'missing'}: {req.file_path}"
+            if self.index.resolve(req.file_path) != req.file_path:
+                variants = self.index.case_variants(req.file_path)
+                if variants:
+                    details += f" (case mismatch: {', '.join(variants)})"
+        
+        if req.component_check:
+            # Component-specific check
+            found, details = req.component_check()
+        
+        return found, details
+    
+    def evaluate_cached(self, req: Requirement) -> Tuple[str, str]:
+        """Evaluate a requirement through the persistent result cache
+        
+        Returns (status, details). Only GREEN/RED outcomes of component checks
+        are cached; a plain existence check is cheaper than hashing its input.
+        The evaluation's wall time and I/O are recorded on the requirement.
+        """
+        started = time.perf_counter()
+        req.payload = {}
+        self.snapshot.begin_trace()
+        try:
+            if self.result_cache is None or not req.component_check or not req.cacheable:
+                found, details = self.evaluate_requirement(req)
+            else:
+                key = self.result_cache.key(req, self.snapshot)
+                outcome = self.result_cache.get(key)
+                if outcome is None:
+                    outcome = self.evaluate_requirement(req)
+                    self.result_cache.put(key, *outcome)
+                found, details = outcome
+            return ("GREEN" if found else "RED"), details
+        except ContentUnavailable as e:
+            return e.status, str(e)
+        finally:
+            req.bytes_read, req.files_touched = self.snapshot.end_trace()
+            req.started = started - self.epoch
+            req.wall_time = time.perf_counter() - started
+            req.thread = threading.get_ident()
+    
+    def load_previous_results(self) -> Dict[Tuple[str, str], Dict]:
+        """Load per-requirement results of the previous run, keyed by (category, name)"""
+        results_path = self.output_dir / "QA_RESULTS.json"
+        try:
+            with open(results_path, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {(d["category"], d["name"]): d for d in previous.get("details", [])}
+    
+    def costs_path(self) -> Optional[Path]:
+        """Return the untracked file holding per-requirement costs (None without a cache)"""
+        return self.result_cache.cache_dir / "costs.json" if self.result_cache else None
+    
+    def load_previous_costs(self) -> Dict[Tuple[str, str], float]:
+        """Load per-requirement wall times (ms) of the previous run, keyed by (category, name)"""
+        costs_path = self.costs_path()
+        if costs_path is None:
+            return {}
+        try:
+            with open(costs_path, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {(t["category"], t["name"]): t["wall_ms"] for t in previous.get("requirements", [])}
+    
+    def estimate_costs(self, requirements: List[Requirement], costs: Dict[Tuple[str, str], float]) -> List[float]:
+        """Return the expected cost of each requirement
+        
+        Costs come from the previous run. Plain existence checks without a
+        recorded cost count as free, and new component checks as average.
+        """
+        average = sum(costs.values()) / len(costs) if costs else 0.0
+        estimates = []
+        for req in requirements:
+            cost = costs.get((req.category, req.name))
+            if cost is None:
+                cost = average if req.component_check else 0.0
+            estimates.append(cost)
+        return estimates
+    
+    def schedule(self, requirements: List[Requirement], costs: Dict[Tuple[str, str], float]) -> List[Requirement]:
+        """Order requirements critical categories first, then cheapest first"""
+        estimates = self.estimate_costs(requirements, costs)
+        
+        def priority(position: int) -> Tuple[bool, float, int]:
+            return requirements[position].category not in self.critical_categories, estimates[position], position
+        
+        return [requirements[position] for position in sorted(range(len(requirements)), key=priority)]
+    
+    def shard(self, index: int, count: int) -> List[Requirement]:
+        """Return shard ``index`` (1-based) of ``count``, in declaration order
+        
+        Requirements are assigned longest-first to the least loaded shard
+        (by previous-run cost, then by number of requirements). Ties are
+        broken by a stable hash of category and name, so every CI job
+        computes the same partition from the same previous results.
+        """
+        estimates = self.estimate_costs(self.requirements, self.load_previous_costs())
+        
+        def stable_hash(req: Requirement) -> str:
+            return hashlib.sha256(f"{req.category}\0{req.name}".encode("utf-8")).hexdigest()
+        
+        order = sorted(range(len(self.requirements)), key=lambda i: (-estimates[i], stable_hash(self.requirements[i])))
+        loads = [(0.0, 0, shard) for shard in range(count)]
+        assigned: Dict[int, int] = {}
+        for position in order:
+            load, size, shard = min(loads)
+            loads[shard] = (load + estimates[position], size + 1, shard)
+            assigned[position] = shard
+        return [req for position, req in enumerate(self.requirements) if assigned[position] == index - 1]
+    
+    def write_shard_results(self, out: TextIO, index: int, count: int, subset: List[Requirement]):
+        """Write the partial results of one shard for ``merge``"""
+        positions = {id(req): position for position, req in enumerate(self.requirements)}
+        stats = {key: self.results[key] for key in self.INDEX_SECTIONS + tuple(self.COST_COUNTERS) + ("incremental",) if key in self.results}
+        partial = {
+            "shard": {"index": index, "count": count, "total_requirements": len(self.requirements)},
+            "timestamp": self.results["timestamp"],
+            "phases": self.timings()["phases"],
+            "stats": stats,
+            "requirements": [
+                {
+                    "position": positions[id(req)],
+                    "category": req.category,
+                    "name": req.name,
+                    "description": req.description,
+                    "status": req.status,
+                    "details": req.details,
+                    "wall_ms": round(req.wall_time * 1000, 3),
+                    "bytes_read": req.bytes_read,
+                    "files_touched": req.files_touched,
+                    "payload": req.payload,
+                }
+                for req in subset
+            ],
+        }
+        for key in self.SHARED_SECTIONS:
+            if key in self.results:
+                partial[key] = self.results[key]
+        json.dump(partial, out, indent=2)
+    
+    def load_shards(self, shards: List[Dict]):
+        """Rebuild the full requirement list from every shard's partial results
+        
+        Raises ValueError unless the shards form one complete partition.
+        """
+        counts = {shard["shard"]["count"] for shard in shards}
+        totals = {shard["shard"]["total_requirements"] for shard in shards}
+        if len(counts) != 1 or len(totals) != 1:
+            raise ValueError("shards come from different partitions")
+        count, total = counts.pop(), totals.pop()
+        indexes = sorted(shard["shard"]["index"] for shard in shards)
+        if indexes != list(range(1, count + 1)):
+            raise ValueError(f"expected shards 1..{count}, got {', '.join(map(str, indexes)) or 'none'}")
+        if len({json.dumps(shard.get("source"), sort_keys=True) for shard in shards}) != 1:
+            raise ValueError("shards validated different sources")
+        
+        records = sorted((record for shard in shards for record in shard["requirements"]), key=lambda r: r["position"])
+        if [record["position"] for record in records] != list(range(total)):
+            raise ValueError("shards do not cover every requirement exactly once")
+        
+        self.requirements, self.tallies, self.recorders = [], {}, []
+        for record in records:
+            req = Requirement(record["category"], record["name"], record["description"])
+            req.wall_time = record["wall_ms"] / 1000
+            req.bytes_read, req.files_touched = record["bytes_read"], record["files_touched"]
+            req.payload = record.get("payload", {})
+            self.track(req)
+            self.set_status(req, record["status"], record["details"])
+            if req.payload:
+                self.recorders.append(req)
+        
+        shards = sorted(shards, key=lambda s: s["shard"]["index"])
+        
+        def shared(*keys: str):
+            for key in keys:
+                for shard in shards:
+                    if key in shard:
+                        self.results[key] = shard[key]
+                        break
+        
+        def stats(key: str) -> List[Dict]:
+            return [shard["stats"][key] for shard in shards if key in shard["stats"]]
+        
+        def costs(key: str):
+            sections = stats(key)
+            if sections:
+                self.results[key] = {
+                    name: sum(section[name] for section in sections) if name in self.COST_COUNTERS[key] else value
+                    for name, value in sections[0].items()
+                }
+        
+        # Sections are added in the order a run adds them, so the merged
+        # QA_RESULTS.json lists its keys like a single run's
+        self.results["timestamp"] = max(shard["timestamp"] for shard in shards)
+        shared("source", "manifest", "probes")
+        incremental = stats("incremental")
+        if incremental:
+            self.results["incremental"] = {
+                "changed_files": incremental[0]["changed_files"],
+                "evaluated": sum(section["evaluated"] for section in incremental),
+                "reused": sum(section["reused"] for section in incremental),
+            }
+        shared("run_timeout", "fail_fast")
+        costs("result_cache")
+        self.aggregate_results()
+        shared("risky_patterns")
+        # Index counters are the same in every shard that built the index
+        for key in self.INDEX_SECTIONS:
+            sections = stats(key)
+            if sections:
+                self.results[key] = sections[0]
+        costs("snapshot_cache")
+        costs("pattern_engine")
+        
+        # Phase times are summed like the cost counters and laid end to end
+        phases: Dict[str, float] = {}
+        for shard in shards:
+            for phase, ms in shard["phases"].items():
+                phases[phase] = phases.get(phase, 0.0) + ms / 1000
+        elapsed = 0.0
+        for phase, seconds in phases.items():
+            self.spans[phase] = (elapsed, elapsed + seconds)
+            elapsed += seconds
+        self.results["shards"] = [
+            {"index": shard["shard"]["index"], "evaluated": len(shard["requirements"]), "timestamp": shard["timestamp"], "phases": shard["phases"]}
+            for shard in shards
+        ]
+    
+    def run_checks(self, jobs: int = 1, changed_paths: Optional[Set[str]] = None, fail_fast: bool = False, subset: Optional[List[Requirement]] = None, isolate: bool = False, check_timeout: Optional[float] = CHECK_TIMEOUT, run_timeout: Optional[float] = None):
+        """Run all requirement checks (or only ``subset``, e.g. one shard)
+                
+        Requirements run in ``schedule`` order, on a thread pool when ``jobs``
+        > 1; reports always list them in declaration order. With
+        ``changed_paths`` only requirements whose inputs touch those paths are
+        re-evaluated and the rest reuse their status from the previous
+        results file. With ``fail_fast`` the run stops at the first critical
+        RED and every requirement not yet evaluated is marked SKIPPED. Failures
+        of warn-level requirements are reported as WARN and never stop a run.
+        With ``isolate`` checks run in forked worker processes under the
+        ``check_timeout`` and ``run_timeout`` budgets (see CheckWorkerPool).
+        """
+        scope = self.requirements if subset is None else subset
+        pending = scope
+        if changed_paths is not None:
+            previous = self.load_previous_results()
+            pending = []
+            for req in scope:
+                prior = previous.get((req.category, req.name))
+                if prior is None or prior["status"] == "SKIPPED" or (prior["status"] == "WARN" and req.gating) or req.touches(changed_paths):
+                    pending.append(req)
+                else:
+                    self.set_status(req, req.settle(prior["status"]), prior["details"])
+            self.results["incremental"] = {
+                "changed_files": len(changed_paths),
+                "evaluated": len(pending),
+                "reused": len(scope) - len(pending),
+            }
+        
+        with self.span("check"):
+            failure = self.evaluate(pending, jobs, self.load_previous_costs(), fail_fast, isolate, check_timeout, run_timeout)
+            if failure is not None:
+                self.results["fail_fast"] = {
+                    "stopped_at": f"{failure.category} / {failure.name}",
+                    "skipped": sum(1 for req in pending if req.status == "SKIPPED"),
+                }
+                        
+            if self.result_cache is not None:
+                self.result_cache.evict()
+                self.results["result_cache"] = self.result_cache.stats()
+        
+        with self.span("aggregate"):
+            self.aggregate_results()
+    
+    def evaluate(self, requirements: List[Requirement], jobs: int = 1, costs: Optional[Dict[Tuple[str, str], float]] = None, fail_fast: bool = False, isolate: bool = False, check_timeout: Optional[float] = CHECK_TIMEOUT, run_timeout: Optional[float] = None) -> Optional[Requirement]:
+        """Evaluate requirements in schedule order and store each outcome on its requirement
+        
+        Returns the critical requirement that stopped a ``fail_fast`` run, or None.
+        """
+        order = self.schedule(requirements, costs or {})
+        done: Set[int] = set()
+        failure = None
+        skip_reason = None
+        
+        def store(req: Requirement, outcome: Tuple[str, str]) -> bool:
+            """Record an outcome; True if it should stop a fail-fast run"""
+            done.add(id(req))
+            if req.file_path or req.component_check:
+                self.set_status(req, req.settle(outcome[0]), outcome[1])
+            return fail_fast and req.gating and req.status != "GREEN" and req.category in self.critical_categories
+        
+        if isolate:
+            self.warm_indexes(order)
+            workers = CheckWorkerPool(self, jobs, check_timeout, run_timeout)
+            try:
+                for req, outcome in workers.run(order):
+                    if store(req, outcome):
+                        failure = req
+                        break
+            finally:
+                workers.close()
+            if workers.exhausted and failure is None:
+                skip_reason = f"Not evaluated: the {run_timeout:g}s run budget (--run-timeout) was exhausted"
+                self.results["run_timeout"] = {
+                    "budget": run_timeout,
+                    "skipped": sum(1 for req in order if id(req) not in done),
+                }
+        elif jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(self.evaluate_cached, req): req for req in order}
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    # Checks already running when the run stops still report
+                    if store(futures[future], future.result()) and failure is None:
+                        failure = futures[future]
+                        # Only queued checks can be cancelled; they are SKIPPED below
+                        for pending in futures:
+                            pending.cancel()
+        else:
+            for req in order:
+                if store(req, self.evaluate_cached(req)):
+                    failure = req
+                    break
+        
+        if failure is not None:
+            skip_reason = f"Not evaluated: --fail-fast stopped at {failure.category} / {failure.name}"
+        if skip_reason is not None:
+            for req in order:
+                if id(req) not in done:
+                    self.set_status(req, "SKIPPED", skip_reason)
+        return failure
+    
+    def recheck(self, changed_paths: Set[str], jobs: int = 1) -> List[Tuple[Requirement, str]]:
+        """Re-evaluate requirements touched by changed paths, keeping all state in memory
+        
+        Returns (requirement, previous status) for every requirement whose
+        status changed.
+        """
+        self.index.refresh(changed_paths)
+        self.snapshot.invalidate(changed_paths)
+        self.patterns.invalidate(changed_paths)
+        if PRISMA_SCHEMA in changed_paths:
+            self._prisma = None
+        if any(path.split("/")[0] in SYMBOL_ROOTS for path in changed_paths):
+            self._symbols_stale = True
+        if TSCONFIG in changed_paths or any(path.split("/")[0] in IMPORT_ROOTS for path in changed_paths):
+            self._imports_stale = True
+        if self._links is not None:
+            # Any added or removed file can fix or break a link
+            self._links.update()
+        
+        affected = [req for req in self.requirements if req.touches(changed_paths)]
+        previous = [req.status for req in affected]
+        self.evaluate(affected, jobs)
+        
+        self.results["timestamp"] = datetime.now().isoformat()
+        self.aggregate_results()
+        return [(req, status) for req, status in zip(affected, previous) if req.status != status]
+    
+    def aggregate_results(self):
+        """Recompute summary statistics from the category tallies
+        
+        The tallies are updated as each outcome is stored, so summarizing
+        does not walk the requirements again.
+        """
+        tallies = self.tallies
+        total = len(self.requirements)
+        passed = sum(tally[1] for tally in tallies.values())
+        skipped = sum(tally[3] for tally in tallies.values())
+        warnings = sum(tally[4] for tally in tallies.values())
+        self.results["total_requirements"] = total
+        self.results["passed"] = passed
+        self.results["failed"] = total - passed - skipped - warnings
+        for key, count in (("skipped", skipped), ("warnings", warnings)):
+            if count:
+                self.results[key] = count
+            else:
+                self.results.pop(key, None)
+        # Warn-level failures do not count against the pass rate
+        gating = total - warnings
+        self.results["pass_rate"] = (passed / gating * 100) if gating > 0 else 0
+        
+        self.results["categories"] = {}
+        for category, (cat_total, cat_passed, cat_failed, cat_skipped, cat_warnings) in tallies.items():
+            gating = cat_total - cat_warnings
+            cat = self.results["categories"][category] = {
+                "total": cat_total,
+                "passed": cat_passed,
+                "failed": cat_failed,
+                "pass_rate": (cat_passed / gating * 100) if gating > 0 else 0,
+            }
+            if cat_skipped:
+                cat["skipped"] = cat_skipped
+            if cat_warnings:
+                cat["warnings"] = cat_warnings
+        
+        # Checks finish in scheduling order, so their payloads are gathered here
+        for section in self.CHECK_SECTIONS:
+            self.results.pop(section, None)
+            payloads = {req.name: req.payload[section] for req in self.recorders if section in req.payload}
+            if payloads:
+                self.results[section] = payloads
+        
+        self.results["file_index"] = self.index.stats()
+        self.results["snapshot_cache"] = self.snapshot.stats()
+        self.results["pattern_engine"] = self.patterns.stats()
+        if self.patterns.risky:
+            self.results["risky_patterns"] = [
+                {"pattern": pattern, "reason": reason} for pattern, reason in self.patterns.risky.items()
+            ]
+        if self._symbols is not None:
+            self.results["symbol_index"] = self._symbols.stats()
+        if self._imports is not None:
+            self.results["import_graph"] = self._imports.stats()
+        if self._links is not None:
+            self.results["markdown_links"] = self._links.stats()
+    
+    def timings(self) -> Dict:
+        """Return phase spans in milliseconds"""
+        return {
+            "phases": {
+                phase: round((end - start) * 1000, 3)
+                for phase, (start, end) in self.spans.items()
+            },
+        }
+    
+    def costs(self) -> Dict:
+        """Return per-requirement costs, with wall times in milliseconds"""
+        return {
+            "requirements": [
+                {
+                    "category": req.category,
+                    "name": req.name,
+                    "wall_ms": round(req.wall_time * 1000, 3),
+                    "bytes_read": req.bytes_read,
+                    "files_touched": req.files_touched,
+                }
+                for req in self.requirements
+            ],
+        }
+    
+    def slowest_requirements(self, count: int = 10) -> List[Requirement]:
+        """Return the requirements with the longest last evaluation"""
+        return sorted(self.requirements, key=lambda req: req.wall_time, reverse=True)[:count]
+    
+    def write_chrome_trace(self, path: Path):
+        """Write phase and requirement spans in Chrome trace-event format"""
+        threads: Dict[int, int] = {}
+        events = []
+        for phase, (start, end) in self.spans.items():
+            events.append({
+                "name": phase, "cat": "phase", "ph": "X", "pid": 1, "tid": 0,
+                "ts": round(start * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+            })
+        for req in self.requirements:
+            if not req.thread:
+                continue
+            events.append({
+                "name": req.name, "cat": req.category, "ph": "X", "pid": 1,
+                "tid": threads.setdefault(req.thread, len(threads) + 1),
+                "ts": round(req.started * 1e6, 1), "dur": round(req.wall_time * 1e6, 1),
+                "args": {"status": req.status, "bytes_read": req.bytes_read, "files_touched": req.files_touched},
+            })
+        with atomic_writer(path) as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    
+    _DETAIL_FIELDS = ("category", "name", "description", "status", "details")
+    
+    def stop_reason(self) -> str:
+        """Describe why a run left requirements SKIPPED"""
+        if "fail_fast" in self.results:
+            return f"--fail-fast stopped at {self.results['fail_fast']['stopped_at']}"
+        if "run_timeout" in self.results:
+            return f"the {self.results['run_timeout']['budget']:g}s --run-timeout budget ran out"
+        return "not evaluated"
+    
+    def write_markdown_report(self, out: TextIO):
+        """Stream the markdown report to a text stream"""
+        def line(text: str = ""):
+            out.write(text)
+            out.write("\n")
+        
+        line("# PartPulse QA Report")
+        line()
+        line(f"**Generated**: {self.results['timestamp']}")
+        line()
+        if "source" in self.results:
+            line(f"**Ref**: {self.results['source']['ref']} ({self.results['source']['commit']})")
+            line()
+        
+        # Summary
+        line("## Summary")
+        line()
+        line(f"- **Total Requirements**: {self.results['total_requirements']}")
+        line(f"- **Passed**: {self.results['passed']} ✅")
+        line(f"- **Failed**: {self.results['failed']} ❌")
+        if self.results.get("warnings"):
+            line(f"- **Warnings**: {self.results['warnings']} ⚠️ (warn-level, not counted in the pass rate)")
+        if self.results.get("skipped"):
+            line(f"- **Skipped**: {self.results['skipped']} ⏭️ ({self.stop_reason()})")
+        line(f"- **Pass Rate**: {self.results['pass_rate']:.1f}%")
+        line()
+        
+        # Category Summary
+        line("## Results by Category")
+        line()
+        line("| Category | Total | Passed | Failed | Warnings | Skipped | Pass Rate |")
+        line("|----------|-------|--------|--------|----------|---------|-----------|")
+        
+        for cat_name, cat_data in sorted(self.results["categories"].items()):
+            line(
+                f"| {cat_name} | {cat_data['total']} | "
+                f"{cat_data['passed']} ✅ | {cat_data['failed']} ❌ | "
+                f"{cat_data.get('warnings', 0)} ⚠️ | {cat_data.get('skipped', 0)} ⏭️ | "
+                f"{cat_data['pass_rate']:.1f}% |"
+            )
+        
+        line()
+        
+        # Detailed Results
+        line("## Detailed Results")
+        line()
+        
+        current_category = None
+        for req in self.requirements:
+            if req.category != current_category:
+                current_category = req.category
+                line(f"### {current_category}")
+                line()
+            
+            status_icon = STATUS_ICONS.get(req.status, "❌")
+            line(f"**{status_icon} {req.name}**")
+            line(f"- Description: {req.description}")
+            line(f"- Status: {req.status}")
+            line(f"- Details: {req.details}")
+            line()
+        
+        # Traceability Matrix
+        line("## Traceability Matrix")
+        line()
+        line("| Requirement | Category | Status | Details |")
+        line("|-------------|----------|--------|---------|")
+        
+        for req in self.requirements:
+            status_icon = STATUS_ICONS.get(req.status, "❌")
+            line(
+                f"| {req.name} | {req.category} | "
+                f"{status_icon} {req.status} | {req.details} |"
+            )
+        
+        line()
+        
+        # Next Steps
+        if self.results["failed"] > 0:
+            line("## Next Steps")
+            line()
+            line("The following items need to be addressed:")
+            line()
+            
+            for req in self.requirements:
+                if req.status not in ("GREEN", "SKIPPED", "WARN"):
+                    line(f"- [ ] {req.name}: {req.details}")
+        else:
+            line("## ✅ All Requirements Met!")
+            line()
+            line("The codebase is fully compliant with the architecture specification.")
+        
+        if self.results.get("warnings"):
+            line()
+            line("## Warnings")
+            line()
+            line("Warn-level requirements that do not pass yet (they do not fail the run):")
+            line()
+            for req in self.requirements:
+                if req.status == "WARN":
+                    line(f"- [ ] {req.name}: {req.details}")
+    
+    def generate_markdown_report(self) -> str:
+        """Generate markdown report"""
+        out = io.StringIO()
+        self.write_markdown_report(out)
+        return out.getvalue()
+    
+    def write_json_results(self, out: TextIO):
+        """Stream the results as JSON, formatted exactly like ``json.dump(indent=2)``
+        
+        The ``details`` list is rendered record by record straight from the
+        requirements' attributes, without building a dict per record.
+        """
+        def indented(value, prefix: str) -> str:
+            return json.dumps(value, indent=2).replace("\n", "\n" + prefix)
+        
+        fields = [(f",\n      {json.dumps(field)}: ", field) for field in self._DETAIL_FIELDS]
+        fields[0] = (f"{{\n      {json.dumps(fields[0][1])}: ", fields[0][1])
+        
+        out.write("{")
+        for position, key in enumerate(self.results):
+            out.write(",\n  " if position else "\n  ")
+            out.write(json.dumps(key))
+            out.write(": ")
+            if key != "details":
+                out.write(indented(self.results[key], "  "))
+                continue
+            
+            empty = True
+            for req in self.requirements:
+                out.write(",\n    " if not empty else "[\n    ")
+                for prefix, field in fields:
+                    out.write(prefix)
+                    out.write(json.dumps(getattr(req, field)))
+                out.write("\n    }")
+                empty = False
+            out.write("[]" if empty else "\n  ]")
+        out.write("\n}" if self.results else "}")
+    
+    def write_ndjson_details(self, out: TextIO):
+        """Stream one JSON record per requirement, formatted like ``json.dumps(record)``
+        
+        As in write_json_results, each record is written straight from the
+        requirement's attributes.
+        """
+        fields = [(f", {json.dumps(field)}: ", field) for field in self._DETAIL_FIELDS]
+        fields[0] = (f"{{{json.dumps(fields[0][1])}: ", fields[0][1])
+        for req in self.requirements:
+            for prefix, field in fields:
+                out.write(prefix)
+                out.write(json.dumps(getattr(req, field), ensure_ascii=False))
+            out.write("}\n")
+    
+    def save_reports(self, quiet: bool = False, ndjson_path: Optional[Path] = None):
+        """Save QA reports to files
+        
+        Every file is streamed to a temporary file next to its target and
+        renamed into place, so readers never observe a partial report.
+        """
+        with self.span("report"):
+            self._save_reports(quiet, ndjson_path)
+    
+    def _save_reports(self, quiet: bool, ndjson_path: Optional[Path]):
+        """Write every report file (timed as the report phase)"""
+        qa_dir = self.output_dir
+        qa_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Save JSON results (the report phase itself is still in progress)
+        self.results["timings"] = self.timings()
+        json_path = qa_dir / "QA_RESULTS.json"
+        with atomic_writer(json_path) as f:
+            self.write_json_results(f)
+        
+        if not quiet:
+            print(f"✅ Saved JSON results to {json_path}")
+        
+        # Per-requirement costs change on every run, so they stay out of the
+        # tracked results and only feed the next run's schedule and shards
+        costs_path = self.costs_path()
+        if costs_path is not None:
+            costs_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_writer(costs_path) as f:
+                json.dump(self.costs(), f, indent=2)
+        
+        # Save Markdown report
+        md_path = qa_dir / "QA_REPORT.md"
+        with atomic_writer(md_path) as f:
+            self.write_markdown_report(f)
+        
+        if not quiet:
+            print(f"✅ Saved Markdown report to {md_path}")
+        
+        # Save NDJSON details
+        if ndjson_path is not None:
+            with atomic_writer(ndjson_path) as f:
+                self.write_ndjson_details(f)
+            
+            if not quiet:
+                print(f"✅ Saved NDJSON details to {ndjson_path}")
+    
+    def print_summary(self):
+        """Print summary to console"""
+        print("\n" + "=" * 70)
+        print("PartPulse QA System - Results Summary")
+        print("=" * 70)
+        print(f"Total Requirements: {self.results['total_requirements']}")
+        print(f"Passed: {self.results['passed']} ✅")
+        print(f"Failed: {self.results['failed']} ❌")
+        if self.results.get("warnings"):
+            print(f"Warnings: {self.results['warnings']} ⚠️")
+        if self.results.get("skipped"):
+            print(f"Skipped: {self.results['skipped']} ⏭️")
+        print(f"Pass Rate: {self.results['pass_rate']:.1f}%")
+        print("=" * 70)
+        
+        if self.results.get("skipped"):
+            print(f"\n⛔ Stopped early: {self.stop_reason()}")
+        if self.results["failed"] > 0:
+            print("\n⚠️  FAILED - Architecture requirements not met")
+            print(f"\n{self.results['failed']} requirement(s) need to be addressed.")
+        else:
+            print("\n✅ PASSED - All architecture requirements met!")
+        
+        print("\nReports saved:")
+        for name in ("QA_RESULTS.json", "QA_REPORT.md"):
+            path = self.output_dir / name
+            print(f"  - {path.relative_to(self.root) if path.is_relative_to(self.root) else path}")
+        print()
@@ -0,0 +1,184 @@
+"""
+PartPulse QA System - Watch Mode
+Re-runs affected checks when files change
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from .constants import PRUNED_DIRS, STATUS_ICONS
+from .system import QASystem
+from .history import RunHistory
+
+
+def generated_paths(qa: QASystem, *extra: Optional[Path]) -> Set[str]:
+    """Return the root-relative paths of the files a run writes
+    
+    Watch mode rewrites these after every recheck, so they must never count
+    as changes (QA_REPORT.md is itself an input of the markdown link rules).
+    ``extra`` adds outputs such as the NDJSON file, trace or history database.
+    """
+    root = qa.root.resolve()
+    outputs = [qa.output_dir / "QA_RESULTS.json", qa.output_dir / "QA_REPORT.md"]
+    if qa.costs_path() is not None:
+        outputs.append(qa.costs_path())
+    for path in extra:
+        if path is not None:
+            # SQLite writes its journal next to the database
+            outputs += [Path(path), Path(f"{path}-journal"), Path(f"{path}-wal"), Path(f"{path}-shm")]
+    paths = set()
+    for path in outputs:
+        path = path.resolve()
+        if path.is_relative_to(root):
+            paths.add(path.relative_to(root).as_posix())
+    return paths
+
+
+class PollingWatcher:
+    """Detects changes by polling the stat signature of every requirement input
+    
+    If any requirement is ``tree_wide`` the whole tree is polled instead.
+    """
+    
+    def __init__(self, qa: QASystem, interval: float, ignored: Set[str] = frozenset()):
+        self.root = qa.root
+        self.interval = interval
+        self.ignored = ignored
+        if any(req.tree_wide for req in qa.requirements):
+            self.paths = [""]
+        else:
+            self.paths = sorted({path for req in qa.requirements for path in req.inputs} - ignored)
+        self._signatures = self._scan()
+    
+    def _signature(self, rel_path: str):
+        """Return a comparable stat signature, or None if the path is missing"""
+        try:
+            st = (self.root / rel_path).stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_mode
+    
+    def _scan(self) -> Dict[str, object]:
+        """Stat every watched path, including the files below watched directories"""
+        signatures = {}
+        for path in self.paths:
+            if path:
+                signatures[path] = self._signature(path)
+            if (self.root / path).is_dir():
+                for dirpath, dirnames, filenames in os.walk(self.root / path):
+                    dirnames[:] = [name for name in dirnames if name not in PRUNED_DIRS]
+                    rel_dir = Path(dirpath).relative_to(self.root).as_posix()
+                    for name in filenames:
+                        rel_path = name if rel_dir == "." else f"{rel_dir}/{name}"
+                        if rel_path not in self.ignored:
+                            signatures[rel_path] = self._signature(rel_path)
+        return signatures
+    
+    def wait(self) -> Set[str]:
+        """Block until at least one watched path changes and return the changed paths"""
+        while True:
+            time.sleep(self.interval)
+            signatures = self._scan()
+            changed = {path for path in signatures.keys() | self._signatures.keys() if signatures.get(path) != self._signatures.get(path)}
+            self._signatures = signatures
+            if changed:
+                return changed
+    
+    def close(self):
+        """Release watcher resources"""
+
+
+class EventWatcher:
+    """Collects filesystem change events via the optional watchdog package"""
+    
+    def __init__(self, qa: QASystem, interval: float, ignored: Set[str] = frozenset()):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+        
+        self.root = qa.root.resolve()
+        self.index = qa.index
+        self.interval = interval
+        self.ignored = ignored
+        self._changed: Set[str] = set()
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        
+        watcher = self
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    if path:
+                        watcher._record(path)
+        
+        self._observer = Observer()
+        self._observer.schedule(Handler(), str(self.root), recursive=True)
+        self._observer.start()
+    
+    def _record(self, path: str):
+        """Queue an absolute event path as a root-relative path"""
+        try:
+            rel_path = Path(os.fsdecode(path)).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return
+        if not self.index.covers(rel_path) or rel_path in self.ignored:
+            return
+        with self._lock:
+            self._changed.add(rel_path)
+        self._event.set()
+    
+    def wait(self) -> Set[str]:
+        """Block until events arrive, debounce briefly and return the changed paths"""
+        self._event.wait()
+        time.sleep(min(self.interval, 0.1))
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            self._event.clear()
+        return changed
+    
+    def close(self):
+        """Stop the observer thread"""
+        self._observer.stop()
+        self._observer.join()
+
+
+def watch(qa: QASystem, jobs: int, interval: float, ndjson_path: Optional[Path] = None, history: Optional[RunHistory] = None, trace_path: Optional[Path] = None):
+    """Re-validate requirements in place whenever one of their inputs changes"""
+    ignored = generated_paths(qa, ndjson_path, trace_path, history.path if history else None)
+    try:
+        watcher = EventWatcher(qa, interval, ignored)
+        mode = "filesystem events"
+    except (ImportError, OSError):
+        watcher = PollingWatcher(qa, interval, ignored)
+        mode = f"polling every {interval:g}s"
+    
+    print(f"👀 Watching {len(qa.requirements)} requirements ({mode}), Ctrl+C to stop\n")
+    try:
+        while True:
+            changed_paths = watcher.wait() - ignored
+            if not any(req.touches(changed_paths) for req in qa.requirements):
+                continue
+            started = time.perf_counter()
+            deltas = qa.recheck(changed_paths, jobs)
+            qa.save_reports(quiet=True, ndjson_path=ndjson_path)
+            if history is not None:
+                history.record(qa)
+            elapsed = (time.perf_counter() - started) * 1000
+            
+            stamp = datetime.now().strftime("%H:%M:%S")
+            print(
+                f"[{stamp}] {len(changed_paths)} change(s), "
+                f"{qa.results['passed']}/{qa.results['total_requirements']} passing "
+                f"({elapsed:.0f} ms)"
+            )
+            for req, previous in deltas:
+                icon = STATUS_ICONS.get(req.status, "❌")
+                print(f"  {icon} {req.category} / {req.name}: {previous} → {req.status} ({req.details})")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
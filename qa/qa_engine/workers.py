@@ -0,0 +1,183 @@
+"""
+PartPulse QA System - Check Workers
+Runs checks in killable forked worker processes
+"""
+
+import sys
+import multiprocessing
+import multiprocessing.connection
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from .constants import CHECK_TIMEOUT
+from .plan import Requirement
+
+if TYPE_CHECKING:
+    from .system import QASystem
+
+
+def _check_worker(qa: "QASystem", conn):
+    """Evaluate requirements by index until told to stop (runs in a forked process)"""
+    while True:
+        try:
+            position = conn.recv()
+        except EOFError:
+            break
+        if position is None:
+            break
+        req = qa.requirements[position]
+        cache = qa.result_cache
+        counters = (cache.hits, cache.misses, cache.stores) if cache else (0, 0, 0)
+        try:
+            status, details = qa.evaluate_cached(req)
+        except Exception as e:
+            conn.send({"error": f"{type(e).__name__}: {e}"})
+            continue
+        after = (cache.hits, cache.misses, cache.stores) if cache else (0, 0, 0)
+        conn.send({
+            "status": status,
+            "details": details,
+            "started": req.started,
+            "wall_time": req.wall_time,
+            "bytes_read": req.bytes_read,
+            "files_touched": req.files_touched,
+            "payload": req.payload,
+            "cache": [b - a for a, b in zip(counters, after)],
+        })
+
+
+class CheckWorkerPool:
+    """Reusable forked worker processes that evaluate checks under time budgets
+    
+    Workers are forked from the loaded QASystem, so requirements (whose checks
+    are closures) are sent by their position in ``qa.requirements`` and only
+    outcomes cross the pipe. A check running longer than ``check_timeout``
+    has its worker killed and replaced and is reported as TIMEOUT. Once
+    ``run_timeout`` has elapsed every running check is reported as TIMEOUT
+    and nothing further is dispatched (``exhausted`` is set).
+    """
+    
+    def __init__(self, qa: "QASystem", workers: int, check_timeout: Optional[float] = CHECK_TIMEOUT, run_timeout: Optional[float] = None):
+        self.qa = qa
+        self.workers = max(1, workers)
+        self.check_timeout = check_timeout
+        self.deadline = time.monotonic() + run_timeout if run_timeout else None
+        self.run_timeout = run_timeout
+        self.exhausted = False
+        self.timeouts = 0
+        self._context = multiprocessing.get_context("fork")
+        self._live: Dict[object, multiprocessing.Process] = {}
+    
+    @staticmethod
+    def available() -> bool:
+        """Check if worker processes can be forked on this platform"""
+        return "fork" in multiprocessing.get_all_start_methods()
+    
+    def _spawn(self):
+        """Fork a worker and return the parent's end of its pipe"""
+        # Unflushed output would otherwise be written again by the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_check_worker, args=(self.qa, child_conn), daemon=True)
+        process.start()
+        child_conn.close()
+        self._live[parent_conn] = process
+        return parent_conn
+    
+    def _kill(self, conn):
+        """Kill a worker (e.g. one stuck in a check)"""
+        process = self._live.pop(conn)
+        process.kill()
+        process.join()
+        conn.close()
+    
+    def _apply(self, req: Requirement, message: Dict, pid: int) -> Tuple[str, str]:
+        """Copy a worker's outcome, costs and payload onto the parent"""
+        if "error" in message:
+            raise RuntimeError(f"{req.category} / {req.name}: check raised {message['error']}")
+        req.started = message["started"]
+        req.wall_time = message["wall_time"]
+        req.bytes_read = message["bytes_read"]
+        req.files_touched = message["files_touched"]
+        req.thread = pid
+        req.payload = message["payload"]
+        cache = self.qa.result_cache
+        if cache is not None:
+            hits, misses, stores = message["cache"]
+            cache.hits += hits
+            cache.misses += misses
+            cache.stores += stores
+        return message["status"], message["details"]
+    
+    def _timed_out(self, req: Requirement, started: float, details: str) -> Tuple[str, str]:
+        """Record the cost of a killed check and return its TIMEOUT outcome"""
+        self.timeouts += 1
+        req.started = started - self.qa.epoch
+        req.wall_time = time.perf_counter() - started
+        req.bytes_read = req.files_touched = 0
+        return "TIMEOUT", details
+    
+    def run(self, requirements: List[Requirement]) -> Iterator[Tuple[Requirement, Tuple[str, str]]]:
+        """Dispatch requirements in order and yield (requirement, (status, details)) as they finish"""
+        positions = {id(req): i for i, req in enumerate(self.qa.requirements)}
+        queue = deque(requirements)
+        idle = [self._spawn() for _ in range(min(self.workers, len(queue)))]
+        # Worker pipe -> (requirement, perf_counter at dispatch)
+        busy: Dict[object, Tuple[Requirement, float]] = {}
+        
+        while queue or busy:
+            while queue and idle:
+                conn = idle.pop()
+                req = queue.popleft()
+                conn.send(positions[id(req)])
+                busy[conn] = (req, time.perf_counter())
+            
+            wake = [started + self.check_timeout - time.perf_counter() for _, started in busy.values()] if self.check_timeout else []
+            if self.deadline is not None:
+                wake.append(self.deadline - time.monotonic())
+            ready = multiprocessing.connection.wait(list(busy), timeout=max(0.0, min(wake)) if wake else None)
+            
+            for conn in ready:
+                req, started = busy.pop(conn)
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    pid = self._live[conn].pid
+                    self._kill(conn)
+                    raise RuntimeError(f"{req.category} / {req.name}: check worker {pid} exited unexpectedly")
+                idle.append(conn)
+                yield req, self._apply(req, message, self._live[conn].pid)
+            
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.exhausted = True
+                for conn, (req, started) in list(busy.items()):
+                    self._kill(conn)
+                    del busy[conn]
+                    yield req, self._timed_out(req, started, f"Check was still running when the {self.run_timeout:g}s run budget (--run-timeout) ran out")
+                return
+            
+            if self.check_timeout:
+                for conn, (req, started) in list(busy.items()):
+                    if time.perf_counter() - started >= self.check_timeout:
+                        self._kill(conn)
+                        del busy[conn]
+                        if queue:
+                            idle.append(self._spawn())
+                        yield req, self._timed_out(req, started, f"Check exceeded its {self.check_timeout:g}s time budget (--check-timeout)")
+    
+    def close(self):
+        """Stop idle workers and kill any still running a check"""
+        for conn, process in list(self._live.items()):
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for conn, process in list(self._live.items()):
+            process.join(1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+        self._live.clear()
@@ -5,598 +5,464 @@ Validates codebase against architecture requirements
 """
 
 import os
+import sys
 import json
 import re
+import argparse
+import subprocess
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import List, Optional, Set, Tuple
 
-# Define the project root
-PROJECT_ROOT = Path(__file__).parent.parent
+from qa_engine.constants import (
+    CACHE_DIR, CACHE_MAX_BYTES, CHECK_TIMEOUT, CONTENT_MAX_BYTES, CRITICAL_CATEGORIES,
+    MANIFEST_FILE, PROBE_CONCURRENCY, PROBE_REPEAT, PROBE_TIMEOUT, PROJECT_ROOT, STATUS_ICONS,
+)
+from qa_engine.storage import GitTreeStorage, ResultCache, atomic_writer
+from qa_engine.system import QASystem
+from qa_engine.workers import CheckWorkerPool
+from qa_engine.history import RunHistory
+from qa_engine.watch import watch
 
-
-class Requirement:
-    """Represents a single architecture requirement"""
-    
-    def __init__(self, category: str, name: str, description: str, file_path: str = None, component_check: callable = None):
-        self.category = category
-        self.name = name
-        self.description = description
-        self.file_path = file_path
-        self.component_check = component_check
-        self.status = "RED"
-        self.found = False
-        self.details = ""
+# Engine modules, watched by --changed-since alongside this script
+ENGINE_DIR = Path(__file__).parent / "qa_engine"
 
 
-class QASystem:
-    """Main QA validation system"""
-    
-    def __init__(self):
-        self.requirements: List[Requirement] = []
-        self.results = {
-            "timestamp": datetime.now().isoformat(),
-            "total_requirements": 0,
-            "passed": 0,
-            "failed": 0,
-            "pass_rate": 0.0,
-            "categories": {},
-            "details": []
-        }
-        
-    def add_requirement(self, category: str, name: str, description: str, file_path: str = None, component_check: callable = None):
-        """Add a requirement to check"""
-        req = Requirement(category, name, description, file_path, component_check)
-        self.requirements.append(req)
-        
-    def check_file_exists(self, file_path: str) -> bool:
-        """Check if a file exists"""
-        full_path = PROJECT_ROOT / file_path
-        return full_path.exists() and full_path.is_file()
-    
-    def check_directory_exists(self, dir_path: str) -> bool:
-        """Check if a directory exists"""
-        full_path = PROJECT_ROOT / dir_path
-        return full_path.exists() and full_path.is_dir()
+def history_main(argv: List[str]):
+    """Query the run history database (``run-qa.py history ...``)"""
+    parser = argparse.ArgumentParser(prog="run-qa.py history", description="Query the QA run history")
+    parser.add_argument(
+        "--db", type=Path, default=os.environ.get("QA_HISTORY_DB"),
+        help="History database (default: $QA_HISTORY_DB)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runs = commands.add_parser("runs", help="List recent runs")
+    runs.add_argument("--limit", type=int, default=20)
+    trend = commands.add_parser("trend", help="Pass rate per category over recent runs")
+    trend.add_argument("--category", default=None)
+    trend.add_argument("--limit", type=int, default=20)
+    first_red = commands.add_parser("first-red", help="Run where a requirement went RED")
+    first_red.add_argument("name")
+    first_red.add_argument("--category", default=None)
+    diff = commands.add_parser("diff", help="Status changes between two runs (default: the last two)")
+    diff.add_argument("old", nargs="?", default=None)
+    diff.add_argument("new", nargs="?", default=None)
+    args = parser.parse_args(argv)
     
-    def check_file_contains(self, file_path: str, pattern: str) -> bool:
-        """Check if a file contains a specific pattern"""
-        full_path = PROJECT_ROOT / file_path
-        if not full_path.exists():
-            return False
-        try:
-            content = full_path.read_text()
-            return bool(re.search(pattern, content, re.MULTILINE | re.IGNORECASE))
-        except Exception:
-            return False
+    if args.db is None or not Path(args.db).exists():
+        parser.error("no history database (pass --db or set QA_HISTORY_DB)")
+    history = RunHistory(Path(args.db))
+    try:
+        if args.command == "runs":
+            rows = history.runs(args.limit)
+        elif args.command == "trend":
+            rows = history.trend(args.category, args.limit)
+        elif args.command == "first-red":
+            rows = history.first_red(args.name, args.category)
+        else:
+            new_run = history.resolve_run(args.new)
+            old_run = history.resolve_run(args.old, offset=1)
+            if old_run is None or new_run is None:
+                parser.error("diff needs two recorded runs")
+            rows = history.diff(old_run, new_run)
+    finally:
+        history.close()
     
-    def load_architecture_requirements(self):
-        """Load requirements from architecture.md"""
-        
-        # Configuration Files
-        config_files = [
-            ("Configuration", "package.json", "Package configuration file", "package.json"),
-            ("Configuration", "tsconfig.json", "TypeScript configuration", "tsconfig.json"),
-            ("Configuration", "eslint.config.mjs", "ESLint configuration", "eslint.config.mjs"),
-            ("Configuration", "next.config.ts", "Next.js configuration", "next.config.ts"),
-            ("Configuration", "tailwind.config.ts", "Tailwind CSS configuration", "tailwind.config.ts"),
-            ("Configuration", ".env.example", "Environment variables template", ".env.example"),
-            ("Configuration", ".gitignore", "Git ignore patterns", ".gitignore"),
-        ]
-        
-        for cat, name, desc, path in config_files:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Database Files
-        db_files = [
-            ("Database", "prisma/schema.prisma", "Database schema file", "prisma/schema.prisma"),
-            ("Database", "prisma/seed.ts", "Database seed script", "prisma/seed.ts"),
-            ("Database", "lib/prisma.ts", "Prisma client singleton", "lib/prisma.ts"),
-        ]
-        
-        for cat, name, desc, path in db_files:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Authentication Files
-        auth_files = [
-            ("Authentication", "lib/auth.ts", "NextAuth configuration", "lib/auth.ts"),
-            ("Authentication", "app/api/auth/[...nextauth]/route.ts", "Auth API endpoints", "app/api/auth/[...nextauth]/route.ts"),
-            ("Authentication", "middleware.ts", "Route protection middleware", "middleware.ts"),
-        ]
-        
-        for cat, name, desc, path in auth_files:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # App Pages
-        app_pages = [
-            ("App Pages", "app/layout.tsx", "Root layout with sidebar", "app/layout.tsx"),
-            ("App Pages", "app/page.tsx", "Dashboard/home page", "app/page.tsx"),
-            ("App Pages", "app/internal-transfer/page.tsx", "Internal transfer list page", "app/internal-transfer/page.tsx"),
-            ("App Pages", "app/warranty/page.tsx", "Warranty claims list page", "app/warranty/page.tsx"),
-            ("App Pages", "app/users/invite/page.tsx", "User invitation page", "app/users/invite/page.tsx"),
-            ("App Pages", "app/reports/page.tsx", "Reports dashboard page", "app/reports/page.tsx"),
-            ("App Pages", "app/settings/page.tsx", "Settings page", "app/settings/page.tsx"),
-        ]
-        
-        for cat, name, desc, path in app_pages:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # UI Components
-        ui_components = [
-            ("UI Components", "components/ui/sidebar.tsx", "Navigation sidebar component", "components/ui/sidebar.tsx"),
-            ("UI Components", "components/ui/button.tsx", "Button component", "components/ui/button.tsx"),
-            ("UI Components", "components/ui/input.tsx", "Input component", "components/ui/input.tsx"),
-            ("UI Components", "components/ui/select.tsx", "Select component", "components/ui/select.tsx"),
-            ("UI Components", "components/ui/modal.tsx", "Modal component", "components/ui/modal.tsx"),
-            ("UI Components", "components/ui/table.tsx", "Table component", "components/ui/table.tsx"),
-            ("UI Components", "components/ui/badge.tsx", "Badge component", "components/ui/badge.tsx"),
-            ("UI Components", "components/ui/card.tsx", "Card component", "components/ui/card.tsx"),
-        ]
-        
-        for cat, name, desc, path in ui_components:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Form Components
-        form_components = [
-            ("Form Components", "components/forms/transfer-form.tsx", "Transfer form component", "components/forms/transfer-form.tsx"),
-            ("Form Components", "components/forms/warranty-form.tsx", "Warranty form component", "components/forms/warranty-form.tsx"),
-            ("Form Components", "components/forms/user-invite-form.tsx", "User invite form component", "components/forms/user-invite-form.tsx"),
-        ]
-        
-        for cat, name, desc, path in form_components:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # API Routes
-        api_routes = [
-            ("API Routes", "app/api/transfers/route.ts", "Transfer CRUD API", "app/api/transfers/route.ts"),
-            ("API Routes", "app/api/internal-transfer/route.ts", "Internal Transfer API (Wave 2)", "app/api/internal-transfer/route.ts"),
-            ("API Routes", "app/api/claims/route.ts", "Warranty claim CRUD API", "app/api/claims/route.ts"),
-            ("API Routes", "app/api/users/route.ts", "User management API", "app/api/users/route.ts"),
-            ("API Routes", "app/api/users/invite/route.ts", "User invitation API", "app/api/users/invite/route.ts"),
-            ("API Routes", "app/api/reports/route.ts", "Report generation API", "app/api/reports/route.ts"),
-            ("API Routes", "app/api/pdf/route.ts", "PDF generation API", "app/api/pdf/route.ts"),
-            ("API Routes", "app/api/email/route.ts", "Email sending API", "app/api/email/route.ts"),
-            ("API Routes", "app/api/audit/route.ts", "Audit log API", "app/api/audit/route.ts"),
-        ]
-        
-        for cat, name, desc, path in api_routes:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Wave 2 - Internal Transfer Workflow
-        wave2_components = [
-            ("Wave 2 - Internal Transfer", "app/internal-transfer/InternalTransferForm.tsx", "Internal Transfer form component", "app/internal-transfer/InternalTransferForm.tsx"),
-            ("Wave 2 - Internal Transfer", "app/internal-transfer/success/page.tsx", "Transfer success page", "app/internal-transfer/success/page.tsx"),
-            ("Wave 2 - Internal Transfer", "app/internal-transfer/[id]/page.tsx", "Transfer report page", "app/internal-transfer/[id]/page.tsx"),
-            ("Wave 2 - Internal Transfer", "lib/db/schema.ts", "Data model/schema", "lib/db/schema.ts"),
-            ("Wave 2 - Internal Transfer", "lib/pdf/internalTransferPdf.ts", "PDF generation stub", "lib/pdf/internalTransferPdf.ts"),
-            ("Wave 2 - Internal Transfer", "components/ui/input.tsx", "Input component", "components/ui/Input.tsx"),
-            ("Wave 2 - Internal Transfer", "components/ui/select.tsx", "Select component", "components/ui/Select.tsx"),
-        ]
-        
-        for cat, name, desc, path in wave2_components:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Wave 3 - Warranty Claims Workflow
-        wave3_components = [
-            ("Wave 3 - Warranty Claims", "app/warranty-claims/WarrantyClaimForm.tsx", "Warranty Claim form component", "app/warranty-claims/WarrantyClaimForm.tsx"),
-            ("Wave 3 - Warranty Claims", "app/warranty-claims/[id]/page.tsx", "Warranty claim report page", "app/warranty-claims/[id]/page.tsx"),
-            ("Wave 3 - Warranty Claims", "app/api/warranty-claims/route.ts", "Warranty Claims API route", "app/api/warranty-claims/route.ts"),
-            ("Wave 3 - Warranty Claims", "lib/pdf/warrantyClaimPdf.ts", "Warranty PDF generation", "lib/pdf/warrantyClaimPdf.ts"),
-            ("Wave 3 - Warranty Claims", "public/assets/logo/trane-logo.svg", "Trane logo placeholder", "public/assets/logo/trane-logo.svg"),
-            ("Wave 3 - Warranty Claims", "public/assets/logo/trane-tech-logo.svg", "Trane Technologies logo placeholder", "public/assets/logo/trane-tech-logo.svg"),
-        ]
-        
-        for cat, name, desc, path in wave3_components:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Utilities
-        utilities = [
-            ("Utilities", "lib/validators.ts", "Zod validation schemas", "lib/validators.ts"),
-            ("Utilities", "lib/utils.ts", "Helper functions", "lib/utils.ts"),
-            ("Utilities", "lib/email.ts", "Email utilities", "lib/email.ts"),
-            ("Utilities", "lib/pdf.ts", "PDF generation utilities", "lib/pdf.ts"),
-            ("Utilities", "lib/constants.ts", "App constants", "lib/constants.ts"),
-        ]
-        
-        for cat, name, desc, path in utilities:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Types
-        types = [
-            ("Types", "types/index.ts", "TypeScript type definitions", "types/index.ts"),
-            ("Types", "types/api.ts", "API type definitions", "types/api.ts"),
-        ]
-        
-        for cat, name, desc, path in types:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Documentation
-        docs = [
-            ("Documentation", "README.md", "Project overview", "README.md"),
-            ("Documentation", "rules.md", "App rules and specifications", "rules.md"),
-            ("Documentation", "architecture/architecture.md", "Architecture specification", "architecture/architecture.md"),
-        ]
-        
-        for cat, name, desc, path in docs:
-            self.add_requirement(cat, name, desc, file_path=path)
-        
-        # Component Checks (content validation)
-        self.add_requirement(
-            "Component Content",
-            "Sidebar Navigation",
-            "Sidebar contains all required navigation items",
-            component_check=self.check_sidebar_navigation
-        )
-        
-        self.add_requirement(
-            "Component Content",
-            "Primary Color",
-            "Tailwind config uses primary color #FF2B00",
-            component_check=self.check_primary_color
-        )
-        
-        self.add_requirement(
-            "Database Schema",
-            "User Model",
-            "User model exists in Prisma schema",
-            component_check=self.check_user_model
-        )
-        
-        self.add_requirement(
-            "Database Schema",
-            "Transfer Model",
-            "Transfer model exists in Prisma schema",
-            component_check=self.check_transfer_model
-        )
-        
-        self.add_requirement(
-            "Architecture Documentation",
-            "Internal Transfer Workflow",
-            "Architecture document contains Internal Transfer workflow description",
-            component_check=self.check_internal_transfer_workflow_docs
-        )
-        
-        self.add_requirement(
-            "Architecture Documentation",
-            "Warranty Claims Workflow",
-            "Architecture document contains Warranty Claims workflow description",
-            component_check=self.check_warranty_workflow_docs
-        )
-        
-        self.add_requirement(
-            "Data Schema",
-            "Warranty Claim Schema",
-            "WarrantyClaim interface exists in schema.ts",
-            component_check=self.check_warranty_schema
-        )
-        
-        self.add_requirement(
-            "Data Schema",
-            "Warranty Item Schema",
-            "WarrantyItem interface exists in schema.ts",
-            component_check=self.check_warranty_item_schema
-        )
-        
-        self.add_requirement(
-            "Database Schema",
-            "Warranty Claim Model",
-            "WarrantyClaim model exists in Prisma schema",
-            component_check=self.check_warranty_model
-        )
-        
-        self.add_requirement(
-            "Database Schema",
-            "Audit Log Model",
-            "AuditLog model exists in Prisma schema",
-            component_check=self.check_audit_model
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    if args.command == "runs":
+        for row in rows:
+            source = f" {row['ref']}@{row['commit_sha'][:12]}" if row["ref"] else ""
+            print(f"#{row['id']:<5} {row['timestamp']}{source}  "
+                  f"{row['passed']}/{row['total']} passing ({row['pass_rate']:.1f}%)")
+    elif args.command == "trend":
+        category = None
+        for row in rows:
+            if row["category"] != category:
+                category = row["category"]
+                print(f"\n{category}")
+            print(f"  #{row['run_id']:<5} {row['timestamp']}  {row['passed']}/{row['total']}  {row['pass_rate']:.1f}%")
+    elif args.command == "first-red":
+        if not rows:
+            print(f"{args.name} has never been RED")
+        for row in rows:
+            state = "RED since" if row["current"] else "last went RED in"
+            print(f"❌ {row['category']} / {row['name']}: {state} run #{row['run_id']} ({row['timestamp']})")
+            print(f"   {row['details']}")
+    else:
+        print(f"Run #{old_run} → #{new_run}: {len(rows)} change(s)")
+        for row in rows:
+            icon = STATUS_ICONS.get(row["new_status"], "❌")
+            print(f"  {icon} {row['category']} / {row['name']}: {row['old_status'] or 'absent'} → {row['new_status'] or 'absent'}")
+
+
+def print_profile_row(label: str, millis: float, extra: str = ""):
+    """Print one aligned profile line"""
+    print(f"  {millis:>10.2f} ms  {label}{extra}")
+
+
+def print_profile(qa: QASystem):
+    """Print phase spans and the ten slowest requirements"""
+    print("⏱️  Phase timings:")
+    for phase, (start, end) in qa.spans.items():
+        print_profile_row(phase, (end - start) * 1000)
+    print("\n🐢 Slowest requirements:")
+    for req in qa.slowest_requirements(10):
+        print_profile_row(
+            f"{req.category} / {req.name}", req.wall_time * 1000,
+            f" ({req.bytes_read} bytes, {req.files_touched} file(s))"
         )
+    print()
+
+
+def git_changed_paths(root: Path, ref: str, target: Optional[str] = None) -> Set[str]:
+    """List paths changed since ``ref``
     
-    def check_sidebar_navigation(self) -> Tuple[bool, str]:
-        """Check if sidebar has all required navigation items"""
-        if not self.check_file_exists("components/ui/sidebar.tsx"):
-            return False, "Sidebar component file not found"
-        
-        required_items = [
-            "Internal Transfer",
-            "Warranty",
-            "Invite",
-            "Reports",
-            "Settings"
-        ]
-        
-        content = (PROJECT_ROOT / "components/ui/sidebar.tsx").read_text()
-        missing = [item for item in required_items if item.lower() not in content.lower()]
-        
-        if missing:
-            return False, f"Missing navigation items: {', '.join(missing)}"
-        return True, "All navigation items present"
-    
-    def check_primary_color(self) -> Tuple[bool, str]:
-        """Check if primary color is set correctly"""
-        config_files = ["tailwind.config.js", "tailwind.config.ts", "app/globals.css"]
-        
-        for config_file in config_files:
-            if self.check_file_exists(config_file):
-                content = (PROJECT_ROOT / config_file).read_text()
-                if "#FF2B00" in content or "FF2B00" in content:
-                    return True, f"Primary color #FF2B00 found in {config_file}"
-        
-        return False, "Primary color #FF2B00 not found in Tailwind config or globals.css"
-    
-    def check_user_model(self) -> Tuple[bool, str]:
-        """Check if User model exists in Prisma schema"""
-        if not self.check_file_exists("prisma/schema.prisma"):
-            return False, "Prisma schema file not found"
-        
-        if self.check_file_contains("prisma/schema.prisma", r"model\s+User\s*{"):
-            return True, "User model found"
-        return False, "User model not found"
-    
-    def check_transfer_model(self) -> Tuple[bool, str]:
-        """Check if Transfer model exists in Prisma schema"""
-        if not self.check_file_exists("prisma/schema.prisma"):
-            return False, "Prisma schema file not found"
-        
-        if self.check_file_contains("prisma/schema.prisma", r"model\s+Transfer\s*{"):
-            return True, "Transfer model found"
-        return False, "Transfer model not found"
-    
-    def check_warranty_model(self) -> Tuple[bool, str]:
-        """Check if WarrantyClaim model exists in Prisma schema"""
-        if not self.check_file_exists("prisma/schema.prisma"):
-            return False, "Prisma schema file not found"
-        
-        if self.check_file_contains("prisma/schema.prisma", r"model\s+WarrantyClaim\s*{"):
-            return True, "WarrantyClaim model found"
-        return False, "WarrantyClaim model not found"
-    
-    def check_audit_model(self) -> Tuple[bool, str]:
-        """Check if AuditLog model exists in Prisma schema"""
-        if not self.check_file_exists("prisma/schema.prisma"):
-            return False, "Prisma schema file not found"
-        
-        if self.check_file_contains("prisma/schema.prisma", r"model\s+AuditLog\s*{"):
-            return True, "AuditLog model found"
-        return False, "AuditLog model not found"
-    
-    def check_internal_transfer_workflow_docs(self) -> Tuple[bool, str]:
-        """Check if architecture.md contains Internal Transfer workflow documentation"""
-        if not self.check_file_exists("architecture/architecture.md"):
-            return False, "Architecture document not found"
-        
-        if self.check_file_contains("architecture/architecture.md", r"Internal Transfer Workflow"):
-            return True, "Internal Transfer workflow documentation found"
-        return False, "Internal Transfer workflow not documented in architecture.md"
-    
-    def check_warranty_workflow_docs(self) -> Tuple[bool, str]:
-        """Check if architecture.md contains Warranty Claims workflow documentation"""
-        if not self.check_file_exists("architecture/architecture.md"):
-            return False, "Architecture document not found"
-        
-        if self.check_file_contains("architecture/architecture.md", r"Warranty Claims Workflow"):
-            return True, "Warranty Claims workflow documentation found"
-        return False, "Warranty Claims workflow not documented in architecture.md"
-    
-    def check_warranty_schema(self) -> Tuple[bool, str]:
-        """Check if WarrantyClaim interface exists in schema.ts"""
-        if not self.check_file_exists("lib/db/schema.ts"):
-            return False, "Schema file not found"
-        
-        if self.check_file_contains("lib/db/schema.ts", r"interface\s+WarrantyClaim\s*{"):
-            return True, "WarrantyClaim interface found in schema.ts"
-        return False, "WarrantyClaim interface not found in schema.ts"
-    
-    def check_warranty_item_schema(self) -> Tuple[bool, str]:
-        """Check if WarrantyItem interface exists in schema.ts"""
-        if not self.check_file_exists("lib/db/schema.ts"):
-            return False, "Schema file not found"
-        
-        if self.check_file_contains("lib/db/schema.ts", r"interface\s+WarrantyItem\s*{"):
-            return True, "WarrantyItem interface found in schema.ts"
-        return False, "WarrantyItem interface not found in schema.ts"
-    
-    def run_checks(self):
-        """Run all requirement checks"""
-        for req in self.requirements:
-            if req.file_path:
-                # File existence check
-                req.found = self.check_file_exists(req.file_path)
-                req.status = "GREEN" if req.found else "RED"
-                req.details = f"File {'exists' if req.found else 'missing'}: {req.file_path}"
-            
-            if req.component_check:
-                # Component-specific check
-                req.found, req.details = req.component_check()
-                req.status = "GREEN" if req.found else "RED"
-        
-        # Calculate statistics
-        self.results["total_requirements"] = len(self.requirements)
-        self.results["passed"] = sum(1 for req in self.requirements if req.status == "GREEN")
-        self.results["failed"] = sum(1 for req in self.requirements if req.status == "RED")
-        self.results["pass_rate"] = (self.results["passed"] / self.results["total_requirements"] * 100) if self.results["total_requirements"] > 0 else 0
-        
-        # Group by category
-        for req in self.requirements:
-            if req.category not in self.results["categories"]:
-                self.results["categories"][req.category] = {
-                    "total": 0,
-                    "passed": 0,
-                    "failed": 0,
-                    "pass_rate": 0.0
-                }
-            
-            cat = self.results["categories"][req.category]
-            cat["total"] += 1
-            if req.status == "GREEN":
-                cat["passed"] += 1
-            else:
-                cat["failed"] += 1
-        
-        # Calculate category pass rates
-        for cat in self.results["categories"].values():
-            cat["pass_rate"] = (cat["passed"] / cat["total"] * 100) if cat["total"] > 0 else 0
-        
-        # Store details
-        self.results["details"] = [
-            {
-                "category": req.category,
-                "name": req.name,
-                "description": req.description,
-                "status": req.status,
-                "details": req.details
-            }
-            for req in self.requirements
-        ]
-    
-    def generate_markdown_report(self) -> str:
-        """Generate markdown report"""
-        report = []
-        report.append("# PartPulse QA Report")
-        report.append("")
-        report.append(f"**Generated**: {self.results['timestamp']}")
-        report.append("")
-        
-        # Summary
-        report.append("## Summary")
-        report.append("")
-        report.append(f"- **Total Requirements**: {self.results['total_requirements']}")
-        report.append(f"- **Passed**: {self.results['passed']} ✅")
-        report.append(f"- **Failed**: {self.results['failed']} ❌")
-        report.append(f"- **Pass Rate**: {self.results['pass_rate']:.1f}%")
-        report.append("")
-        
-        # Category Summary
-        report.append("## Results by Category")
-        report.append("")
-        report.append("| Category | Total | Passed | Failed | Pass Rate |")
-        report.append("|----------|-------|--------|--------|-----------|")
-        
-        for cat_name, cat_data in sorted(self.results["categories"].items()):
-            report.append(
-                f"| {cat_name} | {cat_data['total']} | "
-                f"{cat_data['passed']} ✅ | {cat_data['failed']} ❌ | "
-                f"{cat_data['pass_rate']:.1f}% |"
-            )
-        
-        report.append("")
-        
-        # Detailed Results
-        report.append("## Detailed Results")
-        report.append("")
-        
-        current_category = None
-        for detail in self.results["details"]:
-            if detail["category"] != current_category:
-                current_category = detail["category"]
-                report.append(f"### {current_category}")
-                report.append("")
-            
-            status_icon = "✅" if detail["status"] == "GREEN" else "❌"
-            report.append(f"**{status_icon} {detail['name']}**")
-            report.append(f"- Description: {detail['description']}")
-            report.append(f"- Status: {detail['status']}")
-            report.append(f"- Details: {detail['details']}")
-            report.append("")
-        
-        # Traceability Matrix
-        report.append("## Traceability Matrix")
-        report.append("")
-        report.append("| Requirement | Category | Status | Details |")
-        report.append("|-------------|----------|--------|---------|")
-        
-        for detail in self.results["details"]:
-            status_icon = "✅" if detail["status"] == "GREEN" else "❌"
-            report.append(
-                f"| {detail['name']} | {detail['category']} | "
-                f"{status_icon} {detail['status']} | {detail['details']} |"
-            )
-        
-        report.append("")
-        
-        # Next Steps
-        if self.results["failed"] > 0:
-            report.append("## Next Steps")
-            report.append("")
-            report.append("The following items need to be addressed:")
-            report.append("")
-            
-            for detail in self.results["details"]:
-                if detail["status"] == "RED":
-                    report.append(f"- [ ] {detail['name']}: {detail['details']}")
-            
-            report.append("")
-        else:
-            report.append("## ✅ All Requirements Met!")
-            report.append("")
-            report.append("The codebase is fully compliant with the architecture specification.")
-            report.append("")
-        
-        return "\n".join(report)
+    Against the working tree this covers committed, staged, unstaged and
+    untracked changes; with ``target`` it is the diff between two commits.
+    """
+    diff = subprocess.run(
+        ["git", "diff", "--name-only", "--no-renames", "--relative", "-z", ref, *([target] if target else []), "--"],
+        cwd=root, capture_output=True, check=True
+    )
+    paths = diff.stdout.decode("utf-8").split("\0")
+    if target is None:
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+            cwd=root, capture_output=True, check=True
+        )
+        paths += untracked.stdout.decode("utf-8").split("\0")
+    return {path for path in paths if path}
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse "i/n" into (i, n) with 1 <= i <= n"""
+    match = re.fullmatch(r"(\d+)/(\d+)", value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"expected i/n with 1 <= i <= n, got {value!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def merge_main(argv: List[str]):
+    """Combine shard results into full reports (``run-qa.py merge ...``)"""
+    parser = argparse.ArgumentParser(prog="run-qa.py merge", description="Merge sharded QA results")
+    parser.add_argument("shards", nargs="+", type=Path, help="Partial results written by --shard runs")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Directory for the merged reports (default: qa/)")
+    parser.add_argument("--ndjson", type=Path, default=None, help="Also write one JSON record per requirement")
+    parser.add_argument("--history-db", type=Path, default=os.environ.get("QA_HISTORY_DB"), help="Record the merged run")
+    args = parser.parse_args(argv)
     
-    def save_reports(self):
-        """Save QA reports to files"""
-        qa_dir = PROJECT_ROOT / "qa"
-        qa_dir.mkdir(exist_ok=True)
-        
-        # Save JSON results
-        json_path = qa_dir / "QA_RESULTS.json"
-        with open(json_path, "w") as f:
-            json.dump(self.results, f, indent=2)
-        
-        print(f"✅ Saved JSON results to {json_path}")
-        
-        # Save Markdown report
-        md_path = qa_dir / "QA_REPORT.md"
-        with open(md_path, "w") as f:
-            f.write(self.generate_markdown_report())
-        
-        print(f"✅ Saved Markdown report to {md_path}")
+    shards = []
+    for path in args.shards:
+        try:
+            with open(path, encoding="utf-8") as f:
+                shards.append(json.load(f))
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read {path}: {e}")
     
-    def print_summary(self):
-        """Print summary to console"""
-        print("\n" + "=" * 70)
-        print("PartPulse QA System - Results Summary")
-        print("=" * 70)
-        print(f"Total Requirements: {self.results['total_requirements']}")
-        print(f"Passed: {self.results['passed']} ✅")
-        print(f"Failed: {self.results['failed']} ❌")
-        print(f"Pass Rate: {self.results['pass_rate']:.1f}%")
-        print("=" * 70)
-        
-        if self.results["failed"] > 0:
-            print("\n⚠️  FAILED - Architecture requirements not met")
-            print(f"\n{self.results['failed']} requirement(s) need to be addressed.")
-        else:
-            print("\n✅ PASSED - All architecture requirements met!")
-        
-        print("\nReports saved:")
-        print(f"  - qa/QA_RESULTS.json")
-        print(f"  - qa/QA_REPORT.md")
-        print()
+    qa = QASystem(output_dir=args.output_dir)
+    try:
+        qa.load_shards(shards)
+    except (KeyError, ValueError) as e:
+        parser.error(f"cannot merge: {e}")
+    print(f"🧩 Merged {len(shards)} shard(s), {len(qa.requirements)} requirements")
+    qa.save_reports(ndjson_path=args.ndjson)
+    if args.history_db:
+        history = RunHistory(Path(args.history_db))
+        run_id = history.record(qa)
+        history.close()
+        print(f"✅ Recorded run #{run_id} in {args.history_db}")
+    qa.print_summary()
+
+
+def resolve_jobs(value: Optional[int]) -> int:
+    """Resolve the checker thread count from the CLI or QA_JOBS (0 = one per CPU)"""
+    if value is None:
+        value = int(os.environ.get("QA_JOBS", "1") or 1)
+    if value <= 0:
+        value = os.cpu_count() or 1
+    return value
+
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Validate the codebase against architecture requirements")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="Number of checker threads (default: $QA_JOBS or 1; 0 = one per CPU)"
+    )
+    parser.add_argument(
+        "--ref", metavar="COMMIT", default=None,
+        help="Validate the tree of a git commit, branch or tag instead of the working tree"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=None,
+        help="Directory for QA_RESULTS.json and QA_REPORT.md (default: qa/)"
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REF", default=None,
+        help="Only re-check requirements whose inputs changed since the git REF"
+    )
+    parser.add_argument(
+        "--case-insensitive", action="store_true",
+        help="Match required paths regardless of case (mismatches are still reported)"
+    )
+    parser.add_argument(
+        "--ndjson", type=Path, default=None, metavar="PATH",
+        help="Also write one JSON record per requirement to PATH"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print phase timings and the ten slowest requirements"
+    )
+    parser.add_argument(
+        "--trace", type=Path, default=None, metavar="PATH",
+        help="Write a Chrome trace-event JSON file (open in chrome://tracing or Perfetto)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and re-check requirements whenever their inputs change"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.5,
+        help="Seconds between polls when watchdog is not installed (default: 0.5)"
+    )
+    parser.add_argument(
+        "--probe-url", metavar="URL", default=None,
+        help="Probe the API routes of the app running at URL (e.g. http://localhost:3000)"
+    )
+    parser.add_argument(
+        "--probe-stub", action="store_true",
+        help="Probe the API routes against a local stub server instead of the app"
+    )
+    parser.add_argument(
+        "--probe-config", type=Path, default=None,
+        help="JSON list of extra or overriding probe requests"
+    )
+    parser.add_argument(
+        "--probe-concurrency", type=int, default=PROBE_CONCURRENCY,
+        help=f"Maximum concurrent probe requests and pooled connections (default: {PROBE_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--probe-timeout", type=float, default=PROBE_TIMEOUT,
+        help=f"Per-request probe timeout in seconds (default: {PROBE_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--probe-repeat", type=int, default=PROBE_REPEAT,
+        help=f"Requests per route, for latency percentiles (default: {PROBE_REPEAT})"
+    )
+    parser.add_argument(
+        "--max-file-mb", type=float, default=CONTENT_MAX_BYTES / (1024 * 1024),
+        help="Content rules report TOO_LARGE for files above this size (default: 16)"
+    )
+    parser.add_argument(
+        "--shard", type=parse_shard, metavar="I/N", default=None,
+        help="Check only shard I of N and write a partial results file for 'merge'"
+    )
+    parser.add_argument(
+        "--fail-fast", action="store_true",
+        help=f"Stop at the first RED in a critical category ({', '.join(CRITICAL_CATEGORIES)}) and exit 1 on any RED"
+    )
+    parser.add_argument(
+        "--isolate", action="store_true",
+        help="Run checks in a pool of --jobs worker processes that can be killed on timeout"
+    )
+    parser.add_argument(
+        "--check-timeout", type=float, default=None,
+        help=f"With --isolate, report a check as TIMEOUT after this many seconds (default: {CHECK_TIMEOUT:g}; 0 = none)"
+    )
+    parser.add_argument(
+        "--run-timeout", type=float, default=None,
+        help="With --isolate, stop all checks after this many seconds; running ones are TIMEOUT, the rest SKIPPED"
+    )
+    parser.add_argument(
+        "--history-db", type=Path, default=os.environ.get("QA_HISTORY_DB"),
+        help="Append every run to this SQLite history database (default: $QA_HISTORY_DB)"
+    )
+    parser.add_argument(
+        "--manifest", type=Path, default=None,
+        help=f"Requirement manifest to compile and check (default: {MANIFEST_FILE})"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Do not read or write the persistent result cache"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None,
+        help=f"Result cache directory (default: $QA_CACHE_DIR or {CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=CACHE_MAX_BYTES // (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size"
+    )
+    args = parser.parse_args(argv)
+    if args.watch and args.ref:
+        parser.error("--watch cannot be combined with --ref")
+    if args.watch and args.fail_fast:
+        parser.error("--watch cannot be combined with --fail-fast")
+    if args.watch and args.shard:
+        parser.error("--watch cannot be combined with --shard")
+    if args.probe_url and args.probe_stub:
+        parser.error("--probe-url and --probe-stub are mutually exclusive")
+    if args.watch and (args.probe_url or args.probe_stub):
+        parser.error("--watch cannot be combined with route probes")
+    if args.watch and args.isolate:
+        parser.error("--watch cannot be combined with --isolate")
+    if (args.check_timeout is not None or args.run_timeout is not None) and not args.isolate:
+        parser.error("--check-timeout and --run-timeout require --isolate")
+    if args.isolate and not CheckWorkerPool.available():
+        parser.error("--isolate needs fork(), which this platform does not provide")
+    return args
 
-def main():
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "history":
+        history_main(argv[1:])
+        return
+    if argv and argv[0] == "merge":
+        merge_main(argv[1:])
+        return
+    args = parse_args(argv)
+    jobs = resolve_jobs(args.jobs)
+    
     print("\n🔍 Starting PartPulse QA System...\n")
     
-    qa = QASystem()
+    result_cache = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or Path(os.environ.get("QA_CACHE_DIR") or PROJECT_ROOT / CACHE_DIR)
+        result_cache = ResultCache(cache_dir, args.cache_max_mb * 1024 * 1024)
+    
+    storage = None
+    if args.ref:
+        try:
+            storage = GitTreeStorage(PROJECT_ROOT, args.ref)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            print(f"❌ Could not read {args.ref}: {stderr.decode('utf-8', 'replace').strip() or e}")
+            sys.exit(2)
+        print(f"📌 Validating {args.ref} ({storage.commit[:12]})\n")
+    
+    qa = QASystem(
+        result_cache=result_cache,
+        case_sensitive=not args.case_insensitive,
+        storage=storage,
+        output_dir=args.output_dir,
+        max_content_bytes=int(args.max_file_mb * 1024 * 1024),
+        manifest_path=args.manifest
+    )
     
     # Load requirements from architecture
     print("📋 Loading architecture requirements...")
-    qa.load_architecture_requirements()
+    with qa.span("load"):
+        try:
+            qa.load_architecture_requirements()
+        except (OSError, ValueError) as e:
+            print(f"❌ Invalid requirement manifest {qa.manifest_path}: {e}")
+            sys.exit(2)
+        if args.probe_url or args.probe_stub:
+            qa.load_probe_requirements(args.probe_config)
     print(f"   Loaded {len(qa.requirements)} requirements\n")
     
+    subset = None
+    if args.shard:
+        subset = qa.shard(*args.shard)
+        names = {req.name for req in subset if req.category == "API Probes"}
+        qa.probes = [probe for probe in qa.probes if probe.label in names]
+        print(f"🧩 Shard {args.shard[0]}/{args.shard[1]}: {len(subset)} of {len(qa.requirements)} requirements\n")
+    
+    if qa.probes:
+        target = args.probe_url or "a local stub server"
+        print(f"🌐 Probing {len(qa.probes)} route(s) on {target}...")
+        qa.run_probes(args.probe_url, args.probe_concurrency, args.probe_timeout, args.probe_repeat)
+        probes = qa.results["probes"]
+        print(f"   {probes['requests']} request(s) over {probes['connections']} connection(s)\n")
+    
+    changed_paths = None
+    if args.changed_since:
+        try:
+            changed_paths = git_changed_paths(qa.root, args.changed_since, storage.commit if storage else None)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            print(f"❌ Could not diff against {args.changed_since}: {stderr.decode('utf-8', 'replace').strip() or e}")
+            sys.exit(2)
+        # A change to the checker, its engine or its manifest invalidates every previous result
+        root = qa.root.resolve()
+        checker = [path.resolve() for path in (Path(__file__), *sorted(ENGINE_DIR.glob("*.py")), qa.manifest_path)]
+        changed_checker = [path.name for path in checker if path.is_relative_to(root) and path.relative_to(root).as_posix() in changed_paths]
+        if changed_checker:
+            print(f"   {' and '.join(changed_checker)} changed, running the full suite")
+            changed_paths = None
+        else:
+            print(f"📝 {len(changed_paths)} file(s) changed since {args.changed_since}\n")
+    
     # Run checks
     print("🔎 Running compliance checks...")
-    qa.run_checks()
+    qa.run_checks(
+        jobs=jobs,
+        changed_paths=changed_paths,
+        fail_fast=args.fail_fast,
+        subset=subset,
+        isolate=args.isolate,
+        check_timeout=CHECK_TIMEOUT if args.check_timeout is None else args.check_timeout or None,
+        run_timeout=args.run_timeout or None
+    )
+    if changed_paths is not None:
+        incremental = qa.results["incremental"]
+        print(f"   Re-checked {incremental['evaluated']}, reused {incremental['reused']} previous result(s)")
     print("   Checks complete\n")
     
+    if subset is not None:
+        index, count = args.shard
+        shard_path = qa.output_dir / f"QA_RESULTS.shard-{index}-of-{count}.json"
+        qa.output_dir.mkdir(parents=True, exist_ok=True)
+        with qa.span("report"):
+            with atomic_writer(shard_path) as f:
+                qa.write_shard_results(f, index, count, subset)
+        qa.storage.close()
+        failed = sum(1 for req in subset if req.status not in ("GREEN", "SKIPPED", "WARN"))
+        print(f"✅ Saved shard results to {shard_path}")
+        print(f"   {len(subset) - failed} passed, {failed} failed; combine with 'run-qa.py merge'\n")
+        if args.trace:
+            qa.write_chrome_trace(args.trace)
+        if args.profile:
+            print_profile(qa)
+        if args.fail_fast and failed:
+            sys.exit(1)
+        return
+    
     # Save reports
     print("💾 Generating reports...")
-    qa.save_reports()
+    qa.save_reports(ndjson_path=args.ndjson)
+    
+    qa.storage.close()
+    
+    history = None
+    if args.history_db:
+        history = RunHistory(Path(args.history_db))
+        run_id = history.record(qa)
+        print(f"✅ Recorded run #{run_id} in {args.history_db}")
     
     # Print summary
     qa.print_summary()
+    
+    if args.trace:
+        qa.write_chrome_trace(args.trace)
+        print(f"✅ Saved Chrome trace to {args.trace}\n")
+    
+    if args.profile:
+        print_profile(qa)
+    
+    if args.watch:
+        watch(qa, jobs, args.poll_interval, args.ndjson, history, args.trace)
+    
+    if history is not None:
+        history.close()
+    
+    if args.fail_fast and qa.results["failed"] > 0:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the QA engine tests
+"""
+
+import sys
+import subprocess
+import importlib.util
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+QA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(QA_DIR))
+
+
+def write_tree(root: Path, files: Dict[str, str]) -> Path:
+    """Write ``files`` (relative path -> text) below ``root``"""
+    for rel_path, text in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return root
+
+
+def git(root: Path, *args: str) -> str:
+    """Run a git command in ``root`` with a fixed identity"""
+    result = subprocess.run(
+        ["git", "-c", "user.name=QA", "-c", "user.email=qa@example.com", "-c", "commit.gpgsign=false", *args],
+        cwd=root, capture_output=True, check=True
+    )
+    return result.stdout.decode("utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path: Path):
+    """Return a writer that fills a fresh project tree"""
+    root = tmp_path / "project"
+    root.mkdir()
+    return lambda files: write_tree(root, files)
+
+
+@pytest.fixture
+def repo(tmp_path: Path):
+    """Return an empty git repository"""
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q")
+    return root
+
+
+@pytest.fixture(scope="session")
+def run_qa():
+    """Import the run-qa.py script (its file name is not a valid module name)"""
+    spec = importlib.util.spec_from_file_location("run_qa", QA_DIR / "run-qa.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
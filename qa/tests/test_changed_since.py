@@ -0,0 +1,86 @@
+"""
+--changed-since re-evaluates only the requirements whose inputs changed
+"""
+
+from qa_engine import QASystem
+
+from conftest import git
+
+
+def add_content_requirement(qa, name, path, pattern):
+    qa.add_requirement(
+        "Content", name, f"{path} matches {pattern}",
+        component_check=lambda: (qa.check_file_contains(path, pattern), ""), patterns=[(path, pattern)]
+    )
+
+
+def make_qa(root):
+    qa = QASystem(root=root)
+    qa.add_requirement("Files", "Readme", "README exists", file_path="README.md")
+    add_content_requirement(qa, "Helper", "lib/a.ts", r"export function helper")
+    add_content_requirement(qa, "Other", "lib/b.ts", r"export function other")
+    return qa
+
+
+def test_only_touched_requirements_run(tree):
+    root = tree({"README.md": "# Project\n", "lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function other() {}\n"})
+    qa = make_qa(root)
+    qa.run_checks()
+    qa.save_reports()
+    
+    (root / "lib/a.ts").write_text("// removed\n", encoding="utf-8")
+    qa = make_qa(root)
+    qa.run_checks(changed_paths={"lib/a.ts"})
+    assert qa.results["incremental"] == {"changed_files": 1, "evaluated": 1, "reused": 2}
+    assert {req.name: req.status for req in qa.requirements} == {"Readme": "GREEN", "Helper": "RED", "Other": "GREEN"}
+
+
+def test_new_requirement_always_runs(tree):
+    root = tree({"README.md": "# Project\n", "lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function other() {}\n"})
+    qa = make_qa(root)
+    qa.run_checks()
+    qa.save_reports()
+    
+    qa = make_qa(root)
+    qa.add_requirement("Files", "License", "LICENSE exists", file_path="LICENSE")
+    qa.run_checks(changed_paths=set())
+    assert qa.results["incremental"]["evaluated"] == 1
+    assert qa.requirements[-1].status == "RED"
+
+
+def test_git_changed_paths(repo, run_qa):
+    (repo / "kept.md").write_text("a\n", encoding="utf-8")
+    (repo / "edited.md").write_text("a\n", encoding="utf-8")
+    (repo / "deleted.md").write_text("a\n", encoding="utf-8")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "base")
+    
+    (repo / "edited.md").write_text("b\n", encoding="utf-8")
+    (repo / "deleted.md").unlink()
+    (repo / "new file.md").write_text("c\n", encoding="utf-8")
+    assert run_qa.git_changed_paths(repo, "HEAD") == {"edited.md", "deleted.md", "new file.md"}
+    
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "next")
+    assert run_qa.git_changed_paths(repo, "HEAD~1", "HEAD") == {"edited.md", "deleted.md", "new file.md"}
+    assert run_qa.git_changed_paths(repo, "HEAD") == set()
+
+
+def test_deleted_link_target_reruns_link_rule(tree):
+    root = tree({"docs/index.md": "[guide](guide.md)\n", "docs/guide.md": "# Guide\n", "lib/a.ts": "export function helper() {}\n"})
+    
+    def make_links_qa():
+        qa = make_qa(root)
+        qa.add_link_requirement("Docs", "Links", "Every relative link resolves", prefix="docs")
+        return qa
+    
+    qa = make_links_qa()
+    qa.run_checks()
+    qa.save_reports(quiet=True)
+    assert qa.requirements[-1].status == "GREEN"
+    
+    (root / "docs/guide.md").unlink()
+    qa = make_links_qa()
+    qa.run_checks(changed_paths={"docs/guide.md"})
+    assert qa.requirements[-1].status == "RED"
+    assert qa.results["incremental"]["evaluated"] == 1
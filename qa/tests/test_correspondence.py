@@ -0,0 +1,48 @@
+"""
+Correspondence rules report unmatched keys per rule, in declaration order
+"""
+
+import json
+
+import pytest
+
+from qa_engine import CheckWorkerPool, QASystem
+
+FILES = {
+    "lib/a.ts": "export const ASchema = 1\nexport const BSchema = 2\n",
+    "app/api/items/route.ts": "import { ASchema } from '@/lib/a'\n",
+    "app/api/users/route.ts": "export function GET() {}\n",
+    "__tests__/api/items.test.ts": "import { GET } from '@/app/api/items/route'\n",
+    "tsconfig.json": json.dumps({"compilerOptions": {"paths": {"@/*": ["./*"]}}}),
+}
+
+
+def make_qa(root):
+    qa = QASystem(root=root)
+    qa.add_correspondence_requirement(
+        "Coverage", "Routes Have Tests", "d",
+        left={"files": "app/api/**/route.ts"}, right={"files": "__tests__/api/**/*.test.ts", "key": "imports"},
+    )
+    qa.add_correspondence_requirement(
+        "Schemas", "Schemas Used", "d",
+        left={"files": "lib/a.ts", "key": "exports", "pattern": "Schema$"},
+        right={"files": "app/api/**/route.ts", "key": "imported_names", "module": "lib/a"},
+    )
+    # Critical categories run first, so the schedule reverses declaration order
+    qa.critical_categories = {"Schemas"}
+    return qa
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"jobs": 2},
+    pytest.param({"jobs": 2, "isolate": True}, marks=pytest.mark.skipif(not CheckWorkerPool.available(), reason="needs fork")),
+])
+def test_unmatched_follows_declaration_order(tree, options):
+    qa = make_qa(tree(FILES))
+    qa.run_checks(**options)
+    assert [req.status for req in qa.requirements] == ["RED", "RED"]
+    assert list(qa.results["unmatched"].items()) == [
+        ("Routes Have Tests", ["app/api/users/route.ts"]),
+        ("Schemas Used", ["BSchema"]),
+    ]
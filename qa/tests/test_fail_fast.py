@@ -0,0 +1,45 @@
+"""
+--fail-fast stops dispatching checks but keeps the outcome of every check that ran
+"""
+
+import threading
+
+from qa_engine import QASystem
+
+
+def test_threads_keep_running_checks_and_skip_queued_ones(tree):
+    root = tree({"README.md": "# Title\n"})
+    qa = QASystem(root=root)
+    qa.critical_categories = {"Core Files"}
+    slow_started, failed = threading.Event(), threading.Event()
+    
+    def fail():
+        slow_started.wait(5)
+        failed.set()
+        return False, "broken"
+    
+    def slow():
+        # Still running when the other check stops the run
+        slow_started.set()
+        failed.wait(5)
+        threading.Event().wait(0.3)
+        return True, "fine"
+    
+    def busy():
+        # Keeps the freed worker occupied if it picks this up before the run stops
+        threading.Event().wait(0.2)
+        return True, "fine"
+    
+    qa.add_requirement("Core Files", "Fails", "d", component_check=fail)
+    qa.add_requirement("Core Files", "Slow", "d", component_check=slow)
+    qa.add_requirement("Other", "Busy", "d", component_check=busy)
+    qa.add_requirement("Other", "Queued", "d", component_check=lambda: (True, "fine"))
+    qa.run_checks(jobs=2, fail_fast=True)
+    
+    statuses = {req.name: req.status for req in qa.requirements}
+    assert (statuses["Fails"], statuses["Slow"], statuses["Queued"]) == ("RED", "GREEN", "SKIPPED")
+    assert statuses["Busy"] in ("GREEN", "SKIPPED")
+    assert qa.results["fail_fast"] == {
+        "stopped_at": "Core Files / Fails",
+        "skipped": sum(status == "SKIPPED" for status in statuses.values()),
+    }
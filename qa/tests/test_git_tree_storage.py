@@ -0,0 +1,64 @@
+"""
+GitTreeStorage reads a commit through ls-tree and one cat-file --batch process
+"""
+
+import pytest
+
+from qa_engine import FileIndex, GitTreeStorage
+
+from conftest import git
+
+FILES = {
+    "README.md": b"# Title\n",
+    "with space/and tab\t.md": b"odd name\n",
+    "docs/ünïcode.md": "Grüße\n".encode("utf-8"),
+    "docs/empty.txt": b"",
+    "bin/blob.dat": bytes(range(256)) * 4,
+    "deep/a/b/c.ts": b"line one\nline two\n",
+}
+
+
+@pytest.fixture
+def storage(repo):
+    for rel_path, data in FILES.items():
+        path = repo / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "tree")
+    # Working tree edits must not leak into the committed view
+    (repo / "README.md").write_text("changed\n", encoding="utf-8")
+    (repo / "untracked.md").write_text("new\n", encoding="utf-8")
+    storage = GitTreeStorage(repo, "HEAD")
+    yield storage
+    storage.close()
+
+
+def test_listing_kinds_and_sizes(storage):
+    kinds = dict(storage.entries())
+    assert {path for path, kind in kinds.items() if kind == "file"} == set(FILES)
+    assert {path for path, kind in kinds.items() if kind == "dir"} == {"with space", "docs", "bin", "deep", "deep/a", "deep/a/b"}
+    assert storage.kind("") == "dir"
+    assert storage.kind("untracked.md") is None
+    for rel_path, data in FILES.items():
+        assert storage.size(rel_path) == len(data)
+
+
+def test_batch_reads_stay_aligned(storage):
+    # Interleave reads so a mis-consumed separator would corrupt the next blob
+    for _ in range(2):
+        for rel_path, data in FILES.items():
+            assert storage.read_bytes(rel_path) == data
+
+
+def test_missing_blob(storage):
+    with pytest.raises(FileNotFoundError):
+        storage.read_bytes("untracked.md")
+    with pytest.raises(FileNotFoundError):
+        storage.size("docs")
+
+
+def test_index_from_listing(storage, repo):
+    index = FileIndex(repo, entries=storage.entries())
+    assert index.files("docs") == ["docs/empty.txt", "docs/ünïcode.md"]
+    assert index.kind("untracked.md") is None
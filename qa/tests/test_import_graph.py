@@ -0,0 +1,65 @@
+"""
+ImportGraph resolves specifiers and reports strongly connected components
+"""
+
+import json
+
+from qa_engine import FileIndex, FileSnapshotCache, ImportGraph
+
+
+def build(root):
+    index = FileIndex(root)
+    graph = ImportGraph(index, FileSnapshotCache(root, index))
+    graph.update()
+    return graph
+
+
+TSCONFIG = json.dumps({"compilerOptions": {"paths": {"@/*": ["./*"]}}})
+
+
+def test_cycle_through_alias_and_index(tree):
+    root = tree({
+        "tsconfig.json": TSCONFIG,
+        "lib/a.ts": "import { b } from './b'\n",
+        "lib/b.ts": "import { c } from '@/lib/c'\n",
+        "lib/c/index.ts": "export { a } from '../a'\n",
+        "lib/leaf.ts": "import { a } from './a'\n",
+    })
+    checked, cycles = build(root).cycles()
+    assert checked == 4
+    assert cycles == [["lib/a.ts", "lib/b.ts", "lib/c/index.ts", "lib/a.ts"]]
+
+
+def test_separate_components_and_self_import(tree):
+    root = tree({
+        "lib/x.ts": "import './y'\n",
+        "lib/y.ts": "import './x'\n",
+        "app/p.ts": "const q = require('./q')\n",
+        "app/q.ts": "const p = await import('./p')\n",
+        "components/self.ts": "import { me } from './self'\n",
+    })
+    _, cycles = build(root).cycles()
+    assert cycles == [
+        ["app/p.ts", "app/q.ts", "app/p.ts"],
+        ["components/self.ts", "components/self.ts"],
+        ["lib/x.ts", "lib/y.ts", "lib/x.ts"],
+    ]
+
+
+def test_type_only_edges_and_prefix(tree):
+    root = tree({
+        "lib/model.ts": "import type { View } from './view'\n",
+        "lib/view.ts": "import { Model } from './model'\n",
+        "app/page.ts": "import { Model } from '@/lib/model'\n",
+    })
+    graph = build(root)
+    assert graph.cycles()[1] == []
+    assert graph.cycles(include_types=True)[1] == [["lib/model.ts", "lib/view.ts", "lib/model.ts"]]
+    assert graph.cycles("app", include_types=True) == (1, [])
+
+
+def test_long_chain_does_not_recurse(tree):
+    files = {f"lib/n{i}.ts": f"import './n{i + 1}'\n" for i in range(3000)}
+    files["lib/n3000.ts"] = "import './n0'\n"
+    _, cycles = build(tree(files)).cycles()
+    assert len(cycles) == 1 and len(cycles[0]) == 3002
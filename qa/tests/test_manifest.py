@@ -0,0 +1,59 @@
+"""
+RequirementPlan validates manifests and load_plan honours every rule field
+"""
+
+import json
+
+import pytest
+
+from qa_engine import QASystem, RequirementPlan
+
+
+def load(root, rules):
+    (root / "qa").mkdir(exist_ok=True)
+    (root / "qa/requirements.json").write_text(json.dumps({"requirements": rules}), encoding="utf-8")
+    qa = QASystem(root=root)
+    qa.load_architecture_requirements()
+    return qa
+
+
+def test_every_rule_type_passes_its_version(tree):
+    root = tree({"README.md": "# Title\n", "lib/a.ts": "export const A = 1\n"})
+    rules = [
+        {"type": "exists", "category": "C", "description": "d", "path": "README.md"},
+        {"type": "contains", "category": "C", "name": "contains", "description": "d", "path": "lib/a.ts", "patterns": ["A"]},
+        {"type": "symbol", "category": "C", "name": "symbol", "description": "d", "symbol": "A"},
+        {"type": "model", "category": "C", "name": "model", "description": "d", "model": "User"},
+        {"type": "links", "category": "C", "name": "links", "description": "d"},
+        {"type": "imports", "category": "C", "name": "imports", "description": "d", "from": "app", "forbid": "lib"},
+        {"type": "cycles", "category": "C", "name": "cycles", "description": "d"},
+        {"type": "correspondence", "category": "C", "name": "correspondence", "description": "d", "left": {"files": "lib/*.ts"}, "right": {"files": "lib/*.ts"}},
+    ]
+    qa = load(root, [{**rule, "version": 7} for rule in rules])
+    assert [req.version for req in qa.requirements] == [7] * len(rules)
+
+
+@pytest.mark.parametrize("rule, message", [
+    ({"type": "links", "category": "C", "name": "n", "description": "d", "versoin": 2}, "unexpected field(s) versoin"),
+    ({"type": "contains", "category": "C", "name": "n", "description": "d", "path": "a", "patterns": ["("]}, "invalid pattern"),
+    ({"type": "correspondence", "category": "C", "name": "n", "description": "d", "left": {"files": "a"}, "right": {"files": "b", "key": "imported_names"}}, "needs a module"),
+    ({"type": "links", "category": "C", "name": "n", "description": "d", "level": "error"}, "level must be"),
+])
+def test_invalid_rules_are_rejected(rule, message):
+    with pytest.raises(ValueError, match=message.replace("(", r"\(").replace(")", r"\)")):
+        RequirementPlan.compile({"requirements": [rule]}, "digest")
+
+
+def test_warn_level_rules_do_not_fail_the_run(tree):
+    root = tree({"README.md": "# Title\n"})
+    rules = [
+        {"type": "exists", "category": "Core Files", "description": "d", "path": "LICENSE", "level": "warn"},
+        {"type": "exists", "category": "Core Files", "description": "d", "path": "README.md"},
+    ]
+    qa = load(root, rules)
+    qa.critical_categories = {"Core Files"}
+    qa.run_checks(fail_fast=True)
+    assert "fail_fast" not in qa.results
+    assert [req.status for req in qa.requirements] == ["WARN", "GREEN"]
+    assert (qa.results["failed"], qa.results["warnings"]) == (0, 1)
+    assert qa.results["categories"]["Core Files"]["warnings"] == 1
@@ -0,0 +1,38 @@
+"""
+Broken links are reported per link rule, in declaration order
+"""
+
+import pytest
+
+from qa_engine import CheckWorkerPool, QASystem
+
+FILES = {
+    "docs/index.md": "# Docs\n[gone](gone.md)\n",
+    "guide/index.md": "# Guide\n[top](#nowhere)\n",
+    "notes/index.md": "# Notes\n[docs](../docs/index.md#docs)\n",
+}
+
+
+def make_qa(root):
+    qa = QASystem(root=root)
+    for prefix in ("docs", "guide", "notes"):
+        qa.add_link_requirement(prefix.title(), f"{prefix} links", "d", prefix=prefix)
+    # Critical categories run first, so the schedule reverses declaration order
+    qa.critical_categories = {"Notes", "Guide"}
+    return qa
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"jobs": 3},
+    pytest.param({"jobs": 3, "isolate": True}, marks=pytest.mark.skipif(not CheckWorkerPool.available(), reason="needs fork")),
+])
+def test_broken_links_follow_declaration_order(tree, options):
+    qa = make_qa(tree(FILES))
+    qa.run_checks(**options)
+    assert [req.status for req in qa.requirements] == ["RED", "RED", "GREEN"]
+    broken = qa.results["broken_links"]
+    assert list(broken) == ["docs links", "guide links", "notes links"]
+    assert [b["target"] for b in broken["docs links"]] == ["gone.md"]
+    assert [b["target"] for b in broken["guide links"]] == ["#nowhere"]
+    assert broken["notes links"] == []
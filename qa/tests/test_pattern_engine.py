@@ -0,0 +1,54 @@
+"""
+PatternEngine answers every pattern of a file as if each were searched alone
+"""
+
+import re
+
+import pytest
+
+from qa_engine import PatternEngine
+
+
+def search_all(patterns, text):
+    engine = PatternEngine()
+    for pattern in patterns:
+        engine.register("file.ts", pattern)
+    return engine, {pattern: engine.search("file.ts", pattern, text) for pattern in patterns}
+
+
+def test_shadowed_alternative_is_rescanned():
+    # "foo" matches first at every position, hiding "foobar" from the combined scan
+    engine, found = search_all(["foo", "foobar"], "x foobar y")
+    assert found == {"foo": True, "foobar": True}
+    assert engine.scans == 2
+
+
+def test_no_match_stops_after_one_scan():
+    engine, found = search_all(["alpha", "beta", "gamma"], "nothing here")
+    assert found == {"alpha": False, "beta": False, "gamma": False}
+    assert engine.scans == 1
+
+
+def test_standalone_patterns_fall_back_to_single_search():
+    # Back-references and inline flags cannot be embedded in the alternation
+    patterns = [r"(\w)\1", r"(?s)begin.*end", "plain"]
+    engine, found = search_all(patterns, "aa begin\nend plain")
+    assert found == {pattern: True for pattern in patterns}
+    assert engine.scans == 3
+
+
+def test_uncompilable_group_falls_back(monkeypatch):
+    engine = PatternEngine()
+    for pattern in ("one", "two"):
+        engine.register("file.ts", pattern)
+    monkeypatch.setattr(engine, "_matcher", lambda patterns, binary=False: None)
+    assert engine.search("file.ts", "two", "two") is True
+    assert engine.search("file.ts", "one", "two") is False
+
+
+@pytest.mark.parametrize("pattern", [r"export\s+const\s+x", r"^import", "Ü", r"(?P<name>x)"])
+def test_bytes_and_text_agree(pattern):
+    text = "import a\nexport  const x = 'Ü'\n"
+    _, found_text = search_all([pattern], text)
+    _, found_bytes = search_all([pattern], text.encode("utf-8"))
+    assert found_text == found_bytes == {pattern: bool(re.search(pattern, text, PatternEngine.FLAGS))}
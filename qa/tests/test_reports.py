@@ -0,0 +1,25 @@
+"""
+Streamed reports match what json.dumps writes for the same records
+"""
+
+import io
+import json
+
+from qa_engine import QASystem
+
+
+def test_ndjson_matches_json_dumps(tree):
+    root = tree({"README.md": "# Title\n"})
+    qa = QASystem(root=root)
+    qa.add_requirement("Files", "README", "d", file_path="README.md")
+    qa.add_requirement("Fichiers", "Liste \"à faire\"", "tab\there ✓", file_path="TODO.md")
+    qa.run_checks()
+    
+    out = io.StringIO()
+    qa.write_ndjson_details(out)
+    expected = "".join(
+        json.dumps({field: getattr(req, field) for field in QASystem._DETAIL_FIELDS}, ensure_ascii=False) + "\n"
+        for req in qa.requirements
+    )
+    assert out.getvalue() == expected
+    assert [json.loads(line)["status"] for line in out.getvalue().splitlines()] == ["GREEN", "RED"]
@@ -0,0 +1,127 @@
+"""
+Result cache keys must change whenever an input of a requirement changes
+"""
+
+import copy
+import json
+
+from qa_engine import QASystem, ResultCache
+
+
+def make_qa(root, version=1):
+    """Build a system with one content rule and one tree-wide symbol rule"""
+    qa = QASystem(root=root, result_cache=ResultCache(root / ".qa-cache"))
+    path, pattern = "lib/a.ts", r"export function helper"
+    qa.add_requirement(
+        "Cache", "Helper", "lib/a.ts exports helper",
+        component_check=lambda: (qa.check_file_contains(path, pattern), ""), patterns=[(path, pattern)], version=version
+    )
+    qa.add_symbol_requirement("Cache", "Widget", "Widget is exported somewhere", "Widget", kind="function")
+    return qa
+
+
+def run(root, version=1):
+    qa = make_qa(root, version)
+    qa.run_checks()
+    return qa, {req.name: req.status for req in qa.requirements}
+
+
+def test_unchanged_inputs_hit(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function Widget() {}\n"})
+    _, first = run(root)
+    qa, second = run(root)
+    assert first == second == {"Helper": "GREEN", "Widget": "GREEN"}
+    assert qa.result_cache.hits == 2 and qa.result_cache.misses == 0
+
+
+def test_edited_input_misses(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function Widget() {}\n"})
+    run(root)
+    (root / "lib/a.ts").write_text("export function other() {}\n", encoding="utf-8")
+    qa, statuses = run(root)
+    assert statuses["Helper"] == "RED"
+    # The symbol rule reads all of lib/, so it is re-evaluated too
+    assert qa.result_cache.misses == 2
+
+
+def test_file_below_directory_input_misses(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function Widget() {}\n"})
+    run(root)
+    (root / "lib/b.ts").unlink()
+    (root / "app").mkdir()
+    (root / "app/widget.ts").write_text("function Widget() {}\n", encoding="utf-8")
+    qa, statuses = run(root)
+    assert statuses == {"Helper": "GREEN", "Widget": "RED"}
+    assert qa.result_cache.hits == 1
+
+
+def test_version_bump_misses(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "lib/b.ts": "export function Widget() {}\n"})
+    run(root)
+    qa, _ = run(root, version=2)
+    assert qa.result_cache.hits == 1 and qa.result_cache.misses == 1
+
+
+MANIFEST = {
+    "requirements": [
+        {"type": "contains", "category": "Manifest", "name": "Transfer", "description": "d", "path": "lib/a.ts", "patterns": ["export function helper"]},
+        {"type": "model", "category": "Manifest", "name": "User Model", "description": "d", "model": "User"},
+    ]
+}
+
+
+def run_manifest(root, manifest):
+    (root / "qa").mkdir(exist_ok=True)
+    (root / "qa/requirements.json").write_text(json.dumps(manifest), encoding="utf-8")
+    qa = QASystem(root=root, result_cache=ResultCache(root / ".qa-cache"))
+    qa.load_architecture_requirements()
+    qa.run_checks()
+    return qa, {req.name: req.status for req in qa.requirements}
+
+
+def test_edited_rule_misses_without_version_bump(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "prisma/schema.prisma": "model User {\n  id String @id\n}\n"})
+    qa, statuses = run_manifest(root, MANIFEST)
+    assert statuses == {"Transfer": "GREEN", "User Model": "GREEN"}
+    
+    edited = copy.deepcopy(MANIFEST)
+    edited["requirements"][0]["patterns"] = ["export function missing"]
+    edited["requirements"][1]["model"] = "Ghost"
+    qa, statuses = run_manifest(root, edited)
+    assert statuses == {"Transfer": "RED", "User Model": "RED"}
+    assert qa.result_cache.hits == 0
+    
+    # Only the description changed: both outcomes are still served from the cache
+    described = copy.deepcopy(edited)
+    described["requirements"][0]["description"] = "reworded"
+    qa, _ = run_manifest(root, described)
+    assert qa.result_cache.hits == 2
+
+
+def test_rule_digest_ignores_unrelated_rules(tree):
+    root = tree({"lib/a.ts": "export function helper() {}\n", "prisma/schema.prisma": "model User {\n  id String @id\n}\n"})
+    run_manifest(root, MANIFEST)
+    extended = copy.deepcopy(MANIFEST)
+    extended["requirements"].insert(0, {"type": "contains", "category": "Manifest", "name": "First", "description": "d", "path": "lib/b.ts", "patterns": ["x"]})
+    qa, _ = run_manifest(root, extended)
+    assert qa.result_cache.hits == 2
+
+
+def test_directory_digest_is_memoized_until_a_file_below_changes(tree, monkeypatch):
+    root = tree({"lib/a.ts": "export const A = 1\n", "lib/sub/b.ts": "export const B = 1\n", "docs/x.md": "# X\n"})
+    qa = QASystem(root=root)
+    listed = []
+    files = qa.index.files
+    monkeypatch.setattr(qa.index, "files", lambda prefix="", suffixes=(): listed.append(prefix) or files(prefix, suffixes))
+    
+    lib, sub, docs = qa.snapshot.digest("lib"), qa.snapshot.digest("lib/sub"), qa.snapshot.digest("docs")
+    assert qa.snapshot.digest("lib") == lib and qa.snapshot.digest("lib/sub") == sub
+    assert listed == ["lib", "lib/sub", "docs"]
+    
+    (root / "lib/sub/b.ts").write_text("export const B = 2\n", encoding="utf-8")
+    qa.index.refresh({"lib/sub/b.ts"})
+    qa.snapshot.invalidate({"lib/sub/b.ts"})
+    assert qa.snapshot.digest("lib") != lib
+    assert qa.snapshot.digest("lib/sub") != sub
+    assert qa.snapshot.digest("docs") == docs
+    assert listed == ["lib", "lib/sub", "docs", "lib", "lib/sub"]
@@ -0,0 +1,122 @@
+"""
+Merging the partial results of every shard rebuilds the results of a full run
+"""
+
+import io
+import json
+
+import pytest
+
+from qa_engine import QASystem, ResultCache
+
+
+FILES = {
+    "README.md": "# Project\n[guide](docs/guide.md) [gone](docs/gone.md)\n",
+    "docs/guide.md": "# Guide\n[back](../README.md#project) [bad](../README.md#nowhere)\n",
+    "lib/a.ts": "import { b } from './b'\nexport const ASchema = 1\nexport const BSchema = 2\n",
+    "lib/b.ts": "import { a } from './a'\nexport function helper() {}\n",
+    "app/api/items/route.ts": "import { ASchema } from '@/lib/a'\n",
+    "app/api/users/route.ts": "export function GET() {}\n",
+    "__tests__/api/items.test.ts": "import { GET } from '@/app/api/items/route'\n",
+    "tsconfig.json": json.dumps({"compilerOptions": {"paths": {"@/*": ["./*"]}}}),
+    "prisma/schema.prisma": "model User {\n  id String @id\n}\n",
+}
+
+RULES = [
+    {"type": "exists", "category": "Files", "description": "d", "path": "README.md"},
+    {"type": "exists", "category": "Files", "description": "d", "path": "LICENSE"},
+    {"type": "contains", "category": "Content", "name": "Helper", "description": "d", "path": "lib/b.ts", "patterns": ["export function helper", "(a+)+b"]},
+    {"type": "symbol", "category": "Symbols", "name": "Helper Symbol", "description": "d", "symbol": "helper", "kind": "function"},
+    {"type": "model", "category": "Database Schema", "name": "User Model", "description": "d", "model": "User"},
+    {"type": "links", "category": "Documentation", "name": "Links", "description": "d"},
+    {"type": "links", "category": "Documentation", "name": "Docs Links", "description": "d", "prefix": "docs"},
+    {"type": "imports", "category": "Layering", "name": "Lib Avoids App", "description": "d", "from": "lib", "forbid": "app"},
+    {"type": "cycles", "category": "Layering", "name": "No Cycles", "description": "d"},
+    {"type": "correspondence", "category": "Coverage", "name": "Routes Have Tests", "description": "d", "level": "warn",
+     "left": {"files": "app/api/**/route.ts"}, "right": {"files": "__tests__/api/**/*.test.ts", "key": "imports"}},
+    {"type": "correspondence", "category": "Coverage", "name": "Schemas Used", "description": "d",
+     "left": {"files": "lib/a.ts", "key": "exports", "pattern": "Schema$"}, "right": {"files": "app/api/**/route.ts", "key": "imported_names", "module": "lib/a"}},
+]
+
+
+@pytest.fixture
+def project(tree):
+    root = tree(FILES)
+    (root / "qa").mkdir()
+    (root / "qa/requirements.json").write_text(json.dumps({"requirements": RULES}), encoding="utf-8")
+    return root
+
+
+def load(root, cache):
+    qa = QASystem(root=root, result_cache=ResultCache(cache) if cache else None)
+    qa.load_architecture_requirements()
+    return qa
+
+
+def results(qa):
+    """Return the QA_RESULTS.json text with the summed cost counters masked"""
+    out = io.StringIO()
+    qa.write_json_results(out)
+    data = json.loads(out.getvalue())
+    data["timestamp"] = None
+    # Only a merge lists its shards
+    data.pop("shards", None)
+    # Counters of the work a process did, which N processes repeat
+    for section, counters in QASystem.COST_COUNTERS.items():
+        for name in counters:
+            if section in data:
+                data[section][name] = None
+    return json.dumps(data, indent=2)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5])
+@pytest.mark.parametrize("cached", [False, True])
+def test_merge_equals_full_run(project, tmp_path, count, cached):
+    full = load(project, tmp_path / "full-cache" if cached else None)
+    full.run_checks()
+    expected = results(full)
+    
+    shards = []
+    for index in range(1, count + 1):
+        qa = load(project, tmp_path / f"shard-{index}-cache" if cached else None)
+        subset = qa.shard(index, count)
+        qa.run_checks(subset=subset)
+        out = io.StringIO()
+        qa.write_shard_results(out, index, count, subset)
+        shards.append(json.loads(out.getvalue()))
+    
+    merged = QASystem(root=project)
+    merged.load_shards(shards)
+    actual = results(merged)
+    
+    # Every section a full run writes is present, including the per-check payloads
+    sections = json.loads(expected)
+    assert {"broken_links", "unmatched", "manifest", "risky_patterns", "symbol_index", "import_graph", "markdown_links"} <= set(sections)
+    assert sections["unmatched"] == {"Routes Have Tests": ["app/api/users/route.ts"], "Schemas Used": ["BSchema"]}
+    assert sections["warnings"] == 1
+    assert sections["pattern_engine"]["patterns"] == 2
+    # Same sections, keys and values in the same order
+    assert actual == expected
+    
+    phases = merged.timings()["phases"]
+    assert list(phases) == list(full.timings()["phases"]) == ["check", "aggregate"]
+    assert phases["check"] == pytest.approx(sum(shard["phases"]["check"] for shard in shards), abs=0.01)
+
+
+def test_partition_reads_costs_from_cache(project, tmp_path):
+    first = load(project, tmp_path / "cache")
+    first.run_checks()
+    first.save_reports(quiet=True)
+    assert "requirements" not in json.loads((project / "qa/QA_RESULTS.json").read_text(encoding="utf-8"))["timings"]
+    
+    # Make one requirement by far the most expensive: it gets a shard of its own
+    costs_path = tmp_path / "cache/costs.json"
+    costs = json.loads(costs_path.read_text(encoding="utf-8"))
+    assert len(costs["requirements"]) == len(RULES)
+    for entry in costs["requirements"]:
+        entry["wall_ms"] = 1000.0 if entry["name"] == "No Cycles" else 1.0
+    costs_path.write_text(json.dumps(costs), encoding="utf-8")
+    
+    qa = load(project, tmp_path / "cache")
+    assert [req.name for req in qa.shard(1, 2)] == ["No Cycles"]
+    assert len(qa.shard(2, 2)) == len(RULES) - 1
@@ -0,0 +1,45 @@
+"""
+Warn-level requirements are reported but never fail a run
+"""
+
+from qa_engine import QASystem
+
+
+def make_qa(root):
+    qa = QASystem(root=root)
+    qa.critical_categories = {"Core Files"}
+    qa.add_requirement("Core Files", "LICENSE", "d", file_path="LICENSE")
+    qa.requirements[-1].gating = False
+    qa.add_requirement("Core Files", "README.md", "d", file_path="README.md")
+    qa.add_requirement("Docs", "CHANGELOG.md", "d", file_path="CHANGELOG.md")
+    return qa
+
+
+def test_failures_are_warnings(tree):
+    root = tree({"README.md": "# Title\n"})
+    qa = make_qa(root)
+    qa.run_checks(fail_fast=True)
+    
+    assert "fail_fast" not in qa.results
+    assert [req.status for req in qa.requirements] == ["WARN", "GREEN", "RED"]
+    assert (qa.results["passed"], qa.results["failed"], qa.results["warnings"]) == (1, 1, 1)
+    # 1 of the 2 gating requirements passed
+    assert qa.results["pass_rate"] == 50.0
+    assert qa.results["categories"]["Core Files"] == {"total": 2, "passed": 1, "failed": 0, "pass_rate": 100.0, "warnings": 1}
+    
+    report = qa.generate_markdown_report()
+    assert "| Core Files | 2 | 1 ✅ | 0 ❌ | 1 ⚠️ | 0 ⏭️ | 100.0% |" in report
+    assert "- [ ] LICENSE: File missing: LICENSE" in report.split("## Warnings")[1]
+
+
+def test_reused_warning_is_rechecked_once_gating(tree):
+    root = tree({"README.md": "# Title\n"})
+    qa = make_qa(root)
+    qa.run_checks()
+    qa.save_reports(quiet=True)
+    
+    qa = make_qa(root)
+    qa.requirements[0].gating = True
+    qa.run_checks(changed_paths=set())
+    assert qa.results["incremental"]["evaluated"] == 1
+    assert [req.status for req in qa.requirements] == ["RED", "GREEN", "RED"]
@@ -0,0 +1,89 @@
+"""
+Watch mode rechecks on real edits and ignores the reports it writes itself
+"""
+
+import time
+import types
+
+import pytest
+
+from qa_engine import QASystem
+from qa_engine import watch as watch_module
+
+
+def make_qa(root):
+    qa = QASystem(root=root)
+    qa.add_link_requirement("Docs", "Links", "Every relative link resolves")
+    return qa
+
+
+@pytest.fixture
+def polling(monkeypatch):
+    """Force the polling watcher and script its polls: {poll number: action}"""
+    def unavailable(*args, **kwargs):
+        raise ImportError("watchdog")
+    monkeypatch.setattr(watch_module, "EventWatcher", unavailable)
+    
+    def install(actions, stop_after):
+        polls = [0]
+        
+        def sleep(seconds):
+            polls[0] += 1
+            if polls[0] > stop_after:
+                raise KeyboardInterrupt
+            actions.get(polls[0], lambda: None)()
+        
+        monkeypatch.setattr(watch_module, "time", types.SimpleNamespace(sleep=sleep, perf_counter=time.perf_counter))
+    return install
+
+
+def test_two_cycles_then_quiet(tree, polling, capsys):
+    root = tree({"docs/a.md": "[b](b.md)\n", "docs/b.md": "# B\n"})
+    # A previous run's report is a markdown input of the link rule
+    first = make_qa(root)
+    first.run_checks()
+    first.save_reports(quiet=True)
+    
+    qa = make_qa(root)
+    assert "qa/QA_REPORT.md" in qa.requirements[0].inputs
+    qa.run_checks()
+    qa.save_reports(quiet=True, ndjson_path=root / "qa/details.ndjson")
+    
+    rechecks = []
+    recheck = qa.recheck
+    qa.recheck = lambda changed, jobs: rechecks.append(set(changed)) or recheck(changed, jobs)
+    
+    def edit(text):
+        return lambda: (root / "docs/a.md").write_text(text, encoding="utf-8")
+    
+    polling({2: edit("[b](b.md) [gone](gone.md)\n"), 6: edit("[b](b.md)\n")}, stop_after=12)
+    watch_module.watch(qa, 1, 0.01, ndjson_path=root / "qa/details.ndjson")
+    
+    assert rechecks == [{"docs/a.md"}, {"docs/a.md"}]
+    output = capsys.readouterr().out
+    assert "GREEN → RED" in output and "RED → GREEN" in output
+
+
+def test_new_file_outside_inputs_fixes_link(tree, polling, capsys):
+    root = tree({"docs/a.md": "[c](c.md)\n"})
+    qa = make_qa(root)
+    qa.run_checks()
+    assert qa.requirements[0].status == "RED"
+    
+    polling({2: lambda: (root / "docs/c.md").write_text("# C\n", encoding="utf-8")}, stop_after=6)
+    watch_module.watch(qa, 1, 0.01)
+    
+    assert qa.requirements[0].status == "GREEN"
+    assert qa.results["categories"]["Docs"]["passed"] == 1
+    assert qa.results["categories"]["Docs"]["failed"] == 0
+    assert capsys.readouterr().out.count("change(s)") == 1
+
+
+def test_generated_paths(tree, tmp_path):
+    root = tree({"README.md": "# R\n"})
+    qa = QASystem(root=root)
+    ignored = watch_module.generated_paths(qa, root / "out/details.ndjson", None, tmp_path / "outside.json", root / "h.db")
+    assert ignored == {
+        "qa/QA_RESULTS.json", "qa/QA_REPORT.md", "out/details.ndjson", "out/details.ndjson-journal",
+        "out/details.ndjson-wal", "out/details.ndjson-shm", "h.db", "h.db-journal", "h.db-wal", "h.db-shm",
+    }
@@ -0,0 +1,27 @@
+"""
+Forked check workers inherit the indexes their checks read
+"""
+
+import pytest
+
+from qa_engine import CheckWorkerPool, QASystem
+
+pytestmark = pytest.mark.skipif(not CheckWorkerPool.available(), reason="needs fork")
+
+
+def test_indexes_are_built_before_forking(tree):
+    root = tree({"lib/a.ts": "import { b } from './b'\nexport function helper() {}\n", "lib/b.ts": "export const b = 1\n", "README.md": "# Title\n"})
+    qa = QASystem(root=root)
+    qa.add_symbol_requirement("Symbols", "Helper", "d", "helper", kind="function")
+    qa.add_cycle_requirement("Layering", "No Cycles", "d")
+    qa.add_requirement("Files", "README", "d", file_path="README.md")
+    
+    qa.warm_indexes(qa.requirements[2:])
+    assert qa._symbols is None and qa._imports is None and qa._links is None
+    
+    qa.run_checks(jobs=2, isolate=True)
+    assert [req.status for req in qa.requirements] == ["GREEN", "GREEN", "GREEN"]
+    # Built once in the parent; the workers reused them
+    assert qa._symbols is not None and not qa._symbols_stale
+    assert qa._imports is not None and not qa._imports_stale
+    assert qa._links is None and qa._prisma is None